@@ -0,0 +1,335 @@
+"""
+End-to-end benchmark of SQS senders and receivers.
+
+Producers and consumers run in threads against `LocalSQSClient`, which
+simulates latency and throttling of SQS. Results are printed as JSON, to
+compare configurations and versions of this library:
+
+    python -m platonic.sqs.benchmark --producers 2 --consumers 4 --latency-ms 5
+"""
+import argparse
+import json
+import logging
+import math
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from datetime import timedelta
+from typing import Dict, List, Optional, Sequence
+
+from boltons.iterutils import chunked_iter
+from platonic.sqs.queue.local import LocalSQSClient
+from platonic.sqs.queue.receiver import SQSReceiver
+from platonic.sqs.queue.retry import RetryBudget, RetryPolicy
+from platonic.sqs.queue.sender import SQSSender
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BenchmarkConfig:
+    """Topology and parameters of a benchmark run."""
+
+    messages: int = 10000
+    producers: int = 1
+    consumers: int = 1
+    message_size: int = 100
+    send_batch_size: int = 10
+    receive_batch_size: int = 10
+    latency_ms: float = 0.0
+    throttling_rate: float = 0.0
+    seed: Optional[int] = None
+
+    # How long consumers may take to drain the queue after producers finish.
+    timeout_seconds: float = 60.0
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    Measurements of a benchmark run.
+
+    A run is complete if every message was consumed before the timeout.
+    Otherwise, rates and latencies describe the messages consumed so far.
+    """
+
+    config: BenchmarkConfig
+    is_complete: bool
+    consumed: int
+    errors: Dict[str, int]
+    duration_seconds: float
+    produce_rate: float
+    consume_rate: float
+    latency_ms: Dict[str, Optional[float]]
+    api_calls: Dict[str, int]
+    api_calls_per_message: float
+
+
+def percentile(
+    sorted_values: Sequence[float],
+    fraction: float,
+) -> Optional[float]:
+    """Nearest rank percentile of sorted values, None if there are none."""
+    if not sorted_values:
+        return None
+
+    rank = math.ceil(fraction * len(sorted_values))
+    return sorted_values[max(rank, 1) - 1]
+
+
+@dataclass
+class _Errors:
+    """Failed calls of producer and consumer threads, which keep going."""
+
+    counts: 'Counter[str]' = field(default_factory=Counter)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock,
+        init=False,
+        repr=False,
+    )
+
+    def record(self, role: str) -> None:
+        """Log and count the exception being handled."""
+        logger.exception('Benchmark %s call failed.', role)
+        with self._lock:
+            self.counts[role] += 1
+
+
+@dataclass
+class _Consumers:
+    """Shared state of consumer threads."""
+
+    expected_count: int
+    receivers: List[SQSReceiver[str]]
+    errors: _Errors
+    latencies: List[float] = field(default_factory=list)
+    finished_at: float = 0
+    _finished: threading.Event = field(
+        default_factory=threading.Event,
+        init=False,
+        repr=False,
+    )
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock,
+        init=False,
+        repr=False,
+    )
+
+    def consume(self, receiver: SQSReceiver[str], batch_size: int) -> None:
+        """Receive and acknowledge messages until stopped."""
+        while not receiver.is_stopped:
+            try:
+                batch = receiver.receive_many(
+                    max_messages=batch_size,
+                    max_latency=timedelta(milliseconds=100),
+                )
+                batch.acknowledge()
+            except Exception:
+                self.errors.record('consume')
+                continue
+
+            self._record(batch.values)
+
+    def wait(self, timeout: timedelta) -> bool:
+        """Wait for every message to be consumed, then stop consumers."""
+        is_complete = self._finished.wait(timeout.total_seconds())
+        with self._lock:
+            self._finish(time.perf_counter())
+
+        return is_complete
+
+    def _record(self, message_bodies: List[str]) -> None:
+        """Measure enqueue-to-acknowledge latency, stop when done."""
+        acknowledged_at = time.perf_counter()
+        with self._lock:
+            self.latencies.extend(
+                acknowledged_at - float(message_body)
+                for message_body in message_bodies
+            )
+
+            if len(self.latencies) >= self.expected_count:
+                self._finish(acknowledged_at)
+
+    def _finish(self, finished_at: float) -> None:
+        """Stop consumers, unless they have already been stopped."""
+        if self._finished.is_set():
+            return
+
+        self.finished_at = finished_at
+        self._finished.set()
+        for receiver in self.receivers:
+            receiver.stop()
+
+
+def _produce(
+    sender: SQSSender[str],
+    messages_count: int,
+    config: BenchmarkConfig,
+    errors: _Errors,
+) -> None:
+    """Send messages carrying the moment they were sent."""
+    bodies = (
+        f'{time.perf_counter():.9f}'.ljust(config.message_size)
+        for _index in range(messages_count)
+    )
+
+    for chunk in chunked_iter(bodies, max(config.send_batch_size, 1)):
+        try:
+            _send_chunk(sender, chunk, config)
+        except Exception:
+            errors.record('produce')
+
+
+def _send_chunk(
+    sender: SQSSender[str],
+    message_bodies: List[str],
+    config: BenchmarkConfig,
+) -> None:
+    """Send messages one by one or in a batch, as configured."""
+    if config.send_batch_size > 1:
+        sender.send_many(message_bodies)
+        return
+
+    for message_body in message_bodies:
+        sender.send(message_body)
+
+
+def _share(total: int, parts: int) -> List[int]:
+    """Split a number into nearly equal parts."""
+    return [
+        total // parts + (1 if index < total % parts else 0)
+        for index in range(parts)
+    ]
+
+
+def _latency_ms(latencies: List[float]) -> Dict[str, Optional[float]]:
+    """Latency percentiles in milliseconds, None if nothing was consumed."""
+    sorted_latencies = sorted(latencies)
+    percentiles = {
+        label: percentile(sorted_latencies, fraction)
+        for label, fraction in (
+            ('p50', 0.5),
+            ('p90', 0.9),
+            ('p99', 0.99),
+            ('max', 1),
+        )
+    }
+    return {
+        label: None if seconds is None else seconds * 1000
+        for label, seconds in percentiles.items()
+    }
+
+
+def run(config: BenchmarkConfig) -> BenchmarkResult:
+    """
+    Run the benchmark.
+
+    Failed calls are logged and counted in `BenchmarkResult.errors`, and the
+    threads keep going. Messages lost that way make the run incomplete. Every
+    run has a retry budget of its own, so that runs do not affect each other.
+    """
+    client = LocalSQSClient(
+        latency=timedelta(milliseconds=config.latency_ms),
+        throttling_rate=config.throttling_rate,
+        seed=config.seed,
+    )
+    url = str(client.create_queue(QueueName='benchmark')['QueueUrl'])
+    retry_policy = RetryPolicy(budget=RetryBudget())
+
+    errors = _Errors()
+    consumers = _Consumers(
+        expected_count=config.messages,
+        receivers=[
+            SQSReceiver[str](
+                url=url,
+                client=client,  # type: ignore
+                retry_policy=retry_policy,
+            )
+            for _index in range(config.consumers)
+        ],
+        errors=errors,
+    )
+    threads = [
+        threading.Thread(
+            target=consumers.consume,
+            args=(receiver, config.receive_batch_size),
+        )
+        for receiver in consumers.receivers
+    ]
+    producer_threads = [
+        threading.Thread(target=_produce, args=(
+            SQSSender[str](
+                url=url,
+                client=client,  # type: ignore
+                retry_policy=retry_policy,
+            ),
+            messages_count,
+            config,
+            errors,
+        ))
+        for messages_count in _share(config.messages, config.producers)
+    ]
+
+    started_at = time.perf_counter()
+    for thread in threads + producer_threads:
+        thread.start()
+
+    for producer_thread in producer_threads:
+        producer_thread.join()
+    produced_at = time.perf_counter()
+
+    is_complete = consumers.wait(timedelta(seconds=config.timeout_seconds))
+    for thread in threads:
+        thread.join()
+
+    consumed = len(consumers.latencies)
+    duration_seconds = consumers.finished_at - started_at
+    api_calls = dict(client.calls)
+    api_calls.pop('create_queue')
+
+    return BenchmarkResult(
+        config=config,
+        is_complete=is_complete,
+        consumed=consumed,
+        errors=dict(errors.counts),
+        duration_seconds=duration_seconds,
+        produce_rate=config.messages / (produced_at - started_at),
+        consume_rate=consumed / duration_seconds,
+        latency_ms=_latency_ms(consumers.latencies),
+        api_calls=api_calls,
+        api_calls_per_message=sum(api_calls.values()) / config.messages,
+    )
+
+
+def parse_config(arguments: Optional[Sequence[str]] = None) -> BenchmarkConfig:
+    """Read benchmark configuration from command line arguments."""
+    parser = argparse.ArgumentParser(
+        prog='python -m platonic.sqs.benchmark',
+        description=__doc__.strip().splitlines()[0],
+    )
+
+    for name, default in asdict(BenchmarkConfig()).items():
+        option_name = name.replace('_', '-')
+        parser.add_argument(
+            f'--{option_name}',
+            type=float if isinstance(default, float) else int,
+            default=default,
+        )
+
+    return BenchmarkConfig(**vars(parser.parse_args(arguments)))
+
+
+def main(arguments: Optional[Sequence[str]] = None) -> None:
+    """Run the benchmark, print results as JSON and fail if incomplete."""
+    result = run(parse_config(arguments))
+    json.dump(asdict(result), sys.stdout, indent=2)
+    sys.stdout.write('\n')
+
+    if not result.is_complete:
+        sys.exit('Benchmark timed out before every message was consumed.')
+
+
+if __name__ == '__main__':  # pragma: no cover
+    main()
@@ -1,8 +1,49 @@
+from platonic.sqs.queue.backlog import Backlog, BacklogMonitor, ConsumerRates
+from platonic.sqs.queue.batch import SQSBatch
+from platonic.sqs.queue.deduplication import (
+    DeduplicationCache,
+    InMemoryDeduplicationCache,
+    SQLiteDeduplicationCache,
+)
 from platonic.sqs.queue.errors import (
+    SQSBatchEntriesFailed,
+    SQSCircuitOpen,
     SQSMessageDoesNotExist,
     SQSQueueDoesNotExist,
+    SQSQueueNameNotFound,
+    SQSSpoolFull,
 )
+from platonic.sqs.queue.fanout import FanOutResult, SQSFanOutSender
+from platonic.sqs.queue.local import LocalSQSClient, LocalSQSServer
 from platonic.sqs.queue.message import SQSMessage
+from platonic.sqs.queue.multi import SQSMultiReceiver
+from platonic.sqs.queue.quarantine import QuarantinePolicy
+from platonic.sqs.queue.rate_limit import RateLimiter
 from platonic.sqs.queue.receiver import SQSReceiver
+from platonic.sqs.queue.recording import RecordingClient
+from platonic.sqs.queue.resolver import (
+    QueueAttributes,
+    QueueResolver,
+    queue_resolver,
+)
+from platonic.sqs.queue.retry import CircuitBreaker, RetryBudget, RetryPolicy
 from platonic.sqs.queue.sender import SQSSender
+from platonic.sqs.queue.serialization import SerializationCache
+from platonic.sqs.queue.sharding import SQSShardedSender
+from platonic.sqs.queue.spool import FsyncPolicy, SQSSpooledSender
+from platonic.sqs.queue.tracing import (
+    InMemoryTracer,
+    Span,
+    SpanContext,
+    Tracer,
+)
+from platonic.sqs.queue.transfer import (
+    ExportAction,
+    export_messages,
+    import_messages,
+)
+from platonic.sqs.queue.transport import Credentials, SQSHTTPClient
+from platonic.sqs.queue.tuning import AutoTuner
 from platonic.sqs.queue.types import InternalType, ValueType
+from platonic.sqs.queue.visibility import ExponentialRedeliveryDelay
+from platonic.sqs.queue.workers import SQSWorkerPool
@@ -14,7 +14,14 @@ def generate_delete_message_batch_entry(
     message: SQSMessage[ValueType],
 ) -> DeleteMessageBatchRequestEntryTypeDef:
     """Convert a Message into an entry for DeleteMessageBatch operation."""
+    return generate_raw_delete_message_batch_entry(message.receipt_handle)
+
+
+def generate_raw_delete_message_batch_entry(
+    receipt_handle: str,
+) -> DeleteMessageBatchRequestEntryTypeDef:
+    """Entry for DeleteMessageBatch operation by message receipt handle."""
     return {
         'Id': _generate_delete_message_batch_entry_id(),
-        'ReceiptHandle': message.receipt_handle,
+        'ReceiptHandle': receipt_handle,
     }
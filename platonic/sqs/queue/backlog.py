@@ -0,0 +1,128 @@
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import TYPE_CHECKING, Dict, Generic, Optional, Tuple
+
+from platonic.sqs.queue.types import ValueType
+
+if TYPE_CHECKING:  # pragma: no cover
+    from platonic.sqs.queue.receiver import SQSReceiver  # noqa: F401
+
+BACKLOG_ATTRIBUTE_NAMES = [
+    'ApproximateNumberOfMessages',
+    'ApproximateNumberOfMessagesNotVisible',
+]
+
+
+@dataclass(frozen=True)
+class Backlog:
+    """Approximate number of messages in a queue."""
+
+    # Messages available for retrieval.
+    visible: int
+
+    # Messages received by consumers and not yet deleted.
+    not_visible: int
+
+    @classmethod
+    def from_raw_attributes(cls, raw_attributes: Dict[str, str]) -> 'Backlog':
+        """Parse the response of GetQueueAttributes operation."""
+        return cls(
+            visible=int(raw_attributes['ApproximateNumberOfMessages']),
+            not_visible=int(
+                raw_attributes['ApproximateNumberOfMessagesNotVisible'],
+            ),
+        )
+
+
+@dataclass(frozen=True)
+class ConsumerRates:
+    """Rates of a consumer, in messages per second."""
+
+    receive_rate: float
+    acknowledge_rate: float
+
+
+@dataclass
+class BacklogMonitor(Generic[ValueType]):
+    """
+    Monitor the backlog of a queue and the throughput of its consumer.
+
+    Queue attributes are requested at most once per `cache_ttl`. Throughput
+    is measured by counting messages received and acknowledged by the
+    receiver between two calls to `rates()`.
+    """
+
+    receiver: 'SQSReceiver[ValueType]'
+    cache_ttl: timedelta = timedelta(seconds=10)
+
+    _cached_backlog: Optional[Tuple[Backlog, float]] = field(
+        default=None,
+        init=False,
+        repr=False,
+    )
+    _last_sample: Tuple[float, int, int] = field(init=False, repr=False)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock,
+        init=False,
+        repr=False,
+    )
+
+    def __post_init__(self) -> None:
+        """Take the initial sample of receiver counters."""
+        self._last_sample = self._sample()
+
+    def backlog(self) -> Backlog:
+        """Approximate number of messages in the queue, cached."""
+        with self._lock:
+            if self._cached_backlog is not None:
+                backlog, expires_at = self._cached_backlog
+                if expires_at > time.monotonic():
+                    return backlog
+
+        backlog = self.receiver.backlog()
+        with self._lock:
+            self._cached_backlog = (
+                backlog,
+                time.monotonic() + self.cache_ttl.total_seconds(),
+            )
+
+        return backlog
+
+    def rates(self) -> ConsumerRates:
+        """Receive and acknowledge rates since the previous call."""
+        sample = self._sample()
+        with self._lock:
+            previous_sample, self._last_sample = self._last_sample, sample
+
+        elapsed_seconds = max(sample[0] - previous_sample[0], 1e-9)
+        return ConsumerRates(
+            receive_rate=(sample[1] - previous_sample[1]) / elapsed_seconds,
+            acknowledge_rate=(sample[2] - previous_sample[2]) / elapsed_seconds,
+        )
+
+    def lag(self, rates: ConsumerRates) -> float:
+        """
+        Estimated time, in seconds, to process the backlog.
+
+        Infinite if the consumer does not acknowledge anything but there are
+        messages waiting.
+        """
+        visible = self.backlog().visible
+        if not visible:
+            return 0
+
+        if not rates.acknowledge_rate:
+            return math.inf
+
+        return visible / rates.acknowledge_rate
+
+    def _sample(self) -> Tuple[float, int, int]:
+        """Current time and receiver counters."""
+        return (
+            time.monotonic(),
+            self.receiver.received_count,
+            self.receiver.acknowledged_count,
+        )
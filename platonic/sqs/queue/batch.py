@@ -0,0 +1,39 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Generic, Iterator, List
+
+from platonic.sqs.queue.message import SQSMessage
+from platonic.sqs.queue.types import ValueType
+
+if TYPE_CHECKING:  # pragma: no cover
+    from platonic.sqs.queue.receiver import SQSReceiver  # noqa: F401
+
+
+@dataclass
+class SQSBatch(Generic[ValueType]):
+    """
+    A batch of messages received together.
+
+    The batch is meant to be processed as a whole, and then acknowledged with
+    one call to `acknowledge()` which deletes the messages in batches, via
+    `SQSReceiver.acknowledge_many()`.
+    """
+
+    messages: List[SQSMessage[ValueType]]
+    receiver: 'SQSReceiver[ValueType]'
+
+    @property
+    def values(self) -> List[ValueType]:
+        """Values of the messages in this batch."""
+        return [message.value for message in self.messages]
+
+    def acknowledge(self) -> None:
+        """Acknowledge every message in the batch."""
+        self.receiver.acknowledge_many(self.messages)
+
+    def __iter__(self) -> Iterator[SQSMessage[ValueType]]:
+        """Iterate over the messages of the batch."""
+        return iter(self.messages)
+
+    def __len__(self) -> int:
+        """Number of messages in the batch."""
+        return len(self.messages)
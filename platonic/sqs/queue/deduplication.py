@@ -0,0 +1,139 @@
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+DEFAULT_TTL = timedelta(minutes=15)
+
+
+class DeduplicationCache(ABC):
+    """
+    Storage of keys of recently processed messages.
+
+    `SQSReceiver` consults the cache to detect messages it has already
+    processed and which SQS has delivered once again.
+    """
+
+    @abstractmethod
+    def __contains__(self, key: object) -> bool:
+        """Check whether the key was recently added to the cache."""
+
+    @abstractmethod
+    def add(self, key: str) -> None:
+        """Remember the key."""
+
+
+@dataclass
+class InMemoryDeduplicationCache(DeduplicationCache):
+    """
+    Bounded in-process cache with LRU eviction and TTL expiration.
+
+    Safe to share among threads of one process.
+    """
+
+    max_size: int = 10000
+    ttl: timedelta = DEFAULT_TTL
+
+    _expiration_times: 'OrderedDict[str, float]' = field(
+        default_factory=OrderedDict,
+        init=False,
+        repr=False,
+    )
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock,
+        init=False,
+        repr=False,
+    )
+
+    def __contains__(self, key: object) -> bool:
+        """Check whether the key is in cache and is not expired."""
+        with self._lock:
+            expires_at = self._expiration_times.get(key)  # type: ignore
+            if expires_at is None:
+                return False
+
+            if expires_at <= time.monotonic():
+                self._expiration_times.pop(key)  # type: ignore
+                return False
+
+            self._expiration_times.move_to_end(key)  # type: ignore
+            return True
+
+    def add(self, key: str) -> None:
+        """Remember the key, evicting the least recently used one if full."""
+        with self._lock:
+            self._expiration_times[key] = (
+                time.monotonic() + self.ttl.total_seconds()
+            )
+            self._expiration_times.move_to_end(key)
+
+            while len(self._expiration_times) > self.max_size:
+                self._expiration_times.popitem(last=False)
+
+    def __len__(self) -> int:
+        """Number of keys stored, including expired ones not yet evicted."""
+        return len(self._expiration_times)
+
+
+@dataclass
+class SQLiteDeduplicationCache(DeduplicationCache):
+    """
+    Cache stored in an SQLite database file.
+
+    Several worker processes on the same host can share the cache by pointing
+    to the same file.
+    """
+
+    path: str
+    ttl: timedelta = DEFAULT_TTL
+
+    _connection: sqlite3.Connection = field(init=False, repr=False)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock,
+        init=False,
+        repr=False,
+    )
+
+    def __post_init__(self) -> None:
+        """Open the database and create the table if necessary."""
+        self._connection = sqlite3.connect(
+            self.path,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS processed_messages ('
+            'key TEXT PRIMARY KEY, expires_at REAL NOT NULL)',
+        )
+        self._connection.execute(
+            'CREATE INDEX IF NOT EXISTS processed_messages_expires_at '
+            'ON processed_messages (expires_at)',
+        )
+
+    def __contains__(self, key: object) -> bool:
+        """Check whether the key is in the database and is not expired."""
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT 1 FROM processed_messages '
+                'WHERE key = ? AND expires_at > ?',
+                (key, time.time()),
+            ).fetchone()
+
+        return row is not None
+
+    def add(self, key: str) -> None:
+        """Remember the key and clean up the expired ones."""
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO processed_messages (key, expires_at) '
+                'VALUES (?, ?)',
+                (key, now + self.ttl.total_seconds()),
+            )
+            self._connection.execute(
+                'DELETE FROM processed_messages WHERE expires_at <= ?',
+                (now,),
+            )
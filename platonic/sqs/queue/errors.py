@@ -1,3 +1,8 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+from documented import DocumentedError
+from mypy_boto3_sqs.type_defs import BatchResultErrorEntryTypeDef
 from platonic.queue import MessageDoesNotExist, QueueDoesNotExist
 
 
@@ -12,3 +17,69 @@ class SQSMessageDoesNotExist(MessageDoesNotExist):
         Message: {self.message.id}
         Queue URL: {self.queue.url}
     """
+
+
+@dataclass
+class SQSQueueNameNotFound(DocumentedError):
+    """
+    SQS queue named {self.queue_name} was not found.
+
+        AWS account ID: {self.account_id}
+    """
+
+    queue_name: str
+    account_id: Optional[str] = None
+
+
+@dataclass
+class SQSCircuitOpen(DocumentedError):
+    """
+    SQS API calls are suspended after a series of failures.
+
+    Calls will be attempted again in {self.retry_after_seconds:.1f} seconds.
+    """
+
+    retry_after_seconds: float
+
+
+@dataclass
+class SQSBatchEntriesFailed(DocumentedError):
+    """
+    {self.operation_name} failed for {self.failures_count} entries.
+
+        Queue URL: {self.queue_url}
+        First failure: {self.first_failure}
+    """
+
+    operation_name: str
+    queue_url: str
+    failures: List[BatchResultErrorEntryTypeDef]
+
+    @property
+    def failures_count(self) -> int:
+        """Number of failed entries."""
+        return len(self.failures)
+
+    @property
+    def first_failure(self) -> str:
+        """Error code and message of the first failure."""
+        if not self.failures:
+            return 'unknown'
+
+        failure = self.failures[0]
+        return f'{failure["Code"]}: {failure.get("Message", "")}'
+
+
+@dataclass
+class SQSSpoolFull(DocumentedError):
+    """
+    Local spool of SQS messages is full.
+
+        Spool file: {self.path}
+        Maximum size: {self.max_size} bytes
+
+    Messages are not being shipped to SQS fast enough, or SQS is unavailable.
+    """
+
+    path: str
+    max_size: int
@@ -0,0 +1,151 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from dataclasses import dataclass, field
+from typing import (
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Type,
+)
+
+from mypy_boto3_sqs import Client as SQSClient
+from platonic.sqs.queue.message import SQSMessage
+from platonic.sqs.queue.sender import SQSSender
+from platonic.sqs.queue.sqs import default_client
+from platonic.sqs.queue.types import ValueType
+
+Filter = Optional[Callable[[ValueType], bool]]
+
+
+@dataclass
+class FanOutResult(Generic[ValueType]):
+    """Outcome of sending to every destination, by queue URL."""
+
+    messages: Dict[str, List[SQSMessage[ValueType]]] = field(
+        default_factory=dict,
+    )
+    failures: Dict[str, Exception] = field(default_factory=dict)
+
+    @property
+    def is_successful(self) -> bool:
+        """Every destination has received its messages."""
+        return not self.failures
+
+
+@dataclass
+class SQSFanOutSender(Generic[ValueType]):
+    """
+    Send the same messages to several queues.
+
+    Every value is serialized once, by the first sender, and the bodies are
+    sent to all destination queues concurrently. A destination with a
+    `filters` entry only receives the values that entry accepts.
+
+    A failure to send to one destination does not affect the others, see
+    `FanOutResult`.
+    """
+
+    senders: Sequence[SQSSender[ValueType]]
+    filters: Optional[Sequence[Filter[ValueType]]] = None
+
+    def __post_init__(self) -> None:
+        """Check there is a filter entry for every destination."""
+        if not self.senders:
+            raise ValueError('At least one sender is required.')
+
+        if self.filters is not None and len(self.filters) != len(self.senders):
+            raise ValueError(
+                f'Got {len(self.filters)} filters for '
+                f'{len(self.senders)} senders.',
+            )
+
+    @classmethod
+    def from_urls(
+        cls,
+        urls: Sequence[str],
+        filters: Optional[Sequence[Filter[ValueType]]] = None,
+        sender_class: Type[SQSSender[ValueType]] = SQSSender,
+        client: Optional[SQSClient] = None,
+        **kwargs,
+    ) -> 'SQSFanOutSender[ValueType]':
+        """
+        Construct senders for given URLs sharing one SQS client.
+
+        `sender_class` must be parametrized with value type, for example
+        `SQSSender[int]`. Remaining arguments are passed to every sender.
+        """
+        client = client or default_client()
+        return cls(
+            senders=[
+                sender_class(url=url, client=client, **kwargs)
+                for url in urls
+            ],
+            filters=filters,
+        )
+
+    @property
+    def urls(self) -> List[str]:
+        """URLs of the destination queues."""
+        return [sender.url for sender in self.senders]
+
+    def send(self, instance: ValueType) -> FanOutResult[ValueType]:
+        """Put a message into every destination queue accepting it."""
+        return self.send_many([instance])
+
+    def send_many(
+        self,
+        iterable: Iterable[ValueType],
+    ) -> FanOutResult[ValueType]:
+        """Send multiple messages, every destination in a separate thread."""
+        instances = list(iterable)
+        serialize = self.senders[0].serialize
+        message_bodies = [serialize(instance) for instance in instances]
+
+        filters = self.filters or [None] * len(self.senders)
+        destinations = [
+            (sender, [
+                position
+                for position, instance in enumerate(instances)
+                if value_filter is None or value_filter(instance)
+            ])
+            for sender, value_filter in zip(self.senders, filters)
+        ]
+
+        with ThreadPoolExecutor(max_workers=len(self.senders)) as executor:
+            futures = [
+                (
+                    sender,
+                    positions,
+                    # Trace context of the caller goes along with the call.
+                    executor.submit(
+                        copy_context().run,
+                        sender.send_raw_many,
+                        [message_bodies[position] for position in positions],
+                    ),
+                )
+                for sender, positions in destinations
+            ]
+
+        fan_out_result: FanOutResult[ValueType] = FanOutResult()
+        for sender, positions, future in futures:
+            try:
+                sqs_responses = future.result()
+            except Exception as err:
+                fan_out_result.failures[sender.url] = err
+                continue
+
+            fan_out_result.messages[sender.url] = [
+                SQSMessage(
+                    value=instances[position],
+                    receipt_handle=sqs_response['MessageId'],
+                    message_id=sqs_response['MessageId'],
+                    md5_of_body=sqs_response['MD5OfMessageBody'],
+                )
+                for position, sqs_response in zip(positions, sqs_responses)
+            ]
+
+        return fan_out_result
@@ -0,0 +1,705 @@
+import hashlib
+import json
+import random
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Type
+
+from botocore.exceptions import ClientError
+from mypy_boto3_sqs.type_defs import (
+    ChangeMessageVisibilityBatchRequestEntryTypeDef,
+    DeleteMessageBatchRequestEntryTypeDef,
+    MessageAttributeValueTypeDef,
+    SendMessageBatchRequestEntryTypeDef,
+)
+from platonic.sqs.queue.sqs import (
+    MAX_MESSAGE_SIZE,
+    MAX_NUMBER_OF_MESSAGES,
+    APIResponse,
+)
+from platonic.sqs.queue.transport import (
+    JSON_CONTENT_TYPE,
+    OPERATION_NAMES,
+    QUERY_ERROR_HEADER,
+    TARGET_PREFIX,
+)
+
+LOCAL_ACCOUNT_ID = '000000000000'
+
+# Longest time a long polling ReceiveMessage call sleeps without checking
+# whether in flight messages became visible again.
+POLL_INTERVAL_SECONDS = 0.05
+
+# Queue management calls, which are never throttled: setting up a benchmark or
+# a test must not fail at random.
+UNTHROTTLED_OPERATIONS = frozenset(('create_queue', 'get_queue_url'))
+
+DEFAULT_QUEUE_ATTRIBUTES = {
+    'VisibilityTimeout': '30',
+    'MaximumMessageSize': str(MAX_MESSAGE_SIZE),
+    'ReceiveMessageWaitTimeSeconds': '0',
+    'DelaySeconds': '0',
+}
+
+
+class LocalQueueDoesNotExist(ClientError):
+    """Local queue does not exist."""
+
+
+class LocalReceiptHandleIsInvalid(ClientError):
+    """Receipt handle does not belong to a message in flight."""
+
+
+def _client_error(
+    error_class: Type[ClientError],
+    code: str,
+    operation_name: str,
+) -> ClientError:
+    """Construct a botocore style error."""
+    return error_class(
+        {'Error': {'Code': code, 'Message': code}},
+        operation_name,
+    )
+
+
+def _md5(text: str) -> str:
+    """MD5 hex digest of a string, as calculated by SQS."""
+    return hashlib.md5(text.encode('utf-8')).hexdigest()  # noqa: S303
+
+
+@dataclass
+class _LocalMessage:
+    """Message stored in a local queue."""
+
+    body: str
+    message_attributes: Mapping[str, object]
+    message_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    sent_timestamp: float = field(default_factory=time.time)
+    receive_count: int = 0
+    visible_at: float = 0
+
+    def system_attributes(self, names: Sequence[str]) -> Dict[str, str]:
+        """System attributes of the message requested by name."""
+        attributes = {
+            'ApproximateReceiveCount': str(self.receive_count),
+            'SentTimestamp': str(int(self.sent_timestamp * 1000)),
+        }
+
+        if 'All' in names:
+            return attributes
+
+        return {
+            name: attribute_value
+            for name, attribute_value in attributes.items()
+            if name in names
+        }
+
+
+@dataclass
+class _LocalQueue:
+    """Messages of a local queue."""
+
+    url: str
+    attributes: Dict[str, str]
+    visible: 'OrderedDict[str, _LocalMessage]' = field(
+        default_factory=OrderedDict,
+    )
+    in_flight: Dict[str, _LocalMessage] = field(default_factory=dict)
+
+    @property
+    def visibility_timeout(self) -> int:
+        """Default visibility timeout of the queue, in seconds."""
+        return int(self.attributes['VisibilityTimeout'])
+
+    def requeue_expired(self) -> None:
+        """Return messages with expired visibility timeout to the queue."""
+        now = time.time()
+        expired_handles = [
+            receipt_handle
+            for receipt_handle, message in self.in_flight.items()
+            if message.visible_at <= now
+        ]
+        for receipt_handle in expired_handles:
+            message = self.in_flight.pop(receipt_handle)
+            self.visible[message.message_id] = message
+
+
+@dataclass
+class LocalSQSClient:  # noqa: WPS214
+    """
+    In-process stand-in for boto3 SQS client.
+
+    Implements the operations senders and receivers use, keeping the messages
+    in memory. Meant for benchmarks and tests which should not depend on AWS
+    or on the cost of HTTP calls.
+
+    Every call sleeps for `latency` and, except for queue management, is
+    throttled with probability of `throttling_rate`, to simulate the real
+    service. Numbers of calls per operation are counted in `calls`.
+    """
+
+    latency: timedelta = timedelta(0)
+    throttling_rate: float = 0
+    seed: Optional[int] = None
+    region_name: str = 'local'
+
+    calls: 'Counter[str]' = field(default_factory=Counter, init=False)
+    exceptions: SimpleNamespace = field(
+        default_factory=lambda: SimpleNamespace(
+            ClientError=ClientError,
+            QueueDoesNotExist=LocalQueueDoesNotExist,
+            ReceiptHandleIsInvalid=LocalReceiptHandleIsInvalid,
+        ),
+        init=False,
+        repr=False,
+    )
+    meta: SimpleNamespace = field(init=False, repr=False)
+
+    _queues: Dict[str, _LocalQueue] = field(
+        default_factory=dict,
+        init=False,
+        repr=False,
+    )
+    _random: random.Random = field(init=False, repr=False)
+    _changed: threading.Condition = field(
+        default_factory=threading.Condition,
+        init=False,
+        repr=False,
+    )
+
+    def __post_init__(self) -> None:
+        """Mimic the parts of boto3 client interface we use."""
+        self.meta = SimpleNamespace(region_name=self.region_name)
+        self._random = random.Random(self.seed)  # noqa: S311
+
+    def create_queue(
+        self,
+        QueueName: str,  # noqa: N803
+        Attributes: Optional[Mapping[str, str]] = None,  # noqa: N803
+    ) -> APIResponse:
+        """Create a queue, or return URL of the existing one."""
+        self._simulate('create_queue')
+
+        url = f'https://sqs.{self.region_name}/{LOCAL_ACCOUNT_ID}/{QueueName}'
+        with self._changed:
+            self._queues.setdefault(url, _LocalQueue(
+                url=url,
+                attributes=dict(DEFAULT_QUEUE_ATTRIBUTES, **(Attributes or {})),
+            ))
+
+        return {'QueueUrl': url}
+
+    def get_queue_url(
+        self,
+        QueueName: str,  # noqa: N803
+        QueueOwnerAWSAccountId: Optional[str] = None,  # noqa: N803
+    ) -> APIResponse:
+        """Find queue URL by name."""
+        self._simulate('get_queue_url')
+
+        for url in self._queues:
+            if url.rsplit('/', 1)[-1] == QueueName:
+                return {'QueueUrl': url}
+
+        raise _client_error(
+            LocalQueueDoesNotExist,
+            'AWS.SimpleQueueService.NonExistentQueue',
+            'GetQueueUrl',
+        )
+
+    def get_queue_attributes(
+        self,
+        QueueUrl: str,  # noqa: N803
+        AttributeNames: Sequence[str] = ('All',),  # noqa: N803
+    ) -> APIResponse:
+        """Queue configuration and approximate numbers of messages."""
+        self._simulate('get_queue_attributes')
+
+        with self._changed:
+            queue = self._queue(QueueUrl, 'GetQueueAttributes')
+            queue.requeue_expired()
+            attributes = dict(
+                queue.attributes,
+                ApproximateNumberOfMessages=str(len(queue.visible)),
+                ApproximateNumberOfMessagesNotVisible=str(
+                    len(queue.in_flight),
+                ),
+                ApproximateNumberOfMessagesDelayed='0',
+            )
+
+        if 'All' not in AttributeNames:
+            attributes = {
+                name: attribute_value
+                for name, attribute_value in attributes.items()
+                if name in AttributeNames
+            }
+
+        return {'Attributes': attributes}
+
+    def send_message(
+        self,
+        QueueUrl: str,  # noqa: N803
+        MessageBody: str,  # noqa: N803
+        MessageAttributes: Optional[  # noqa: N803
+            Mapping[str, MessageAttributeValueTypeDef]
+        ] = None,
+    ) -> APIResponse:
+        """Put a message into the queue."""
+        self._simulate('send_message')
+
+        if len(MessageBody) > MAX_MESSAGE_SIZE:
+            raise _client_error(
+                ClientError,
+                'InvalidParameterValue',
+                'SendMessage',
+            )
+
+        with self._changed:
+            message = self._append(
+                self._queue(QueueUrl, 'SendMessage'),
+                MessageBody,
+                MessageAttributes,
+            )
+
+        return {
+            'MessageId': message.message_id,
+            'MD5OfMessageBody': _md5(MessageBody),
+        }
+
+    def send_message_batch(
+        self,
+        QueueUrl: str,  # noqa: N803
+        Entries: Sequence[SendMessageBatchRequestEntryTypeDef],  # noqa: N803
+    ) -> APIResponse:
+        """Put up to ten messages into the queue."""
+        self._simulate('send_message_batch')
+
+        if sum(len(entry['MessageBody']) for entry in Entries) > (
+            MAX_MESSAGE_SIZE
+        ):
+            raise _client_error(
+                ClientError,
+                'BatchRequestTooLong',
+                'SendMessageBatch',
+            )
+
+        with self._changed:
+            queue = self._queue(QueueUrl, 'SendMessageBatch')
+            successful = [
+                {
+                    'Id': entry['Id'],
+                    'MessageId': self._append(
+                        queue,
+                        entry['MessageBody'],
+                        entry.get('MessageAttributes'),
+                    ).message_id,
+                    'MD5OfMessageBody': _md5(entry['MessageBody']),
+                }
+                for entry in Entries
+            ]
+
+        return {'Successful': successful, 'Failed': []}
+
+    def receive_message(  # noqa: WPS211
+        self,
+        QueueUrl: str,  # noqa: N803
+        MaxNumberOfMessages: int = 1,  # noqa: N803
+        WaitTimeSeconds: Optional[int] = None,  # noqa: N803
+        VisibilityTimeout: Optional[int] = None,  # noqa: N803
+        AttributeNames: Sequence[str] = (),  # noqa: N803
+        MessageAttributeNames: Sequence[str] = (),  # noqa: N803
+    ) -> APIResponse:
+        """Receive messages, long polling for up to `WaitTimeSeconds`."""
+        self._simulate('receive_message')
+
+        with self._changed:
+            queue = self._queue(QueueUrl, 'ReceiveMessage')
+            if WaitTimeSeconds is None:
+                WaitTimeSeconds = int(  # noqa: N806
+                    queue.attributes['ReceiveMessageWaitTimeSeconds'],
+                )
+
+            deadline = time.monotonic() + WaitTimeSeconds
+            queue.requeue_expired()
+            while not queue.visible and time.monotonic() < deadline:
+                self._changed.wait(min(
+                    deadline - time.monotonic(),
+                    POLL_INTERVAL_SECONDS,
+                ))
+                queue.requeue_expired()
+
+            received_messages = [
+                self._start_flight(queue, VisibilityTimeout)
+                for _index in range(min(
+                    len(queue.visible),
+                    MaxNumberOfMessages,
+                    MAX_NUMBER_OF_MESSAGES,
+                ))
+            ]
+
+        if not received_messages:
+            return {}
+
+        return {'Messages': [
+            {
+                'MessageId': message.message_id,
+                'ReceiptHandle': receipt_handle,
+                'MD5OfBody': _md5(message.body),
+                'Body': message.body,
+                'Attributes': message.system_attributes(AttributeNames),
+                'MessageAttributes': {
+                    name: attribute_value
+                    for name, attribute_value in (
+                        message.message_attributes.items()
+                    )
+                    if name in MessageAttributeNames or (
+                        'All' in MessageAttributeNames
+                    )
+                },
+            }
+            for receipt_handle, message in received_messages
+        ]}
+
+    def delete_message(
+        self,
+        QueueUrl: str,  # noqa: N803
+        ReceiptHandle: str,  # noqa: N803
+    ) -> APIResponse:
+        """Delete a message in flight."""
+        self._simulate('delete_message')
+
+        with self._changed:
+            self._pop_in_flight(
+                self._queue(QueueUrl, 'DeleteMessage'),
+                ReceiptHandle,
+                'DeleteMessage',
+            )
+
+        return {}
+
+    def delete_message_batch(
+        self,
+        QueueUrl: str,  # noqa: N803
+        Entries: Sequence[DeleteMessageBatchRequestEntryTypeDef],  # noqa: N803
+    ) -> APIResponse:
+        """Delete up to ten messages in flight."""
+        self._simulate('delete_message_batch')
+
+        with self._changed:
+            queue = self._queue(QueueUrl, 'DeleteMessageBatch')
+            return self._batch_response(Entries, [
+                queue.in_flight.pop(entry['ReceiptHandle'], None) is not None
+                for entry in Entries
+            ])
+
+    def change_message_visibility(
+        self,
+        QueueUrl: str,  # noqa: N803
+        ReceiptHandle: str,  # noqa: N803
+        VisibilityTimeout: int,  # noqa: N803
+    ) -> APIResponse:
+        """Change visibility timeout of a message in flight."""
+        self._simulate('change_message_visibility')
+
+        with self._changed:
+            queue = self._queue(QueueUrl, 'ChangeMessageVisibility')
+            if ReceiptHandle not in queue.in_flight:
+                raise _client_error(
+                    LocalReceiptHandleIsInvalid,
+                    'ReceiptHandleIsInvalid',
+                    'ChangeMessageVisibility',
+                )
+
+            self._change_visibility(queue, ReceiptHandle, VisibilityTimeout)
+
+        return {}
+
+    def change_message_visibility_batch(
+        self,
+        QueueUrl: str,  # noqa: N803
+        Entries: Sequence[  # noqa: N803
+            ChangeMessageVisibilityBatchRequestEntryTypeDef
+        ],
+    ) -> APIResponse:
+        """Change visibility timeout of up to ten messages in flight."""
+        self._simulate('change_message_visibility_batch')
+
+        with self._changed:
+            queue = self._queue(QueueUrl, 'ChangeMessageVisibilityBatch')
+            return self._batch_response(Entries, [
+                self._change_visibility(
+                    queue,
+                    entry['ReceiptHandle'],
+                    entry['VisibilityTimeout'],
+                )
+                for entry in Entries
+            ])
+
+    def purge_queue(self, QueueUrl: str) -> APIResponse:  # noqa: N803
+        """Delete every message of the queue."""
+        self._simulate('purge_queue')
+
+        with self._changed:
+            queue = self._queue(QueueUrl, 'PurgeQueue')
+            queue.visible.clear()
+            queue.in_flight.clear()
+
+        return {}
+
+    def _simulate(self, operation_name: str) -> None:
+        """Count the call, and simulate latency and throttling."""
+        with self._changed:
+            self.calls[operation_name] += 1
+            is_throttled = (
+                operation_name not in UNTHROTTLED_OPERATIONS and
+                self._random.random() < self.throttling_rate
+            )
+
+        if self.latency:
+            time.sleep(self.latency.total_seconds())
+
+        if is_throttled:
+            raise _client_error(ClientError, 'RequestThrottled', operation_name)
+
+    def _queue(self, url: str, operation_name: str) -> _LocalQueue:
+        """Find the queue by URL."""
+        try:
+            return self._queues[url]
+        except KeyError as err:
+            raise _client_error(
+                LocalQueueDoesNotExist,
+                'AWS.SimpleQueueService.NonExistentQueue',
+                operation_name,
+            ) from err
+
+    def _append(
+        self,
+        queue: _LocalQueue,
+        body: str,
+        message_attributes: Optional[Mapping[str, object]],
+    ) -> _LocalMessage:
+        """Store a new message and wake up the pollers."""
+        message = _LocalMessage(
+            body=body,
+            message_attributes=message_attributes or {},
+        )
+        queue.visible[message.message_id] = message
+        self._changed.notify_all()
+        return message
+
+    def _start_flight(
+        self,
+        queue: _LocalQueue,
+        visibility_timeout: Optional[int],
+    ) -> Tuple[str, _LocalMessage]:
+        """Hand the oldest visible message over to a consumer."""
+        _message_id, message = queue.visible.popitem(last=False)
+        message.receive_count += 1
+        message.visible_at = time.time() + (
+            queue.visibility_timeout
+            if visibility_timeout is None
+            else visibility_timeout
+        )
+
+        receipt_handle = uuid.uuid4().hex
+        queue.in_flight[receipt_handle] = message
+        return receipt_handle, message
+
+    def _pop_in_flight(
+        self,
+        queue: _LocalQueue,
+        receipt_handle: str,
+        operation_name: str,
+    ) -> _LocalMessage:
+        """Remove a message from the in flight ones."""
+        try:
+            return queue.in_flight.pop(receipt_handle)
+        except KeyError as err:
+            raise _client_error(
+                LocalReceiptHandleIsInvalid,
+                'ReceiptHandleIsInvalid',
+                operation_name,
+            ) from err
+
+    def _change_visibility(
+        self,
+        queue: _LocalQueue,
+        receipt_handle: str,
+        visibility_timeout: int,
+    ) -> bool:
+        """Postpone visibility of a message; False if it is not in flight."""
+        message = queue.in_flight.get(receipt_handle)
+        if message is None:
+            return False
+
+        message.visible_at = time.time() + visibility_timeout
+        if visibility_timeout == 0:
+            queue.requeue_expired()
+            self._changed.notify_all()
+
+        return True
+
+    def _batch_response(
+        self,
+        entries: Sequence[Mapping[str, object]],
+        outcomes: List[bool],
+    ) -> APIResponse:
+        """Compose response of a batch operation on messages in flight."""
+        return {
+            'Successful': [
+                {'Id': entry['Id']}
+                for entry, is_successful in zip(entries, outcomes)
+                if is_successful
+            ],
+            'Failed': [
+                {
+                    'Id': entry['Id'],
+                    'SenderFault': True,
+                    'Code': 'ReceiptHandleIsInvalid',
+                    'Message': 'ReceiptHandleIsInvalid',
+                }
+                for entry, is_successful in zip(entries, outcomes)
+                if not is_successful
+            ],
+        }
+
+
+# boto3 method names by SQS API operation name.
+_METHOD_NAMES = {
+    operation_name: method_name
+    for method_name, operation_name in OPERATION_NAMES.items()
+}
+
+# Error types of SQS JSON protocol by local error class.
+_ERROR_TYPES = {
+    LocalQueueDoesNotExist: 'QueueDoesNotExist',
+    LocalReceiptHandleIsInvalid: 'ReceiptHandleIsInvalid',
+}
+
+
+def _error_type(error: ClientError) -> str:
+    """Error type as reported by SQS JSON protocol."""
+    error_name = _ERROR_TYPES.get(
+        type(error),
+        error.response['Error']['Code'],
+    )
+    return f'com.amazonaws.sqs#{error_name}'
+
+
+class _LocalSQSRequestHandler(BaseHTTPRequestHandler):
+    """Serve SQS JSON protocol requests with `LocalSQSClient`."""
+
+    # Keep connections alive, and do not let Nagle's algorithm delay the
+    # responses.
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_POST(self) -> None:  # noqa: N802
+        """Call the operation named in `X-Amz-Target` header."""
+        payload = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        target = self.headers.get('X-Amz-Target', '')
+        operation_name = target[len(TARGET_PREFIX):]
+
+        try:
+            response = self._call(operation_name, payload)
+
+        except ClientError as err:
+            error_code = err.response['Error']['Code']
+            self._respond(
+                400,
+                {
+                    '__type': _error_type(err),
+                    'message': err.response['Error']['Message'],
+                },
+                {QUERY_ERROR_HEADER: f'{error_code};Sender'},
+            )
+
+        else:
+            self._respond(200, response, {})
+
+    def log_message(self, format, *args) -> None:  # noqa: A002, WPS125
+        """Do not log every request."""
+
+    def _call(self, operation_name: str, payload: bytes) -> APIResponse:
+        """Call the local client, checking the request is signed."""
+        if 'Authorization' not in self.headers:
+            raise _client_error(
+                ClientError,
+                'MissingAuthenticationToken',
+                operation_name,
+            )
+
+        method_name = _METHOD_NAMES.get(operation_name)
+        if method_name is None:
+            raise _client_error(ClientError, 'InvalidAction', operation_name)
+
+        client = self.server.client  # type: ignore
+        return getattr(client, method_name)(**json.loads(payload or b'{}'))
+
+    def _respond(
+        self,
+        status: int,
+        document: Mapping[str, object],
+        headers: Mapping[str, str],
+    ) -> None:
+        """Send a JSON response."""
+        response_body = json.dumps(document).encode('utf-8')
+
+        self.send_response(status)
+        self.send_header('Content-Type', JSON_CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(response_body)))
+        for name, header_value in headers.items():
+            self.send_header(name, header_value)
+        self.end_headers()
+
+        self.wfile.write(response_body)
+
+
+@dataclass
+class LocalSQSServer:
+    """
+    HTTP server exposing `LocalSQSClient` via SQS JSON protocol.
+
+    Use as a context manager, and point `SQSHTTPClient` to `endpoint_url`.
+    Signatures of the requests are not verified.
+    """
+
+    client: LocalSQSClient = field(default_factory=LocalSQSClient)
+    host: str = '127.0.0.1'
+    port: int = 0
+
+    _server: ThreadingHTTPServer = field(init=False, repr=False)
+    _thread: threading.Thread = field(init=False, repr=False)
+
+    @property
+    def endpoint_url(self) -> str:
+        """URL to send requests to."""
+        return f'http://{self.host}:{self._server.server_port}'
+
+    def __enter__(self) -> 'LocalSQSServer':
+        """Start serving in a background thread."""
+        self._server = ThreadingHTTPServer(
+            (self.host, self.port),
+            _LocalSQSRequestHandler,
+        )
+        self._server.daemon_threads = True
+        self._server.client = self.client  # type: ignore
+
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Stop the server."""
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
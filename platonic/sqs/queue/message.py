@@ -1,4 +1,5 @@
 import dataclasses
+from typing import Optional
 
 from platonic.queue import Message
 from platonic.sqs.queue.types import ValueType
@@ -9,3 +10,24 @@ class SQSMessage(Message[ValueType]):
     """SQS message houses unique message ID."""
 
     receipt_handle: str
+
+    # Global identifier of the message assigned by SQS.
+    message_id: Optional[str] = None
+
+    # MD5 digest of the raw message body, as calculated by SQS.
+    md5_of_body: Optional[str] = None
+
+    # How many times the message was received, including this time.
+    receive_count: Optional[int] = None
+
+    # URL of the queue the message was received from.
+    queue_url: Optional[str] = None
+
+    # When the message was sent, as UNIX timestamp in seconds.
+    sent_timestamp: Optional[float] = None
+
+    # Trace context propagated from the sender, in `traceparent` format.
+    trace_context: Optional[str] = None
+
+    # Message body exactly as received from SQS, before deserialization.
+    body: Optional[str] = None
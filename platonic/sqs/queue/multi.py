@@ -0,0 +1,288 @@
+import random
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from itertools import groupby
+from typing import (
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Type,
+)
+
+from mypy_boto3_sqs import Client as SQSClient
+from platonic.queue import MessageReceiveTimeout
+from platonic.sqs.queue.message import SQSMessage
+from platonic.sqs.queue.receiver import SQSReceiver
+from platonic.sqs.queue.sqs import default_client
+from platonic.sqs.queue.types import ValueType
+from platonic.timeout import InfiniteTimeout
+from platonic.timeout.base import BaseTimeout, BaseTimer
+
+
+def _queue_url(message: SQSMessage[ValueType]) -> str:
+    """Source queue of a message."""
+    return message.queue_url or ''
+
+
+@dataclass
+class SQSMultiReceiver(Generic[ValueType]):
+    """
+    Receive messages from several queues by priority.
+
+    Without `weights`, priority is strict: queues are polled in the order of
+    `receivers`, and a queue is only polled when every queue before it is
+    empty. With `weights`, the order of polling is randomized every time,
+    and a queue with weight 2 comes first twice as often as a queue with
+    weight 1.
+
+    When more than `max_in_flight` messages are being processed, only the
+    highest priority queue is polled: the first one, or the one with the
+    largest weight.
+
+    Messages know which queue they came from, and `acknowledge()` and other
+    methods route them to the right receiver.
+    """
+
+    receivers: Sequence[SQSReceiver[ValueType]]
+    weights: Optional[Sequence[float]] = None
+    timeout: BaseTimeout = field(default_factory=InfiniteTimeout)
+    max_in_flight: Optional[int] = None
+
+    _receivers_by_url: Dict[str, SQSReceiver[ValueType]] = field(
+        init=False,
+        repr=False,
+    )
+
+    def __post_init__(self) -> None:
+        """Validate weights and index receivers by URL."""
+        if not self.receivers:
+            raise ValueError('At least one receiver is required.')
+
+        if self.weights is not None:
+            if len(self.weights) != len(self.receivers):
+                raise ValueError(
+                    f'Got {len(self.weights)} weights for '
+                    f'{len(self.receivers)} receivers.',
+                )
+
+            if any(weight <= 0 for weight in self.weights):
+                raise ValueError(
+                    f'Weights must be positive, got {self.weights}.',
+                )
+
+        self._receivers_by_url = {
+            receiver.url: receiver
+            for receiver in self.receivers
+        }
+
+    @classmethod
+    def from_urls(
+        cls,
+        urls: Sequence[str],
+        weights: Optional[Sequence[float]] = None,
+        receiver_class: Type[SQSReceiver[ValueType]] = SQSReceiver,
+        client: Optional[SQSClient] = None,
+        **kwargs,
+    ) -> 'SQSMultiReceiver[ValueType]':
+        """
+        Construct receivers for given URLs sharing one SQS client.
+
+        `receiver_class` must be parametrized with value type, for example
+        `SQSReceiver[int]`. Remaining arguments are passed to every receiver.
+        """
+        client = client or default_client()
+        return cls(
+            receivers=[
+                receiver_class(url=url, client=client, **kwargs)
+                for url in urls
+            ],
+            weights=weights,
+        )
+
+    def receive(self) -> SQSMessage[ValueType]:
+        """Fetch one message from the highest priority non-empty queue."""
+        messages = self._poll_with_timeout(messages_count=1)
+        if messages:
+            return messages[0]
+
+        raise MessageReceiveTimeout(queue=self, timeout=0)
+
+    def __iter__(self) -> Iterator[SQSMessage[ValueType]]:
+        """
+        Iterate over messages of all queues, by priority.
+
+        Like `SQSReceiver`, the iteration ends when no message arrives within
+        `timeout`; the timer restarts after every non-empty poll.
+        """
+        while not self.is_stopped:
+            messages = self._poll_with_timeout()
+            if not messages:
+                return
+
+            yield from self._yield_until_stopped(messages)
+
+    def acknowledge(
+        self,
+        message: SQSMessage[ValueType],
+    ) -> SQSMessage[ValueType]:
+        """Acknowledge the message in the queue it came from."""
+        return self._receiver_of(message).acknowledge(message)
+
+    @contextmanager
+    def acknowledgement(self, message: SQSMessage[ValueType]):
+        """Acknowledge the message on success, reject on failure."""
+        with self._receiver_of(message).acknowledgement(message):
+            yield message
+
+    def acknowledge_many(
+        self,
+        messages: Iterable[SQSMessage[ValueType]],
+    ) -> None:
+        """Acknowledge messages in batches per queue."""
+        for receiver, queue_messages in self._group_by_receiver(messages):
+            receiver.acknowledge_many(queue_messages)
+
+    def reject(
+        self,
+        message: SQSMessage[ValueType],
+    ) -> SQSMessage[ValueType]:
+        """Reject the message in the queue it came from."""
+        return self._receiver_of(message).reject(message)
+
+    def release_many(
+        self,
+        messages: Iterable[SQSMessage[ValueType]],
+    ) -> None:
+        """Return unprocessed messages to their queues immediately."""
+        for receiver, queue_messages in self._group_by_receiver(messages):
+            receiver.release_many(queue_messages)
+
+    def stop(self) -> None:
+        """Stop polling every queue."""
+        for receiver in self.receivers:
+            receiver.stop()
+
+    @property
+    def is_stopped(self) -> bool:
+        """Whether `stop()` was requested."""
+        return any(receiver.is_stopped for receiver in self.receivers)
+
+    @property
+    def in_flight_count(self) -> int:
+        """Number of messages in flight across all queues."""
+        return sum(receiver.in_flight_count for receiver in self.receivers)
+
+    def polling_order(self) -> List[SQSReceiver[ValueType]]:
+        """Receivers in the order they should be polled right now."""
+        if self._is_busy():
+            return [self._highest_priority_receiver()]
+
+        if self.weights is None:
+            return list(self.receivers)
+
+        return self._weighted_random_order(self.weights)
+
+    def _highest_priority_receiver(self) -> SQSReceiver[ValueType]:
+        """The first receiver, or the heaviest one with `weights`."""
+        if self.weights is None:
+            return self.receivers[0]
+
+        weights = self.weights
+        heaviest_position = max(
+            range(len(self.receivers)),
+            key=lambda position: weights[position],
+        )
+        return self.receivers[heaviest_position]
+
+    def _weighted_random_order(
+        self,
+        weights: Sequence[float],
+    ) -> List[SQSReceiver[ValueType]]:
+        """
+        Order receivers randomly, respecting their weights.
+
+        This is weighted random sampling without replacement, see
+        Efraimidis & Spirakis, 2006.
+        """
+        keyed_receivers = [
+            (random.random() ** (1 / weight), receiver)  # noqa: S311
+            for weight, receiver in zip(weights, self.receivers)
+        ]
+        keyed_receivers.sort(key=lambda pair: pair[0], reverse=True)
+
+        return [receiver for _key, receiver in keyed_receivers]
+
+    def _poll_with_timeout(
+        self,
+        messages_count: Optional[int] = None,
+    ) -> List[SQSMessage[ValueType]]:
+        """Poll until some messages are found, `timeout` expires or stop."""
+        with self.timeout.timer() as timer:
+            while not timer.is_expired and not self.is_stopped:
+                messages = self._poll_by_priority(
+                    timer,
+                    messages_count=messages_count,
+                )
+                if messages:
+                    return messages
+
+        return []
+
+    def _yield_until_stopped(
+        self,
+        messages: List[SQSMessage[ValueType]],
+    ) -> Iterator[SQSMessage[ValueType]]:
+        """Yield messages one by one, releasing the rest if stopped."""
+        for position, message in enumerate(messages):
+            if self.is_stopped:
+                self.release_many(messages[position:])
+                return
+
+            yield message
+
+    def _poll_by_priority(
+        self,
+        timer: BaseTimer,
+        messages_count: Optional[int] = None,
+    ) -> List[SQSMessage[ValueType]]:
+        """
+        Poll the queues in order until some messages are found.
+
+        Every queue but the last one is polled without waiting. The last one
+        is long polled, and thus we do not spin when all queues are empty.
+        """
+        *short_polled, long_polled = self.polling_order()
+
+        for receiver in short_polled:
+            messages = receiver.poll(0, messages_count=messages_count)
+            if messages:
+                return messages
+
+        return long_polled.poll(
+            long_polled.wait_time_seconds(timer),
+            messages_count=messages_count,
+        )
+
+    def _is_busy(self) -> bool:
+        """Too many messages are being processed."""
+        return (
+            self.max_in_flight is not None and
+            self.in_flight_count >= self.max_in_flight
+        )
+
+    def _receiver_of(
+        self,
+        message: SQSMessage[ValueType],
+    ) -> SQSReceiver[ValueType]:
+        """Find the receiver the message came from."""
+        return self._receivers_by_url[_queue_url(message)]
+
+    def _group_by_receiver(self, messages: Iterable[SQSMessage[ValueType]]):
+        """Group messages by the receiver they came from."""
+        sorted_messages = sorted(messages, key=_queue_url)
+        for url, queue_messages in groupby(sorted_messages, key=_queue_url):
+            yield self._receivers_by_url[url], list(queue_messages)
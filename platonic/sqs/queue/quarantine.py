@@ -0,0 +1,32 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from mypy_boto3_sqs.type_defs import MessageTypeDef
+
+if TYPE_CHECKING:  # pragma: no cover
+    from platonic.sqs.queue.sender import SQSSender  # noqa: F401
+
+
+@dataclass
+class QuarantinePolicy:
+    """
+    Move messages received too many times to a dead letter queue.
+
+    Such messages likely crash their handler every time. `SQSReceiver`
+    sends their raw bodies to `dead_letter_sender` in batches and deletes
+    them from the original queue, without deserializing them and without
+    handing them over to the client code.
+
+    This works regardless of the redrive policy of the queue.
+    """
+
+    dead_letter_sender: 'SQSSender[str]'
+    max_receive_count: int = 5
+
+    def is_poisonous(self, raw_message: MessageTypeDef) -> bool:
+        """Check if the message was received too many times."""
+        receive_count = raw_message.get('Attributes', {}).get(
+            'ApproximateReceiveCount',
+            1,
+        )
+        return int(receive_count) > self.max_receive_count
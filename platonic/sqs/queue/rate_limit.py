@@ -0,0 +1,120 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, TypeVar
+
+from botocore.exceptions import ClientError
+
+ResponseType = TypeVar('ResponseType')
+
+# Error codes by which AWS tells us to slow down.
+THROTTLING_ERROR_CODES = frozenset((
+    'Throttling',
+    'ThrottlingException',
+    'ThrottledException',
+    'RequestThrottled',
+    'RequestThrottledException',
+    'TooManyRequestsException',
+    'RequestLimitExceeded',
+    'SlowDown',
+))
+
+
+def is_throttling_error(error: Exception) -> bool:
+    """Check if the error means AWS throttles our requests."""
+    return (
+        isinstance(error, ClientError) and
+        error.response.get('Error', {}).get('Code') in THROTTLING_ERROR_CODES
+    )
+
+
+@dataclass
+class RateLimiter:
+    """
+    Token bucket rate limiter adapting to throttling.
+
+    The rate, in API calls per second, is adjusted with AIMD algorithm: it is
+    multiplied by `multiplicative_decrease` whenever AWS throttles a call, and
+    on every successful call it grows, for about `additive_increase` calls
+    per second every second.
+
+    Share one instance among every `SQSSender` and `SQSReceiver` of the
+    process to limit their combined rate.
+    """
+
+    rate: float = 100
+    min_rate: float = 1
+    max_rate: float = 3000
+    additive_increase: float = 10
+    multiplicative_decrease: float = 0.5
+    burst: float = 10
+
+    _tokens: float = field(init=False, repr=False)
+    _updated_at: float = field(init=False, repr=False)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock,
+        init=False,
+        repr=False,
+    )
+
+    def __post_init__(self) -> None:
+        """Start with a full bucket."""
+        self._tokens = self.burst
+        self._updated_at = time.monotonic()
+
+    def acquire(self) -> None:
+        """Block until the next API call is allowed."""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait_seconds = (1 - self._tokens) / self.rate
+
+            time.sleep(wait_seconds)
+
+    def on_success(self) -> None:
+        """Increase the rate additively."""
+        with self._lock:
+            self.rate = min(
+                self.rate + self.additive_increase / self.rate,
+                self.max_rate,
+            )
+
+    def on_throttle(self) -> None:
+        """Decrease the rate multiplicatively and empty the bucket."""
+        with self._lock:
+            self.rate = max(
+                self.rate * self.multiplicative_decrease,
+                self.min_rate,
+            )
+            self._tokens = 0
+
+    def call(self, function: Callable[[], ResponseType]) -> ResponseType:
+        """
+        Call the function at the allowed rate.
+
+        Throttling slows the rate down, and the error is raised: throttled
+        calls are repeated by `RetryPolicy`, through the limiter again.
+        """
+        self.acquire()
+        try:
+            response = function()
+        except ClientError as err:
+            if is_throttling_error(err):
+                self.on_throttle()
+            raise
+
+        self.on_success()
+        return response
+
+    def _refill(self) -> None:
+        """Add the tokens accumulated since last refill."""
+        now = time.monotonic()
+        self._tokens = min(
+            self._tokens + (now - self._updated_at) * self.rate,
+            self.burst,
+        )
+        self._updated_at = now
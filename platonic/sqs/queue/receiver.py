@@ -1,21 +1,51 @@
+import logging
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from dataclasses import dataclass, field
-from typing import Iterable, Iterator, Optional
+from datetime import timedelta
+from functools import partial
+from itertools import takewhile
+from types import FrameType
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, cast
 
 from boltons.iterutils import chunked_iter
 from mypy_boto3_sqs.type_defs import (
     MessageTypeDef,
     ReceiveMessageResultTypeDef,
 )
+from platonic.const import const
 from platonic.queue import MessageReceiveTimeout, Receiver
-from platonic.sqs.queue.acknowledge import generate_delete_message_batch_entry
+from platonic.sqs.queue.acknowledge import (
+    generate_delete_message_batch_entry,
+    generate_raw_delete_message_batch_entry,
+)
+from platonic.sqs.queue.backlog import BACKLOG_ATTRIBUTE_NAMES, Backlog
+from platonic.sqs.queue.batch import SQSBatch
+from platonic.sqs.queue.deduplication import DeduplicationCache
 from platonic.sqs.queue.errors import SQSMessageDoesNotExist
 from platonic.sqs.queue.message import SQSMessage
-from platonic.sqs.queue.sqs import MAX_WAIT_TIME_SECONDS, SQSMixin
+from platonic.sqs.queue.quarantine import QuarantinePolicy
+from platonic.sqs.queue.resolver import QueueAttributes
+from platonic.sqs.queue.sqs import (
+    MAX_VISIBILITY_TIMEOUT,
+    MAX_WAIT_TIME_SECONDS,
+    SQSMixin,
+)
+from platonic.sqs.queue.tracing import TRACE_CONTEXT_ATTRIBUTE, SpanContext
+from platonic.sqs.queue.tuning import AutoTuner
 from platonic.sqs.queue.types import InternalType, ValueType
-from platonic.timeout import InfiniteTimeout
+from platonic.sqs.queue.visibility import (
+    ExponentialRedeliveryDelay,
+    generate_change_message_visibility_batch_entry,
+)
+from platonic.timeout import ConstantTimeout, InfiniteTimeout
 from platonic.timeout.base import BaseTimeout, BaseTimer
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass  # noqa: WPS214
 class SQSReceiver(SQSMixin, Receiver[ValueType]):   # noqa: WPS214
@@ -23,6 +53,92 @@ class SQSReceiver(SQSMixin, Receiver[ValueType]):   # noqa: WPS214
 
     timeout: BaseTimeout = field(default_factory=InfiniteTimeout)
     max_wait_time_seconds: int = MAX_WAIT_TIME_SECONDS
+    max_concurrent_receives: int = field(default=4, metadata={
+        '__doc__': (
+            'Max number of ReceiveMessage API calls `receive_many()` is '
+            'allowed to run in parallel.'
+        ),
+    })
+    deduplication_cache: Optional[DeduplicationCache] = field(
+        default=None,
+        metadata={
+            '__doc__': (
+                'Cache of recently processed message IDs. If provided, '
+                'messages found in the cache are considered duplicates: '
+                'they are acknowledged and skipped automatically.'
+            ),
+        },
+    )
+    deduplicate_by_body: bool = field(default=False, metadata={
+        '__doc__': (
+            'Also consider a message duplicate if a message with the same '
+            'body was recently processed.'
+        ),
+    })
+    redelivery_delay: Callable[[SQSMessage[ValueType]], timedelta] = field(
+        default_factory=const(ExponentialRedeliveryDelay()),
+        metadata={
+            '__doc__': (
+                'For a rejected message, calculate the delay after which it '
+                'will be delivered again.'
+            ),
+        },
+    )
+
+    quarantine: Optional[QuarantinePolicy] = field(default=None, metadata={
+        '__doc__': (
+            'Move messages received too many times to a dead letter queue '
+            'before they are deserialized and handled.'
+        ),
+    })
+
+    auto_tuner: Optional[AutoTuner] = field(default=None, metadata={
+        '__doc__': (
+            'Adjust long polling time and the number of messages pulled at '
+            'once to the queue attributes and to the measured handling time.'
+        ),
+    })
+
+    visibility_timeout_seconds: Optional[int] = field(
+        default=None,
+        metadata={
+            '__doc__': (
+                'Visibility timeout of the queue. Messages received longer '
+                'ago are not counted as in flight anymore. By default, it is '
+                'taken from queue attributes if `resolver` has them cached.'
+            ),
+        },
+    )
+
+    received_count: int = field(default=0, init=False, metadata={
+        '__doc__': 'Number of messages handed over to the client code.',
+    })
+    acknowledged_count: int = field(default=0, init=False, metadata={
+        '__doc__': 'Number of messages acknowledged.',
+    })
+    quarantined_count: int = field(default=0, init=False, metadata={
+        '__doc__': 'Number of messages moved to the dead letter queue.',
+    })
+
+    _stop_requested: threading.Event = field(
+        default_factory=threading.Event,
+        init=False,
+        repr=False,
+    )
+    # When messages in flight were received, by receipt handle, oldest first
+    _in_flight: Dict[str, float] = field(
+        default_factory=dict,
+        init=False,
+        repr=False,
+    )
+    _last_acknowledged_at: float = field(default=0, init=False, repr=False)
+    # Number of messages being pulled by ReceiveMessage calls in progress
+    _reserved_count: int = field(default=0, init=False, repr=False)
+    _in_flight_changed: threading.Condition = field(
+        default_factory=threading.Condition,
+        init=False,
+        repr=False,
+    )
 
     def receive(self) -> SQSMessage[ValueType]:
         """
@@ -35,8 +151,100 @@ class SQSReceiver(SQSMixin, Receiver[ValueType]):   # noqa: WPS214
         property of the received message. This is a non-global identifier
         which is necessary to delete the message from the queue using
         `self.acknowledge()`.
+
+        After `stop()` was called, raises `MessageReceiveTimeout`.
         """
-        return next(self._fetch_messages_with_timeout(messages_count=1))
+        message = next(self._fetch_messages_with_timeout(messages_count=1))
+        self._start_processing([message])
+        return message
+
+    def receive_many(
+        self,
+        max_messages: int,
+        max_latency: timedelta,
+    ) -> SQSBatch[ValueType]:
+        """
+        Collect a batch of messages from the queue.
+
+        Messages are aggregated across multiple, possibly concurrent,
+        ReceiveMessage calls until either `max_messages` messages are
+        collected or `max_latency` has passed, whichever happens first.
+
+        The batch might be empty if the queue is. Acknowledge it as a whole
+        with `SQSBatch.acknowledge()`.
+        """
+        messages: List[SQSMessage[ValueType]] = []
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_concurrent_receives,
+        ) as executor:
+            with ConstantTimeout(period=max_latency).timer() as timer:
+                while self._should_receive_more(messages, max_messages, timer):
+                    wait_time_seconds = self.wait_time_seconds(timer)
+                    polled_batches = executor.map(
+                        partial(self.poll, wait_time_seconds),
+                        self._split_message_count(
+                            max_messages - len(messages),
+                        ),
+                    )
+
+                    for polled_messages in polled_batches:
+                        messages.extend(polled_messages)
+
+                    if not wait_time_seconds:
+                        # Less than a second is left, and more short polls
+                        # would only spin until it passes.
+                        break
+
+        if self.is_stopped:
+            # Nobody is going to process these.
+            self.release_many(messages)
+            messages = []
+
+        return SQSBatch(messages=messages, receiver=self)
+
+    def poll(
+        self,
+        wait_time_seconds: int,
+        messages_count: Optional[int] = None,
+    ) -> List[SQSMessage[ValueType]]:
+        """
+        Make exactly one ReceiveMessage call.
+
+        At most `messages_count` messages, by default `batch_size`, are
+        returned. The list is empty if no messages have arrived within
+        `wait_time_seconds`.
+        """
+        with self._reserved_capacity(
+            messages_count or self.batch_size,
+        ) as reserved_count:
+            response = self._receive_messages(
+                message_count=reserved_count,
+                WaitTimeSeconds=wait_time_seconds,
+            )
+
+            messages = self._convert_raw_messages(
+                response.get('Messages', []),
+            )
+            self._start_processing(messages)
+
+        return messages
+
+    def wait_time_seconds(self, timer: BaseTimer) -> int:
+        """Based on timer instance, calculate SQS WaitTimeSeconds parameter."""
+        return int(min(
+            # The value can be no higher than 20 seconds
+            float(self._max_wait_time_seconds()),
+
+            # But if the remaining allowed time is positive and
+            # less than 20, we use that value as timeout to make sure
+            # we do not exceed the period specified by the user.
+            max(
+                # Here we take precaution against negative values.
+                timer.remaining_seconds,
+                0,
+            ),
+        ))
 
     def acknowledge(
         self,
@@ -49,7 +257,8 @@ class SQSReceiver(SQSMixin, Receiver[ValueType]):   # noqa: WPS214
         Delete a single message from the queue.
         """
         try:
-            self.client.delete_message(
+            self._call_api(
+                'delete_message',
                 QueueUrl=self.url,
                 ReceiptHandle=message.receipt_handle,
             )
@@ -57,6 +266,7 @@ class SQSReceiver(SQSMixin, Receiver[ValueType]):   # noqa: WPS214
         except self.client.exceptions.ReceiptHandleIsInvalid as err:
             raise SQSMessageDoesNotExist(message=message, queue=self) from err
 
+        self._on_acknowledged([message])
         return message
 
     @contextmanager
@@ -71,25 +281,185 @@ class SQSReceiver(SQSMixin, Receiver[ValueType]):   # noqa: WPS214
         Into this context manager, you can wrap any operation with a given
         Message. The context manager will automatically acknowledge the message
         when and if the code in its context completes successfully.
+
+        If the code raises an exception, the message is rejected instead, and
+        the exception is propagated.
         """
-        try:  # noqa: WPS501
-            yield message
+        with self.tracer.span(
+            'SQS handle',
+            parent=SpanContext.from_traceparent(message.trace_context),
+            attributes={'sqs.message_id': message.message_id},
+        ):
+            try:
+                yield message
+
+            except Exception:
+                self._reject_logging_errors(message)
+                raise
 
-        finally:
             self.acknowledge(message)
 
+    def reject(
+        self,
+        message: SQSMessage[ValueType],
+        delay: Optional[timedelta] = None,
+    ) -> SQSMessage[ValueType]:
+        """
+        Reject a message which could not be processed.
+
+        The message will be delivered again after `delay`. By default, the
+        delay is calculated by `redelivery_delay`.
+        """
+        try:
+            self._call_api(
+                'change_message_visibility',
+                QueueUrl=self.url,
+                ReceiptHandle=message.receipt_handle,
+                VisibilityTimeout=self._redelivery_delay_seconds(
+                    message,
+                    delay,
+                ),
+            )
+
+        except self.client.exceptions.ReceiptHandleIsInvalid as err:
+            raise SQSMessageDoesNotExist(message=message, queue=self) from err
+
+        return self._finish_processing(message)
+
+    def reject_many(
+        self,
+        messages: Iterable[SQSMessage[ValueType]],
+        delay: Optional[timedelta] = None,
+    ) -> None:
+        """
+        Reject multiple messages which could not be processed.
+
+        Every message will be delivered again after `delay`, or after its
+        individual delay calculated by `redelivery_delay`.
+        """
+        entries = (
+            generate_change_message_visibility_batch_entry(
+                visibility_timeout=self._redelivery_delay_seconds(
+                    message,
+                    delay,
+                ),
+                message=self._finish_processing(message),
+            )
+            for message in messages
+        )
+        for batch in chunked_iter(entries, self.batch_size):
+            self._call_batch_api('change_message_visibility_batch', batch)
+
     def acknowledge_many(
         self,
         messages: Iterable[SQSMessage[ValueType]],
     ) -> None:
-        """Remove multiple correctly processed messages from the queue."""
-        # FIXME Here, we ignore the success or failure of the request.
-        entries = map(generate_delete_message_batch_entry, messages)
-        batches = chunked_iter(entries, self.batch_size)
-        for batch in batches:
-            self.client.delete_message_batch(
-                QueueUrl=self.url,
-                Entries=batch,
+        """
+        Remove multiple correctly processed messages from the queue.
+
+        Raises `SQSBatchEntriesFailed` if some of the messages could not be
+        deleted.
+        """
+        for batch in chunked_iter(messages, self.batch_size):
+            self._on_acknowledged(batch)
+            self._call_batch_api('delete_message_batch', [
+                generate_delete_message_batch_entry(message)
+                for message in batch
+            ])
+
+    def release_many(
+        self,
+        messages: Iterable[SQSMessage[ValueType]],
+    ) -> None:
+        """
+        Return unprocessed messages to the queue immediately.
+
+        Their visibility timeout is reset to zero, and thus other consumers
+        can receive them right away instead of waiting for the visibility
+        timeout to expire.
+        """
+        self.reject_many(messages, delay=timedelta(0))
+
+    def forget_many(
+        self,
+        messages: Iterable[SQSMessage[ValueType]],
+    ) -> None:
+        """
+        Stop tracking messages as in flight, leaving them in the queue.
+
+        SQS delivers them again after their visibility timeout expires.
+        """
+        for message in messages:
+            self._finish_processing(message)
+
+    def backlog(self) -> Backlog:
+        """
+        Request approximate number of messages in the queue.
+
+        See `BacklogMonitor` for a cached version.
+        """
+        return Backlog.from_raw_attributes(cast(Dict[str, str], self._call_api(
+            'get_queue_attributes',
+            QueueUrl=self.url,
+            AttributeNames=BACKLOG_ATTRIBUTE_NAMES,
+        )['Attributes']))
+
+    def stop(self) -> None:
+        """
+        Request the receiver to stop polling the queue.
+
+        Iteration over the receiver finishes, and the messages it has
+        received but not yet yielded are released back to the queue.
+        """
+        self._stop_requested.set()
+
+    @property
+    def is_stopped(self) -> bool:
+        """Whether `stop()` was requested."""
+        return self._stop_requested.is_set()
+
+    @property
+    def in_flight_count(self) -> int:
+        """
+        Number of received messages not yet acknowledged or released.
+
+        Messages whose visibility timeout has passed are not counted: SQS
+        delivers them again anyway.
+        """
+        return len(self._in_flight)
+
+    def stop_on_signals(
+        self,
+        *signals: signal.Signals,
+    ) -> None:
+        """
+        Call `stop()` when the process receives any of the given signals.
+
+        By default, SIGTERM and SIGINT are handled. Handlers installed
+        before are called after `stop()`, except for the default SIGINT
+        handler raising `KeyboardInterrupt`. Must be called from the main
+        thread.
+        """
+        for signal_number in signals or (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signal_number, partial(
+                self._handle_stop_signal,
+                signal.getsignal(signal_number),
+            ))
+
+    def shutdown(self, timeout: timedelta) -> bool:
+        """
+        Stop polling and wait for in-flight messages to be processed.
+
+        Messages are considered in flight after they were returned by the
+        receiver and until they are acknowledged or released. Returns `True`
+        if all of them were done with within `timeout`, `False` otherwise.
+        """
+        self.stop()
+
+        with self._in_flight_changed:
+            return self._in_flight_changed.wait_for(
+                lambda: not self._in_flight,
+                timeout=timeout.total_seconds(),
             )
 
     def __iter__(self) -> Iterator[SQSMessage[ValueType]]:
@@ -98,15 +468,59 @@ class SQSReceiver(SQSMixin, Receiver[ValueType]):   # noqa: WPS214
 
         If queue is empty, the iterator will, by default, block forever. See
         `SQSReceiver.timeout` argument to change that behavior.
+
+        The iteration ends after `stop()` is called.
         """
-        while True:
+        while not self.is_stopped:
             try:
-                yield from self._fetch_messages_with_timeout(
+                messages = list(self._fetch_messages_with_timeout(
                     messages_count=self.batch_size,
-                )
+                ))
             except MessageReceiveTimeout:
                 return
 
+            yield from self._yield_until_stopped(messages)
+
+    def _yield_until_stopped(
+        self,
+        messages: List[SQSMessage[ValueType]],
+    ) -> Iterator[SQSMessage[ValueType]]:
+        """Yield messages one by one, releasing the rest if stopped."""
+        for position, message in enumerate(messages):
+            if self.is_stopped:
+                self.release_many(messages[position:])
+                return
+
+            self._start_processing([message])
+            yield message
+
+    def _handle_stop_signal(
+        self,
+        previous_handler: object,
+        signal_number: int,
+        frame: Optional[FrameType],
+    ) -> None:
+        """Signal handler which stops the receiver."""
+        self.stop()
+
+        if callable(previous_handler) and (
+            previous_handler is not signal.default_int_handler
+        ):
+            previous_handler(signal_number, frame)
+
+    def _should_receive_more(
+        self,
+        messages: List[SQSMessage[ValueType]],
+        max_messages: int,
+        timer: BaseTimer,
+    ) -> bool:
+        """Decide whether `receive_many()` should continue receiving."""
+        return (
+            len(messages) < max_messages and
+            not timer.is_expired and
+            not self.is_stopped
+        )
+
     def _receive_messages(
         self,
         message_count: int = 1,
@@ -123,11 +537,65 @@ class SQSReceiver(SQSMixin, Receiver[ValueType]):   # noqa: WPS214
                 'WaitTimeSeconds': timeout_seconds,
             })
 
-        return self.client.receive_message(
+        if self.tracer.is_recording:
+            kwargs.setdefault('MessageAttributeNames', [
+                TRACE_CONTEXT_ATTRIBUTE,
+            ])
+
+        if not message_count:
+            # Messages in flight are all the receiver can handle in time.
+            self._wait_for_capacity(kwargs.get('WaitTimeSeconds', 0))
+            return cast(ReceiveMessageResultTypeDef, {})
+
+        return cast(ReceiveMessageResultTypeDef, self._call_api(
+            'receive_message',
             QueueUrl=self.url,
             MaxNumberOfMessages=message_count,
+            AttributeNames=self._requested_attribute_names(),
             **kwargs,
-        )
+        ))
+
+    @contextmanager
+    def _reserved_capacity(self, messages_count: int) -> Iterator[int]:
+        """
+        Reserve capacity for the messages about to be received.
+
+        Yields the number of messages to pull, limited by the auto tuner if
+        any. Until the received messages are registered as in flight, they
+        are counted as reserved, so concurrent polls do not exceed the limit.
+        """
+        if self.auto_tuner is None:
+            yield messages_count
+            return
+
+        queue_attributes = self.queue_attributes
+        with self._in_flight_changed:
+            reserved_count = self._tuned_messages_count(
+                messages_count,
+                queue_attributes,
+            )
+            self._reserved_count += reserved_count
+
+        try:
+            yield reserved_count
+
+        finally:
+            with self._in_flight_changed:
+                self._reserved_count -= reserved_count
+                self._in_flight_changed.notify_all()
+
+    def _wait_for_capacity(self, wait_time_seconds: int) -> None:
+        """Instead of polling, wait for messages in flight to be handled."""
+        queue_attributes = self.queue_attributes
+        with self._in_flight_changed:
+            self._in_flight_changed.wait_for(
+                lambda: self._tuned_messages_count(1, queue_attributes) > 0,
+                timeout=wait_time_seconds,
+            )
+
+    def _requested_attribute_names(self) -> List[str]:
+        """System attributes requested for every received message."""
+        return ['ApproximateReceiveCount', 'SentTimestamp']
 
     def _fetch_messages_with_timeout(
         self,
@@ -135,21 +603,27 @@ class SQSReceiver(SQSMixin, Receiver[ValueType]):   # noqa: WPS214
     ) -> Iterator[SQSMessage[ValueType]]:
         """Within timeout, retrieve the requested number of messages."""
         with self.timeout.timer() as timer:
-            while not timer.is_expired:
+            while not timer.is_expired and not self.is_stopped:
                 try:
-                    raw_messages = self._receive_messages(
-                        message_count=messages_count,
-                        timeout_seconds=self._wait_time_seconds(timer),
-                    )['Messages']
+                    with self._reserved_capacity(
+                        messages_count,
+                    ) as reserved_count:
+                        raw_messages = self._receive_messages(
+                            message_count=reserved_count,
+                            timeout_seconds=self.wait_time_seconds(timer),
+                        )['Messages']
                 except KeyError:
                     # We have not received any messages. Trying again if we can.
                     continue
 
+                messages = self._convert_raw_messages(raw_messages)
+                if not messages:
+                    # Everything we have received were duplicates, or were
+                    # quarantined.
+                    continue
+
                 # Messages received, returning them.
-                yield from map(
-                    self._raw_message_to_sqs_message,
-                    raw_messages,
-                )
+                yield from messages
                 return
 
         raise MessageReceiveTimeout(
@@ -159,30 +633,351 @@ class SQSReceiver(SQSMixin, Receiver[ValueType]):   # noqa: WPS214
             timeout=0,
         )
 
+    def _split_message_count(self, messages_count: int) -> List[int]:
+        """
+        Distribute requested number of messages among ReceiveMessage calls.
+
+        Every call asks for at most `batch_size` messages, and the number of
+        calls does not exceed `max_concurrent_receives`. Thus, we never ask
+        for more messages than we need.
+        """
+        message_counts = [
+            min(self.batch_size, messages_count - offset)
+            for offset in range(0, messages_count, self.batch_size)
+        ]
+
+        return message_counts[:self.max_concurrent_receives]
+
+    def _convert_raw_messages(
+        self,
+        raw_messages: List[MessageTypeDef],
+    ) -> List[SQSMessage[ValueType]]:
+        """Deserialize received messages except poisonous and duplicate."""
+        return self._discard_duplicates(map(
+            self._raw_message_to_sqs_message,
+            self._quarantine_poisonous(raw_messages),
+        ))
+
+    def _quarantine_poisonous(
+        self,
+        raw_messages: List[MessageTypeDef],
+    ) -> List[MessageTypeDef]:
+        """
+        Move poisonous messages to the dead letter queue.
+
+        Their bodies are sent to the dead letter queue first, and only then
+        they are deleted from this queue. Returns the remaining messages.
+
+        If that fails, the failure is logged, and the poisonous messages are
+        left to reappear after their visibility timeout; the healthy ones are
+        returned all the same.
+        """
+        if self.quarantine is None:
+            return raw_messages
+
+        poisonous_messages = [
+            raw_message for raw_message in raw_messages
+            if self.quarantine.is_poisonous(raw_message)
+        ]
+        if not poisonous_messages:
+            return raw_messages
+
+        healthy_messages = [
+            raw_message for raw_message in raw_messages
+            if raw_message not in poisonous_messages
+        ]
+
+        try:
+            self._move_to_dead_letter_queue(
+                self.quarantine,
+                poisonous_messages,
+            )
+        except Exception:
+            logger.exception('Failed to quarantine poisonous SQS messages.')
+            return healthy_messages
+
+        with self._in_flight_changed:
+            self.quarantined_count += len(poisonous_messages)
+
+        return healthy_messages
+
+    def _move_to_dead_letter_queue(
+        self,
+        quarantine: QuarantinePolicy,
+        raw_messages: List[MessageTypeDef],
+    ) -> None:
+        """Send raw messages to the dead letter queue, then delete them."""
+        quarantine.dead_letter_sender.send_raw_many(
+            raw_message['Body'] for raw_message in raw_messages
+        )
+
+        entries = (
+            generate_raw_delete_message_batch_entry(
+                raw_message['ReceiptHandle'],
+            )
+            for raw_message in raw_messages
+        )
+        for batch in chunked_iter(entries, self.batch_size):
+            self._call_batch_api('delete_message_batch', batch)
+
     def _raw_message_to_sqs_message(
         self, raw_message: MessageTypeDef,
     ) -> SQSMessage[ValueType]:
         """Convert a raw SQS message to the proper SQSMessage instance."""
+        attributes = raw_message.get('Attributes', {})
+        sent_timestamp = attributes.get('SentTimestamp')
+        trace_context = raw_message.get('MessageAttributes', {}).get(
+            TRACE_CONTEXT_ATTRIBUTE,
+            {},
+        ).get('StringValue')
+
         # noinspection PyTypeChecker
-        return SQSMessage(  # type: ignore
+        message = SQSMessage(  # type: ignore
             value=self.deserialize_value(InternalType(
                 raw_message['Body'],
             )),
             receipt_handle=raw_message['ReceiptHandle'],
+            message_id=raw_message['MessageId'],
+            md5_of_body=raw_message['MD5OfBody'],
+            queue_url=self.url,
+            receive_count=int(attributes.get('ApproximateReceiveCount', 1)),
+            sent_timestamp=(
+                int(sent_timestamp) / 1000 if sent_timestamp else None
+            ),
+            trace_context=trace_context,
+            body=raw_message['Body'],
         )
 
-    def _wait_time_seconds(self, timer: BaseTimer) -> int:
-        """Based on timer instance, calculate SQS WaitTimeSeconds parameter."""
-        return int(min(
-            # The value can be no higher than 20 seconds
-            float(self.max_wait_time_seconds),
+        self._record_queue_wait(message)
+        return message
 
-            # But if the remaining allowed time is positive and
-            # less than 20, we use that value as timeout to make sure
-            # we do not exceed the period specified by the user.
-            max(
-                # Here we take precaution against negative values.
-                timer.remaining_seconds,
-                0,
+    def _record_queue_wait(self, message: SQSMessage[ValueType]) -> None:
+        """Trace the time the message has spent in the queue."""
+        if message.sent_timestamp is None or not self.tracer.is_recording:
+            return
+
+        self.tracer.record_span(
+            'SQS queue wait',
+            start_time=message.sent_timestamp,
+            end_time=time.time(),
+            parent=SpanContext.from_traceparent(message.trace_context),
+            attributes={'sqs.message_id': message.message_id},
+        )
+
+    def _reject_logging_errors(self, message: SQSMessage[ValueType]) -> None:
+        """
+        Reject a message which failed to be handled.
+
+        A failure to reject is logged, and must not mask the exception which
+        the message handler raised.
+        """
+        try:
+            self.reject(message)
+        except Exception:
+            logger.exception('Failed to reject SQS message.')
+
+    def _redelivery_delay_seconds(
+        self,
+        message: SQSMessage[ValueType],
+        delay: Optional[timedelta],
+    ) -> int:
+        """Visibility timeout to set for a rejected message."""
+        if delay is None:
+            delay = self.redelivery_delay(message)
+
+        if delay < timedelta(0):
+            raise ValueError(f'Redelivery delay cannot be negative: {delay}.')
+
+        return int(min(delay.total_seconds(), MAX_VISIBILITY_TIMEOUT))
+
+    def _deduplication_keys(self, message: SQSMessage[ValueType]) -> List[str]:
+        """Keys under which the message is stored in deduplication cache."""
+        keys = [f'id:{message.message_id}']
+
+        if self.deduplicate_by_body:
+            keys.append(f'md5:{message.md5_of_body}')
+
+        return keys
+
+    def _is_duplicate(self, message: SQSMessage[ValueType]) -> bool:
+        """Check if the message was processed already."""
+        return any(
+            key in self.deduplication_cache  # type: ignore
+            for key in self._deduplication_keys(message)
+        )
+
+    def _discard_duplicates(
+        self,
+        messages: Iterable[SQSMessage[ValueType]],
+    ) -> List[SQSMessage[ValueType]]:
+        """
+        Delete and filter out the duplicate messages.
+
+        Messages are never considered duplicate if deduplication cache is not
+        configured. Duplicates were never handed over to the client code, and
+        thus they are not counted as acknowledged.
+        """
+        messages = list(messages)
+        if self.deduplication_cache is None:
+            return messages
+
+        unique_messages = []
+        duplicates = []
+        for message in messages:
+            if self._is_duplicate(message):
+                duplicates.append(message)
+            else:
+                unique_messages.append(message)
+
+        for batch in chunked_iter(duplicates, self.batch_size):
+            self._call_batch_api('delete_message_batch', [
+                generate_delete_message_batch_entry(self._finish_processing(
+                    duplicate,
+                ))
+                for duplicate in batch
+            ])
+
+        return unique_messages
+
+    def _remember_processed(
+        self,
+        message: SQSMessage[ValueType],
+    ) -> SQSMessage[ValueType]:
+        """Put the processed message into deduplication cache, if any."""
+        if self.deduplication_cache is not None:
+            for key in self._deduplication_keys(message):
+                self.deduplication_cache.add(key)
+
+        return message
+
+    def _on_acknowledged(self, messages: List[SQSMessage[ValueType]]) -> None:
+        """Account for messages acknowledged together."""
+        with self._in_flight_changed:
+            self.acknowledged_count += len(messages)
+            self._measure_handling_time(messages)
+
+        for message in messages:
+            self._remember_processed(self._finish_processing(message))
+
+    def _start_processing(
+        self,
+        messages: Iterable[SQSMessage[ValueType]],
+    ) -> None:
+        """Register messages handed over to the client code as in flight."""
+        visibility_timeout = self._known_visibility_timeout()
+
+        with self._in_flight_changed:
+            received_at = time.monotonic()
+            if visibility_timeout is not None:
+                self._forget_expired(received_at - visibility_timeout)
+
+            for message in messages:
+                self._in_flight[message.receipt_handle] = received_at
+                self.received_count += 1
+
+    def _known_visibility_timeout(self) -> Optional[int]:
+        """
+        Visibility timeout of the queue, if it is known without API calls.
+
+        Bookkeeping must not fail, or messages just received would be left
+        in flight until their visibility timeout.
+        """
+        if self.visibility_timeout_seconds is not None:
+            return self.visibility_timeout_seconds
+
+        queue_attributes = self.resolver.cached_attributes(self.url)
+        if queue_attributes is None:
+            return None
+
+        return queue_attributes.visibility_timeout
+
+    def _forget_expired(self, received_before: float) -> None:
+        """
+        Stop tracking messages received before the given moment.
+
+        Their visibility timeout has passed, and they are not in flight
+        anymore: SQS delivers them again, possibly to another consumer. This
+        keeps memory bounded for the clients which never acknowledge or
+        release messages.
+        """
+        expired_receipt_handles = list(takewhile(
+            lambda receipt_handle: (
+                self._in_flight[receipt_handle] < received_before
             ),
+            self._in_flight,
         ))
+
+        for receipt_handle in expired_receipt_handles:
+            del self._in_flight[receipt_handle]  # noqa: WPS420
+
+        if expired_receipt_handles:
+            self._in_flight_changed.notify_all()
+
+    def _finish_processing(
+        self,
+        message: SQSMessage[ValueType],
+    ) -> SQSMessage[ValueType]:
+        """Message is not in flight anymore."""
+        with self._in_flight_changed:
+            self._in_flight.pop(message.receipt_handle, None)
+            self._in_flight_changed.notify_all()
+
+        return message
+
+    def _measure_handling_time(
+        self,
+        messages: List[SQSMessage[ValueType]],
+    ) -> None:
+        """
+        Measure how long the messages were handled, for auto tuning.
+
+        Messages received together are usually handled one after another.
+        Thus, handling of a message starts when it is received, or when the
+        previous message is acknowledged, whichever is later. Messages
+        acknowledged together make one measurement: the time since handling
+        of the first of them started, divided by their number.
+        """
+        acknowledged_at = time.monotonic()
+        received_at = [
+            self._in_flight[message.receipt_handle]
+            for message in messages
+            if message.receipt_handle in self._in_flight
+        ]
+
+        if self.auto_tuner is not None and received_at:
+            started_at = max(min(received_at), self._last_acknowledged_at)
+            self.auto_tuner.record_handling_time(
+                (acknowledged_at - started_at) / len(received_at),
+            )
+
+        self._last_acknowledged_at = acknowledged_at
+
+    def _tuned_messages_count(
+        self,
+        messages_count: int,
+        queue_attributes: QueueAttributes,
+    ) -> int:
+        """
+        Number of messages to pull, limited by the auto tuner if any.
+
+        Messages being pulled by other polls count as in flight. Call with
+        `_in_flight_changed` held.
+        """
+        if self.auto_tuner is None:
+            return messages_count
+
+        return self.auto_tuner.messages_count(
+            messages_count,
+            in_flight_count=len(self._in_flight) + self._reserved_count,
+            queue_attributes=queue_attributes,
+        )
+
+    def _max_wait_time_seconds(self) -> int:
+        """Max long polling time, chosen by the auto tuner if any."""
+        if self.auto_tuner is None:
+            return self.max_wait_time_seconds
+
+        return self.auto_tuner.wait_time_seconds(
+            self.queue_attributes,
+            default=self.max_wait_time_seconds,
+        )
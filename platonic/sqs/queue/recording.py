@@ -0,0 +1,180 @@
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import partial
+from typing import IO, Dict, List, Mapping, Optional, Sequence, Sized, cast
+
+from botocore.exceptions import ClientError
+from platonic.sqs.queue.sqs import APIResponse
+from platonic.sqs.queue.transport import OPERATION_NAMES
+
+TraceRecord = Dict[str, object]
+APIParameters = Mapping[str, object]
+
+
+def _entries(parameters: APIParameters) -> Sequence[APIParameters]:
+    """Entries of a batch request."""
+    return cast(Sequence[APIParameters], parameters.get('Entries', []))
+
+
+def _body_sizes(entries: Sequence[APIParameters]) -> List[int]:
+    """Sizes of message bodies in batch entries."""
+    return [len(str(entry['MessageBody'])) for entry in entries]
+
+
+def describe_request(
+    operation_name: str,
+    parameters: APIParameters,
+) -> TraceRecord:
+    """Shape of an API request: sizes and counts, without the contents."""
+    if operation_name == 'send_message':
+        return {'sizes': _body_sizes([parameters])}
+
+    if operation_name == 'send_message_batch':
+        return {'sizes': _body_sizes(_entries(parameters))}
+
+    if operation_name == 'receive_message':
+        return {
+            'max': parameters.get('MaxNumberOfMessages', 1),
+            'wait': parameters.get('WaitTimeSeconds', 0),
+        }
+
+    entries: Sequence[APIParameters]
+    if operation_name in {'delete_message', 'change_message_visibility'}:
+        entries = [parameters]
+    else:
+        entries = _entries(parameters)
+
+    record: TraceRecord = {'count': len(entries)}
+    if entries and 'VisibilityTimeout' in entries[0]:
+        record['visibility'] = entries[0]['VisibilityTimeout']
+
+    return record
+
+
+def _message_bodies(
+    operation_name: str,
+    parameters: APIParameters,
+) -> Optional[List[str]]:
+    """Message bodies sent by the request, if any."""
+    if operation_name == 'send_message':
+        return [str(parameters['MessageBody'])]
+
+    if operation_name == 'send_message_batch':
+        return [str(entry['MessageBody']) for entry in _entries(parameters)]
+
+    return None
+
+
+def _received_count(response: APIResponse) -> int:
+    """Number of messages in ReceiveMessage response."""
+    return len(cast(Sized, response.get('Messages', [])))
+
+
+@dataclass
+class RecordingClient:
+    """
+    SQS client wrapper which records every API call to a file.
+
+    Every line of the JSON Lines file at `path` describes one call: its
+    operation, start time relative to the start of recording, duration,
+    numbers and sizes of messages, and error code if it failed. Message
+    bodies are recorded only if `redact_bodies` is False.
+
+    Pass it as `client` to senders and receivers; replay the file with
+    `python -m platonic.sqs.replay`. Calls made after `close()` are passed
+    through without being recorded.
+    """
+
+    client: object
+    path: str
+    redact_bodies: bool = True
+
+    _file: IO[str] = field(init=False, repr=False)
+    _started_at: float = field(init=False, repr=False)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock,
+        init=False,
+        repr=False,
+    )
+
+    def __post_init__(self) -> None:
+        """Start recording."""
+        self._file = open(self.path, 'w', encoding='utf-8')  # noqa: WPS515
+        self._started_at = time.monotonic()
+
+    def __getattr__(self, name: str) -> object:
+        """Record API operations, and pass everything else through."""
+        if name.startswith('_'):
+            # Fields are not set yet, for example while unpickling.
+            raise AttributeError(name)
+
+        if name not in OPERATION_NAMES:
+            return getattr(self.client, name)
+
+        return partial(self._recorded_call, name)
+
+    def close(self) -> None:
+        """Stop recording."""
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self) -> 'RecordingClient':
+        """Use as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Stop recording on exit."""
+        self.close()
+
+    def _recorded_call(
+        self,
+        operation_name: str,
+        **parameters: object,
+    ) -> APIResponse:
+        """Call the operation of the wrapped client, and record the call."""
+        record = self._describe_call(operation_name, parameters)
+        started_at = time.monotonic()
+        try:
+            response: APIResponse = getattr(self.client, operation_name)(
+                **parameters,
+            )
+
+        except ClientError as err:
+            record['error'] = err.response['Error']['Code']
+            raise
+
+        else:
+            if operation_name == 'receive_message':
+                record['received'] = _received_count(response)
+            return response
+
+        finally:
+            self._write(dict(
+                record,
+                op=operation_name,
+                at=round(started_at - self._started_at, 6),
+                ms=round((time.monotonic() - started_at) * 1000, 3),
+            ))
+
+    def _describe_call(
+        self,
+        operation_name: str,
+        parameters: APIParameters,
+    ) -> TraceRecord:
+        """Describe the request, with message bodies unless redacted."""
+        record = describe_request(operation_name, parameters)
+        if not self.redact_bodies:
+            bodies = _message_bodies(operation_name, parameters)
+            if bodies is not None:
+                record['bodies'] = bodies
+
+        return record
+
+    def _write(self, record: TraceRecord) -> None:
+        """Append a record to the file, unless recording has stopped."""
+        line = json.dumps(record, separators=(',', ':'))
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(f'{line}\n')
@@ -0,0 +1,156 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Dict, Generic, Optional, Tuple, TypeVar
+
+from mypy_boto3_sqs import Client as SQSClient
+from platonic.sqs.queue.errors import SQSQueueNameNotFound
+
+CachedValue = TypeVar('CachedValue')
+
+# Queue attributes we fetch and cache.
+QUEUE_ATTRIBUTE_NAMES = [
+    'FifoQueue',
+    'MaximumMessageSize',
+    'VisibilityTimeout',
+    'ReceiveMessageWaitTimeSeconds',
+]
+
+
+@dataclass(frozen=True)
+class QueueAttributes:
+    """Configuration of an SQS queue relevant to senders and receivers."""
+
+    is_fifo: bool
+    maximum_message_size: int
+    visibility_timeout: int
+    receive_message_wait_time_seconds: int
+
+    @classmethod
+    def from_raw_attributes(
+        cls,
+        raw_attributes: Dict[str, str],
+    ) -> 'QueueAttributes':
+        """Parse the response of GetQueueAttributes operation."""
+        return cls(
+            is_fifo=raw_attributes.get('FifoQueue') == 'true',
+            maximum_message_size=int(raw_attributes['MaximumMessageSize']),
+            visibility_timeout=int(raw_attributes['VisibilityTimeout']),
+            receive_message_wait_time_seconds=int(
+                raw_attributes.get('ReceiveMessageWaitTimeSeconds', 0),
+            ),
+        )
+
+
+@dataclass
+class _TTLCache(Generic[CachedValue]):
+    """Thread safe dictionary with expiring values."""
+
+    ttl: timedelta
+    _items: Dict[Tuple[Optional[str], ...], Tuple[CachedValue, float]] = field(
+        default_factory=dict,
+        init=False,
+    )
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    def get(self, key: Tuple[Optional[str], ...]) -> Optional[CachedValue]:
+        """Get a value which is not expired yet, or None."""
+        with self._lock:
+            value, expires_at = self._items.get(key, (None, 0))
+
+        if expires_at <= time.monotonic():
+            return None
+
+        return value
+
+    def set(  # noqa: WPS125
+        self,
+        key: Tuple[Optional[str], ...],
+        value: CachedValue,
+    ) -> CachedValue:
+        """Store a value."""
+        expires_at = time.monotonic() + self.ttl.total_seconds()
+        with self._lock:
+            self._items[key] = (value, expires_at)
+
+        return value
+
+    def clear(self) -> None:
+        """Forget everything."""
+        with self._lock:
+            self._items.clear()
+
+
+@dataclass
+class QueueResolver:
+    """
+    Resolve queue names into URLs, and URLs into queue attributes.
+
+    Results of GetQueueUrl and GetQueueAttributes calls are cached for `ttl`.
+    """
+
+    ttl: timedelta = timedelta(minutes=10)
+
+    _urls: _TTLCache[str] = field(init=False, repr=False)
+    _attributes: _TTLCache[QueueAttributes] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Initialize the caches."""
+        self._urls = _TTLCache(ttl=self.ttl)
+        self._attributes = _TTLCache(ttl=self.ttl)
+
+    def url(
+        self,
+        client: SQSClient,
+        queue_name: str,
+        account_id: Optional[str] = None,
+    ) -> str:
+        """Find URL of a queue by its name."""
+        key = (client.meta.region_name, account_id, queue_name)
+        cached_url = self._urls.get(key)
+        if cached_url is not None:
+            return cached_url
+
+        request = {'QueueName': queue_name}
+        if account_id is not None:
+            request['QueueOwnerAWSAccountId'] = account_id
+
+        try:
+            queue_url = client.get_queue_url(**request)['QueueUrl']
+        except client.exceptions.QueueDoesNotExist as err:
+            raise SQSQueueNameNotFound(
+                queue_name=queue_name,
+                account_id=account_id,
+            ) from err
+
+        return self._urls.set(key, queue_url)
+
+    def attributes(self, client: SQSClient, url: str) -> QueueAttributes:
+        """Get attributes of a queue by its URL."""
+        cached_attributes = self._attributes.get((url, ))
+        if cached_attributes is not None:
+            return cached_attributes
+
+        raw_attributes = client.get_queue_attributes(
+            QueueUrl=url,
+            AttributeNames=QUEUE_ATTRIBUTE_NAMES,  # type: ignore
+        )['Attributes']
+
+        return self._attributes.set(
+            (url, ),
+            QueueAttributes.from_raw_attributes(raw_attributes),
+        )
+
+    def cached_attributes(self, url: str) -> Optional[QueueAttributes]:
+        """Attributes of a queue if they are cached, without an API call."""
+        return self._attributes.get((url, ))
+
+    def clear(self) -> None:
+        """Forget everything we have cached."""
+        self._urls.clear()
+        self._attributes.clear()
+
+
+# Process wide resolver instance.
+queue_resolver = QueueResolver()
@@ -0,0 +1,260 @@
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Callable, List, Mapping, Optional, Tuple, TypeVar
+
+from botocore.exceptions import ClientError
+from botocore.exceptions import ConnectionError as BotocoreConnectionError
+from botocore.exceptions import HTTPClientError
+from mypy_boto3_sqs.type_defs import BatchResultErrorEntryTypeDef
+from platonic.const import const
+from platonic.sqs.queue.errors import SQSCircuitOpen
+from platonic.sqs.queue.rate_limit import THROTTLING_ERROR_CODES
+
+ResponseType = TypeVar('ResponseType')
+EntryType = TypeVar('EntryType', bound=Mapping[str, object])
+BatchResultEntry = Mapping[str, str]
+
+# Error codes of failures which are worth retrying.
+RETRYABLE_ERROR_CODES = THROTTLING_ERROR_CODES | frozenset((
+    'InternalError',
+    'InternalFailure',
+    'ServiceUnavailable',
+    'RequestTimeout',
+    'RequestTimeoutException',
+    'PriorRequestNotComplete',
+))
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """Check if the error is transient and the call might succeed later."""
+    if isinstance(error, (BotocoreConnectionError, HTTPClientError)):
+        return True
+
+    return (
+        isinstance(error, ClientError) and
+        error.response.get('Error', {}).get('Code') in RETRYABLE_ERROR_CODES
+    )
+
+
+@dataclass
+class RetryBudget:
+    """
+    Limit the share of retries among all calls.
+
+    Every successful call deposits `ratio` tokens to the budget, up to
+    `max_tokens`, and every retry withdraws one. When the budget is empty,
+    failing calls are not retried: this prevents retry storms when the
+    service is down.
+    """
+
+    ratio: float = 0.1
+    max_tokens: float = 10
+
+    _tokens: float = field(init=False, repr=False)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock,
+        init=False,
+        repr=False,
+    )
+
+    def __post_init__(self) -> None:
+        """Start with a full budget."""
+        self._tokens = self.max_tokens
+
+    def deposit(self) -> None:
+        """Successful call replenishes the budget."""
+        with self._lock:
+            self._tokens = min(self._tokens + self.ratio, self.max_tokens)
+
+    def withdraw(self) -> bool:
+        """Try to take one retry from the budget."""
+        with self._lock:
+            if self._tokens < 1:
+                return False
+
+            self._tokens -= 1
+            return True
+
+
+# Process wide retry budget, shared by retry policies by default.
+retry_budget = RetryBudget()
+
+
+@dataclass
+class CircuitBreaker:
+    """
+    Stop calling the service after a series of consecutive failures.
+
+    After `failure_threshold` consecutive transient failures the circuit
+    opens, and every call fails immediately with `SQSCircuitOpen`. When
+    `reset_timeout` passes, calls are let through again; the circuit closes
+    on the first success and opens again on the first failure.
+    """
+
+    failure_threshold: int = 5
+    reset_timeout: timedelta = timedelta(seconds=30)
+
+    _failures_count: int = field(default=0, init=False, repr=False)
+    _opened_at: Optional[float] = field(default=None, init=False, repr=False)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock,
+        init=False,
+        repr=False,
+    )
+
+    def before_call(self) -> None:
+        """Raise `SQSCircuitOpen` if calls are not allowed."""
+        with self._lock:
+            if self._opened_at is None:
+                return
+
+            retry_after_seconds = (
+                self._opened_at +
+                self.reset_timeout.total_seconds() -
+                time.monotonic()
+            )
+
+        if retry_after_seconds > 0:
+            raise SQSCircuitOpen(retry_after_seconds=retry_after_seconds)
+
+    def on_success(self) -> None:
+        """Close the circuit."""
+        with self._lock:
+            self._failures_count = 0
+            self._opened_at = None
+
+    def on_failure(self) -> None:
+        """Count the failure, and open the circuit if there are too many."""
+        with self._lock:
+            self._failures_count += 1
+            if self._failures_count >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+@dataclass
+class RetryPolicy:
+    """
+    How to retry failing SQS API calls.
+
+    Transient failures are retried up to `max_attempts` times in total, with
+    exponential backoff and full jitter. Retries are additionally limited by
+    `budget`, shared by the whole process by default, and `circuit_breaker`
+    stops calls altogether when the service seems to be down.
+    """
+
+    max_attempts: int = 3
+    base_delay: timedelta = timedelta(milliseconds=50)
+    max_delay: timedelta = timedelta(seconds=5)
+    budget: Optional[RetryBudget] = field(
+        default_factory=const(retry_budget),
+    )
+    circuit_breaker: Optional[CircuitBreaker] = None
+
+    def backoff_seconds(self, attempt: int) -> float:
+        """Randomized delay after given failed attempt."""
+        ceiling = min(
+            self.base_delay.total_seconds() * (2 ** attempt),
+            self.max_delay.total_seconds(),
+        )
+        return random.uniform(0, ceiling)  # noqa: S311
+
+    def call(self, function: Callable[[], ResponseType]) -> ResponseType:
+        """Call the function, retrying transient failures."""
+        attempt = 1
+        while True:
+            try:
+                return self._call_once(function)
+            except Exception as err:
+                if not is_retryable_error(err) or not self._may_retry(attempt):
+                    raise
+
+            time.sleep(self.backoff_seconds(attempt))
+            attempt += 1
+
+    def call_batch(
+        self,
+        function: Callable[[List[EntryType]], Mapping[str, object]],
+        entries: List[EntryType],
+    ) -> Tuple[List[BatchResultEntry], List[BatchResultErrorEntryTypeDef]]:
+        """
+        Call a batch operation, retrying the entries which failed.
+
+        `function` is called with a list of entries. Entries which failed
+        due to a fault on AWS side are retried, entries which failed because
+        of the sender fault are not.
+
+        Returns results of the entries which succeeded, as listed in
+        `Successful` field of the responses, and failures of those which did
+        not.
+        """
+        succeeded: List[BatchResultEntry] = []
+        failures: List[BatchResultErrorEntryTypeDef] = []
+
+        attempt = 1
+        while entries:
+            response = function(entries)
+            failures_by_id = {
+                failure['Id']: failure
+                for failure in response.get('Failed', [])  # type: ignore
+            }
+
+            succeeded.extend(response.get('Successful', []))  # type: ignore
+            failures.extend(
+                failure for failure in failures_by_id.values()
+                if failure['SenderFault']
+            )
+
+            entries = [
+                entry for entry in entries
+                if entry['Id'] in failures_by_id and
+                not failures_by_id[entry['Id']]['SenderFault']
+            ]
+            if entries and not self._may_retry(attempt):
+                failures.extend(
+                    failures_by_id[entry['Id']] for entry in entries
+                )
+                break
+
+            if entries:
+                time.sleep(self.backoff_seconds(attempt))
+                attempt += 1
+
+        return succeeded, failures
+
+    def _call_once(self, function: Callable[[], ResponseType]) -> ResponseType:
+        """Make one attempt, and account for its outcome."""
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.before_call()
+
+        try:
+            response = function()
+        except Exception as err:
+            if is_retryable_error(err):
+                self._on_failure()
+            raise
+
+        self._on_success()
+        return response
+
+    def _may_retry(self, attempt: int) -> bool:
+        """Decide whether another attempt is allowed."""
+        if attempt >= self.max_attempts:
+            return False
+
+        return self.budget is None or self.budget.withdraw()
+
+    def _on_success(self) -> None:
+        """Account for a successful call."""
+        if self.budget is not None:
+            self.budget.deposit()
+
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.on_success()
+
+    def _on_failure(self) -> None:
+        """Account for a failed call."""
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.on_failure()
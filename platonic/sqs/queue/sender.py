@@ -1,34 +1,90 @@
 import json
-import uuid
-from functools import reduce
-from typing import Iterable, List
+from dataclasses import dataclass, field
+from itertools import repeat
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    cast,
+)
 
 from mypy_boto3_sqs.client import BotocoreClientError
-from mypy_boto3_sqs.type_defs import SendMessageBatchRequestEntryTypeDef
+from mypy_boto3_sqs.type_defs import (
+    MessageAttributeValueTypeDef,
+    SendMessageBatchRequestEntryTypeDef,
+    SendMessageResultTypeDef,
+)
 from platonic.queue import MessageTooLarge, Sender
 from platonic.sqs.queue.errors import SQSQueueDoesNotExist
 from platonic.sqs.queue.message import SQSMessage
-from platonic.sqs.queue.sqs import MAX_MESSAGE_SIZE, SQSMixin
+from platonic.sqs.queue.retry import BatchResultEntry
+from platonic.sqs.queue.serialization import SerializationCache
+from platonic.sqs.queue.sqs import SQSMixin
+from platonic.sqs.queue.tracing import TRACE_CONTEXT_ATTRIBUTE, SpanContext
 from platonic.sqs.queue.types import ValueType
 
+ItemType = TypeVar('ItemType')
+
 
 def _error_code_is(error: BotocoreClientError, error_code: str) -> bool:
     """Check error code of a boto3 ClientError."""
     return error.response['Error']['Code'] == error_code
 
 
+def _entry_size(entry: SendMessageBatchRequestEntryTypeDef) -> int:
+    """Size of message body and message attributes of a batch entry."""
+    attributes_size = sum(
+        len(name) + len(attribute['DataType']) + len(
+            attribute.get('StringValue', ''),
+        )
+        for name, attribute in entry.get('MessageAttributes', {}).items()
+    )
+
+    return len(entry['MessageBody']) + attributes_size
+
+
+@dataclass
 class SQSSender(SQSMixin, Sender[ValueType]):
     """Queue to write stuff into."""
 
+    serialization_cache: Optional[SerializationCache] = field(
+        default=None,
+        metadata={
+            '__doc__': (
+                'Reuse serialized forms of values sent before. Worth it when '
+                'the same hashable values are sent over and over.'
+            ),
+        },
+    )
+
+    def serialize(self, instance: ValueType) -> str:
+        """Serialize a value, via `serialization_cache` if there is one."""
+        if self.serialization_cache is None:
+            return self.serialize_value(instance)
+
+        return self.serialization_cache.serialize(
+            instance,
+            self.serialize_value,
+        )
+
     def send(self, instance: ValueType) -> SQSMessage[ValueType]:
         """Put a message into the queue."""
-        message_body = self.serialize_value(instance)
+        message_body = self.serialize(instance)
 
         try:
-            sqs_response = self.client.send_message(
-                QueueUrl=self.url,
-                MessageBody=message_body,
-            )
+            with self.tracer.span('SQS send'):
+                sqs_response = cast(SendMessageResultTypeDef, self._call_api(
+                    'send_message',
+                    QueueUrl=self.url,
+                    MessageBody=message_body,
+                    **self._message_attributes_arguments(
+                        self.tracer.current_context(),
+                    ),
+                ))
 
         except self.client.exceptions.QueueDoesNotExist as queue_does_not_exist:
             raise SQSQueueDoesNotExist(queue=self) from queue_does_not_exist
@@ -36,7 +92,7 @@ class SQSSender(SQSMixin, Sender[ValueType]):
         except self.client.exceptions.ClientError as err:
             if _error_code_is(err, 'InvalidParameterValue'):
                 raise MessageTooLarge(
-                    max_supported_size=MAX_MESSAGE_SIZE,
+                    max_supported_size=self.max_message_size,
                     message_body=message_body,
                 )
 
@@ -47,37 +103,115 @@ class SQSSender(SQSMixin, Sender[ValueType]):
             # FIXME this probably is not correct. `id` contains MessageId in
             #   one cases and ResponseHandle in others. Inconsistent.
             receipt_handle=sqs_response['MessageId'],
+            message_id=sqs_response['MessageId'],
+            md5_of_body=sqs_response['MD5OfMessageBody'],
         )
 
-    def send_many(self, iterable: Iterable[ValueType]) -> None:
-        """Send multiple messages."""
-        send_batch_entries = map(
-            self._generate_send_batch_entry,
-            iterable,
+    def send_many(  # type: ignore
+        self,
+        iterable: Iterable[ValueType],
+    ) -> List[SQSMessage[ValueType]]:
+        """
+        Send multiple messages.
+
+        Returns one message per input value, in the same order, with
+        `message_id` and `md5_of_body` provided by SQS.
+        """
+        return list(self.iter_send_many(iterable))
+
+    def iter_send_many(
+        self,
+        iterable: Iterable[ValueType],
+    ) -> Iterator[SQSMessage[ValueType]]:
+        """
+        Send multiple messages, yielding results batch by batch.
+
+        Unlike `send_many()`, this does not keep all the results in memory,
+        and therefore is suitable for huge inputs. Nothing is sent until
+        iteration starts. Messages carry the trace context current when
+        iteration starts.
+        """
+        trace_context = self.tracer.current_context()
+        entries = (
+            (instance, self._generate_send_batch_entry(instance, trace_context))
+            for instance in iterable
         )
 
-        trailing_entries: List[SendMessageBatchRequestEntryTypeDef] = reduce(
-            self._accumulate_batch_for_sending,
-            send_batch_entries,
-            [],
+        for instance, sqs_response in self._send_entries(entries):
+            yield SQSMessage(  # type: ignore
+                value=instance,
+                receipt_handle=sqs_response['MessageId'],
+                message_id=sqs_response['MessageId'],
+                md5_of_body=sqs_response['MD5OfMessageBody'],
+            )
+
+    def send_raw_many(
+        self,
+        message_bodies: Iterable[str],
+        trace_contexts: Optional[Iterable[Optional[SpanContext]]] = None,
+    ) -> List[BatchResultEntry]:
+        """
+        Send already serialized message bodies.
+
+        By default, messages carry the current trace context. To propagate
+        the contexts messages were originally produced in, pass one context
+        per body in `trace_contexts`.
+
+        Returns results reported by SQS, one per body, in the same order.
+        """
+        if trace_contexts is None:
+            trace_contexts = repeat(self.tracer.current_context())
+
+        entries = (
+            (body, self._generate_raw_send_batch_entry(body, context))
+            for body, context in zip(message_bodies, trace_contexts)
         )
 
-        # The last batch returned from reduce() is sendable (see postcondition
-        # for `_accumulate_batch_for_sending()` function), and it was not sent
-        # by _accumulate_batch_for_sending() itself. We are at the end of the
-        # entries sequence, we have to send it out.
-        if trailing_entries:
-            self._send_message_batch(trailing_entries)
+        return [
+            sqs_response
+            for _body, sqs_response in self._send_entries(entries)
+        ]
+
+    def _send_entries(
+        self,
+        entries: Iterable[Tuple[ItemType, SendMessageBatchRequestEntryTypeDef]],
+    ) -> Iterator[Tuple[ItemType, BatchResultEntry]]:
+        """
+        Send entries in batches.
+
+        Every entry is accompanied by an arbitrary item, and that item is
+        yielded back together with the result of sending the entry. Every
+        batch is sent within its own span, which is closed before yielding.
+        """
+        for batch in self._split_into_batches(entries):
+            batch_entries = [
+                dict(entry, Id=self._generate_batch_entry_id(index))
+                for index, (_item, entry) in enumerate(batch)
+            ]
+
+            with self.tracer.span('SQS send_many'):
+                results_by_id = {
+                    sqs_response['Id']: sqs_response
+                    for sqs_response in self._send_message_batch(
+                        batch_entries,  # type: ignore
+                    )
+                }
+
+            for (item, _entry), batch_entry in zip(batch, batch_entries):
+                yield item, results_by_id[batch_entry['Id']]
 
     def _send_message_batch(
         self,
         entries: List[SendMessageBatchRequestEntryTypeDef],
-    ):
+    ) -> List[BatchResultEntry]:
+        """
+        Send one batch.
+
+        Entries failed on AWS side are resubmitted in fresh batches, see
+        `SQSMixin._call_batch_api()`.
+        """
         try:
-            self.client.send_message_batch(
-                QueueUrl=self.url,
-                Entries=entries,
-            )
+            return self._call_batch_api('send_message_batch', entries)
 
         except self.client.exceptions.QueueDoesNotExist as does_not_exist:
             raise SQSQueueDoesNotExist(queue=self) from does_not_exist
@@ -85,72 +219,118 @@ class SQSSender(SQSMixin, Sender[ValueType]):
         except self.client.exceptions.ClientError as err:
             if _error_code_is(err, 'BatchRequestTooLong'):   # pragma: no cover
                 raise MessageTooLarge(
-                    max_supported_size=MAX_MESSAGE_SIZE,
+                    max_supported_size=self.max_message_size,
                     message_body=json.dumps(entries),
                 )
 
             raise
 
-    def _accumulate_batch_for_sending(
+    def _split_into_batches(
         self,
-        existing_entries: List[SendMessageBatchRequestEntryTypeDef],
-        new_entry: SendMessageBatchRequestEntryTypeDef,
-    ) -> List[SendMessageBatchRequestEntryTypeDef]:
+        entries: Iterable[Tuple[ItemType, SendMessageBatchRequestEntryTypeDef]],
+    ) -> Iterator[List[Tuple[ItemType, SendMessageBatchRequestEntryTypeDef]]]:
+        """
+        Group entries into batches eligible for sending out.
+
+        Every batch contains at most `batch_size` entries, and their total
+        size does not exceed `max_message_size`.
         """
-        Analyse a batch of entries plus a new one.
+        batch: List[Tuple[ItemType, SendMessageBatchRequestEntryTypeDef]] = []
+        total_size = 0
 
-        If the new entry can be appended to the batch, and it still will be
-        eligible for sending out to the queue, do that.
+        for item, entry in entries:
+            entry_size = self._validated_entry_size(entry)
+            is_full = (
+                total_size + entry_size > self.max_message_size or
+                len(batch) >= self.batch_size
+            )
+            if batch and is_full:
+                yield batch
+                batch = []
+                total_size = 0
 
-        Otherwise, send the batch while we can, and start a new one which will
-        only contain the new_entry in it.
+            batch.append((item, entry))
+            total_size += entry_size
 
-        Precondition: existing_entries is a batch that is eligible to be
-        sent out, because we verified that on a previous iteration.
+        if batch:
+            yield batch
 
-        Postcondition: the list returned by this function is
-            - not empty,
-            - eligible to be sent out.
+    def validate_message_size(
+        self,
+        message_body: str,
+        trace_context: Optional[SpanContext] = None,
+    ) -> None:
         """
-        new_batch_size = sum(
-            len(entry['MessageBody'])
-            for entry in existing_entries + [new_entry]
-        )
-
-        if new_batch_size > MAX_MESSAGE_SIZE:
-            # We cannot add new entry to the existing batch because it will be
-            # too large. Let's send it out.
-            if existing_entries:
-                self._send_message_batch(existing_entries)
-            else:
-                raise MessageTooLarge(
-                    max_supported_size=MAX_MESSAGE_SIZE,
-                    message_body=new_entry['MessageBody'],
-                )
+        Raise `MessageTooLarge` if the message cannot be sent.
 
-            return [new_entry]
+        The size of the message includes its message attributes, and thus
+        depends on the trace context the message is sent with.
+        """
+        self._validated_entry_size(
+            self._generate_raw_send_batch_entry(message_body, trace_context),
+        )
 
-        new_batch_count = len(existing_entries) + 1
-        if new_batch_count > self.batch_size:
-            # We cannot add a new entry to this batch because its entry count
-            # is already at the max limit. Sending it out.
-            self._send_message_batch(existing_entries)
-            return [new_entry]
+    def _validated_entry_size(
+        self,
+        entry: SendMessageBatchRequestEntryTypeDef,
+    ) -> int:
+        """Size of a batch entry; raise `MessageTooLarge` if it is too big."""
+        entry_size = _entry_size(entry)
+        if entry_size > self.max_message_size:
+            raise MessageTooLarge(
+                max_supported_size=self.max_message_size,
+                message_body=entry['MessageBody'],
+            )
 
-        # No problems found. Adding new entry to the batch! Perhaps we will send
-        # it on next iteration.
-        return existing_entries + [new_entry]
+        return entry_size
 
-    def _generate_batch_entry_id(self) -> str:
-        """Generate batch entry id."""
-        return uuid.uuid4().hex
+    def _generate_batch_entry_id(self, index: int) -> str:
+        """Generate batch entry id, unique within the batch."""
+        return str(index)
 
     def _generate_send_batch_entry(
         self,
         instance: ValueType,
+        trace_context: Optional[SpanContext],
     ) -> SendMessageBatchRequestEntryTypeDef:
-        """Compose the entry for send_message_batch() operation."""
-        return SendMessageBatchRequestEntryTypeDef(
-            Id=self._generate_batch_entry_id(),
-            MessageBody=self.serialize_value(instance),
+        """
+        Compose the entry for send_message_batch() operation.
+
+        Entry `Id` is assigned later, when the batch is formed.
+        """
+        return self._generate_raw_send_batch_entry(
+            self.serialize(instance),
+            trace_context,
         )
+
+    def _generate_raw_send_batch_entry(
+        self,
+        message_body: str,
+        trace_context: Optional[SpanContext],
+    ) -> SendMessageBatchRequestEntryTypeDef:
+        """Compose the entry for an already serialized message body."""
+        return SendMessageBatchRequestEntryTypeDef(  # type: ignore
+            MessageBody=message_body,
+            **self._message_attributes_arguments(trace_context),
+        )
+
+    def _message_attributes_arguments(
+        self,
+        trace_context: Optional[SpanContext],
+    ) -> Dict[str, Dict[str, MessageAttributeValueTypeDef]]:
+        """
+        MessageAttributes argument for the message being sent, if any.
+
+        Currently, only trace context is propagated via message attributes.
+        """
+        if trace_context is None:
+            return {}
+
+        return {
+            'MessageAttributes': {
+                TRACE_CONTEXT_ATTRIBUTE: {
+                    'DataType': 'String',
+                    'StringValue': trace_context.to_traceparent(),
+                },
+            },
+        }
@@ -0,0 +1,105 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Callable, Hashable, Optional, TypeVar
+
+SerializedType = TypeVar('SerializedType')
+
+# Types whose equal values of the same type always serialize the same way.
+# Floats are not here: 0.0 == -0.0, and neither is Decimal: 1 == 1.0.
+ATOMIC_TYPES = (str, bytes, int, Enum, type(None))
+
+
+def cache_key(instance: object) -> Optional[Hashable]:
+    """
+    Type tagged structural key of a value, None if it cannot be cached.
+
+    Tuples and frozensets are keyed by the keys of their items, because
+    `(1,) == (True,)`, and yet they serialize differently.
+    """
+    if isinstance(instance, ATOMIC_TYPES):
+        return type(instance), instance
+
+    if not isinstance(instance, (tuple, frozenset)):
+        return None
+
+    item_keys = [cache_key(item) for item in instance]
+    if None in item_keys:
+        return None
+
+    if isinstance(instance, frozenset):
+        return type(instance), frozenset(item_keys)
+
+    return type(instance), tuple(item_keys)
+
+
+@dataclass
+class SerializationCache:
+    """
+    Bounded LRU cache of serialized values.
+
+    Useful for senders which send the same few values over and over. Only
+    values which cannot be equal and yet serialize differently are cached,
+    see `cache_key()`: strings, bytes, integers, enums, None, and tuples and
+    frozensets of those. Other values are serialized every time, and are
+    counted in `bypassed`.
+
+    Share one cache only among senders with the same typecasts.
+    """
+
+    max_size: int = 1024
+
+    hits: int = field(default=0, init=False)
+    misses: int = field(default=0, init=False)
+    bypassed: int = field(default=0, init=False)
+
+    _serialized_values: 'OrderedDict[Hashable, object]' = field(
+        default_factory=OrderedDict,
+        init=False,
+        repr=False,
+    )
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock,
+        init=False,
+        repr=False,
+    )
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of lookups which found the value in cache."""
+        lookups_count = self.hits + self.misses
+        return self.hits / lookups_count if lookups_count else 0
+
+    def serialize(
+        self,
+        instance: object,
+        serialize_value: Callable[[object], SerializedType],
+    ) -> SerializedType:
+        """Serialize the value, unless it is already in cache."""
+        key = cache_key(instance)
+        if key is None:
+            with self._lock:
+                self.bypassed += 1
+            return serialize_value(instance)
+
+        with self._lock:
+            if key in self._serialized_values:
+                self.hits += 1
+                self._serialized_values.move_to_end(key)
+                return self._serialized_values[key]  # type: ignore
+
+            self.misses += 1
+
+        serialized_value = serialize_value(instance)
+
+        with self._lock:
+            self._serialized_values[key] = serialized_value
+            while len(self._serialized_values) > self.max_size:
+                self._serialized_values.popitem(last=False)
+
+        return serialized_value
+
+    def __len__(self) -> int:
+        """Number of values in cache."""
+        return len(self._serialized_values)
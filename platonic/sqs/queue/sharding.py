@@ -0,0 +1,155 @@
+import itertools
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from dataclasses import dataclass, field
+from typing import (
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Type,
+    Union,
+)
+
+from boltons.iterutils import chunked_iter
+from mypy_boto3_sqs import Client as SQSClient
+from platonic.sqs.queue.message import SQSMessage
+from platonic.sqs.queue.sender import SQSSender
+from platonic.sqs.queue.sqs import default_client
+from platonic.sqs.queue.types import ValueType
+
+ShardKey = Union[str, bytes, int]
+
+
+def _shard_key_bytes(shard_key: ShardKey) -> bytes:
+    """Represent shard key as bytes, to hash it in a stable way."""
+    if isinstance(shard_key, bytes):
+        return shard_key
+
+    return str(shard_key).encode('utf-8')
+
+
+@dataclass
+class SQSShardedSender(Generic[ValueType]):
+    """
+    Spread messages across several queues.
+
+    If `key` is provided, it extracts a shard key from every value, and
+    values with the same key always go to the same queue. Otherwise, queues
+    are chosen round robin.
+
+    `send_many()` reads the input `chunk_size` values at a time, batches the
+    messages of every shard independently and sends the batches to the
+    shards concurrently.
+
+    To read the messages back, use `SQSMultiReceiver` with equal `weights`.
+    """
+
+    senders: Sequence[SQSSender[ValueType]]
+    key: Optional[Callable[[ValueType], ShardKey]] = None
+    chunk_size: int = 1000
+
+    _round_robin: Iterator[int] = field(
+        default_factory=itertools.count,
+        init=False,
+        repr=False,
+    )
+
+    @classmethod
+    def from_urls(
+        cls,
+        urls: Sequence[str],
+        key: Optional[Callable[[ValueType], ShardKey]] = None,
+        sender_class: Type[SQSSender[ValueType]] = SQSSender,
+        client: Optional[SQSClient] = None,
+        **kwargs,
+    ) -> 'SQSShardedSender[ValueType]':
+        """
+        Construct senders for given URLs sharing one SQS client.
+
+        `sender_class` must be parametrized with value type, for example
+        `SQSSender[int]`. Remaining arguments are passed to every sender.
+        """
+        client = client or default_client()
+        return cls(
+            senders=[
+                sender_class(url=url, client=client, **kwargs)
+                for url in urls
+            ],
+            key=key,
+        )
+
+    @property
+    def urls(self) -> List[str]:
+        """URLs of the shard queues."""
+        return [sender.url for sender in self.senders]
+
+    def shard_of(self, instance: ValueType) -> int:
+        """Choose the shard number for a value."""
+        if self.key is None:
+            return next(self._round_robin) % len(self.senders)
+
+        return zlib.crc32(
+            _shard_key_bytes(self.key(instance)),
+        ) % len(self.senders)
+
+    def send(self, instance: ValueType) -> SQSMessage[ValueType]:
+        """Put a message into its shard."""
+        return self.senders[self.shard_of(instance)].send(instance)
+
+    def send_many(
+        self,
+        iterable: Iterable[ValueType],
+    ) -> List[SQSMessage[ValueType]]:
+        """
+        Send multiple messages, every shard in a separate thread.
+
+        The input is consumed in chunks of `chunk_size` values, so that only
+        one chunk is held in memory besides the sent messages. Returns one
+        message per input value, in the same order.
+        """
+        sent_messages: List[SQSMessage[ValueType]] = []
+        with ThreadPoolExecutor(max_workers=len(self.senders)) as executor:
+            for chunk in chunked_iter(iterable, self.chunk_size):
+                sent_messages.extend(self._send_chunk(executor, chunk))
+
+        return sent_messages
+
+    def _send_chunk(
+        self,
+        executor: ThreadPoolExecutor,
+        instances: List[ValueType],
+    ) -> List[SQSMessage[ValueType]]:
+        """Send a chunk of values to their shards concurrently."""
+        shards: List[List[int]] = [[] for _sender in self.senders]
+        for position, instance in enumerate(instances):
+            shards[self.shard_of(instance)].append(position)
+
+        futures = [
+            (
+                positions,
+                # Trace context of the caller goes along with the call.
+                executor.submit(
+                    copy_context().run,
+                    sender.send_many,
+                    [instances[position] for position in positions],
+                ),
+            )
+            for sender, positions in zip(self.senders, shards)
+            if positions
+        ]
+
+        messages_by_position: Dict[int, SQSMessage[ValueType]] = {}
+        for positions, future in futures:
+            # Re-raise the exceptions, if any.
+            messages_by_position.update(zip(positions, future.result()))
+
+        return [
+            messages_by_position[position]
+            for position in range(len(instances))
+        ]
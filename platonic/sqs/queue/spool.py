@@ -0,0 +1,343 @@
+import logging
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from datetime import timedelta
+from enum import Enum
+from typing import Generic, Iterable, List, Optional, Tuple, Union
+
+from boltons.iterutils import chunked_iter
+from platonic.queue import MessageTooLarge
+from platonic.sqs.queue.errors import SQSBatchEntriesFailed, SQSSpoolFull
+from platonic.sqs.queue.sender import SQSSender
+from platonic.sqs.queue.tracing import SpanContext
+from platonic.sqs.queue.types import ValueType
+
+logger = logging.getLogger(__name__)
+
+# Rows fetched from the spool per one drain step.
+DRAIN_CHUNK_SIZE = 100
+
+# Spooled message: row id, body and `traceparent` of the producer, if any.
+SpooledRow = Tuple[int, str, Optional[str]]
+
+
+def _body_size(message_body: str) -> int:
+    """Size of message body in bytes, as SQS counts it."""
+    return len(message_body.encode('utf-8'))
+
+
+def _is_rejection(error: Union[MessageTooLarge, SQSBatchEntriesFailed]) -> bool:
+    """Check if SQS will never accept the messages which caused the error."""
+    if isinstance(error, MessageTooLarge):
+        return True
+
+    return all(failure['SenderFault'] for failure in error.failures)
+
+
+class FsyncPolicy(Enum):
+    """How often the spool is flushed to disk, see SQLite `synchronous`."""
+
+    # Every spooled message survives power loss. Slowest.
+    ALWAYS = 'FULL'
+
+    # Spooled messages survive a crash of the process, but the most recent of
+    # them may be lost on power loss.
+    PERIODIC = 'NORMAL'
+
+    # Leave flushing to the operating system.
+    NEVER = 'OFF'
+
+
+@dataclass
+class SQSSpooledSender(Generic[ValueType]):
+    """
+    Sender which writes messages to a local file and ships them later.
+
+    `send()` and `send_many()` only append serialized messages to an SQLite
+    database at `path`, and thus do not wait for SQS. A background thread,
+    started by `start()`, sends the spooled messages to SQS via `sender` every
+    `drain_interval` and removes them from the spool after SQS has accepted
+    them. Messages spooled before a restart are sent after it.
+
+    Messages are sent and removed from the spool batch by batch. Messages
+    larger than `sender.max_message_size` are not spooled: `send()` raises
+    `MessageTooLarge` for them right away. If SQS rejects some message of a
+    batch nevertheless, messages of that batch are sent one by one, and the
+    rejected one is moved to `rejected_messages` table of the spool, where it
+    can be inspected. It is never retried.
+
+    Delivery is at least once: a message may be sent twice if the process
+    crashes right after sending it, or if it was in one batch with a rejected
+    message. Trace context of the code which spooled a message is stored
+    along with it, and the message carries that context to SQS.
+
+    The spool is limited to `max_size` bytes of UTF-8 encoded message bodies.
+    When it is full, `SQSSpoolFull` is raised. This is not a limit on disk
+    usage: on top of it, SQLite needs space for its own bookkeeping and for
+    the write-ahead log, which grows by about 4 MB between checkpoints and is
+    truncated when the spool becomes empty.
+    """
+
+    sender: SQSSender[ValueType]
+    path: str
+    fsync_policy: FsyncPolicy = FsyncPolicy.PERIODIC
+    max_size: int = 1024 ** 3
+    drain_interval: timedelta = timedelta(seconds=1)
+
+    _connection: sqlite3.Connection = field(init=False, repr=False)
+    _size: int = field(default=0, init=False, repr=False)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock,
+        init=False,
+        repr=False,
+    )
+    _drain_lock: threading.Lock = field(
+        default_factory=threading.Lock,
+        init=False,
+        repr=False,
+    )
+    _stop_requested: threading.Event = field(
+        default_factory=threading.Event,
+        init=False,
+        repr=False,
+    )
+    _drainer: Optional[threading.Thread] = field(
+        default=None,
+        init=False,
+        repr=False,
+    )
+
+    def __post_init__(self) -> None:
+        """Open the spool, creating it if necessary."""
+        self._connection = sqlite3.connect(
+            self.path,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute(
+            f'PRAGMA synchronous={self.fsync_policy.value}',
+        )
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS spooled_messages ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, body TEXT NOT NULL, '
+            'trace_context TEXT)',
+        )
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS rejected_messages ('
+            'id INTEGER PRIMARY KEY, body TEXT NOT NULL, '
+            'trace_context TEXT, error TEXT NOT NULL)',
+        )
+
+        self._size = self._connection.execute(
+            'SELECT COALESCE(SUM(LENGTH(CAST(body AS BLOB))), 0) '
+            'FROM spooled_messages',
+        ).fetchone()[0]
+
+    @property
+    def spooled_count(self) -> int:
+        """Number of messages waiting to be sent."""
+        with self._lock:
+            return self._connection.execute(
+                'SELECT COUNT(*) FROM spooled_messages',
+            ).fetchone()[0]
+
+    @property
+    def rejected_count(self) -> int:
+        """Number of messages SQS has rejected, see `rejected_messages`."""
+        with self._lock:
+            return self._connection.execute(
+                'SELECT COUNT(*) FROM rejected_messages',
+            ).fetchone()[0]
+
+    @property
+    def spooled_size(self) -> int:
+        """Total size in bytes of message bodies waiting to be sent."""
+        return self._size
+
+    def send(self, instance: ValueType) -> None:
+        """Spool a message."""
+        self._append([self.sender.serialize(instance)])
+
+    def send_many(self, iterable: Iterable[ValueType]) -> None:
+        """Spool multiple messages at once."""
+        self._append([
+            self.sender.serialize(instance)
+            for instance in iterable
+        ])
+
+    def drain(self) -> int:
+        """
+        Send every spooled message to SQS.
+
+        Returns the number of messages sent. If SQS fails, the messages not
+        sent yet stay in the spool, and the error is raised.
+        """
+        sent_count = 0
+        with self._drain_lock:
+            rows = self._oldest_rows()
+            while rows:
+                for batch in chunked_iter(rows, self.sender.batch_size):
+                    sent_count += self._send_batch(batch)
+
+                rows = self._oldest_rows()
+
+        return sent_count
+
+    def start(self) -> None:
+        """Start the thread sending spooled messages to SQS."""
+        self._drainer = threading.Thread(
+            target=self._drain_forever,
+            daemon=True,
+        )
+        self._drainer.start()
+
+    def stop(self, timeout: timedelta) -> bool:
+        """
+        Stop the background thread after it tries to send everything.
+
+        Returns True if the spool is empty, and False if some messages remain
+        to be sent after restart. If the thread was never started, nothing is
+        sent.
+        """
+        self._stop_requested.set()
+        if self._drainer is not None:
+            self._drainer.join(timeout=timeout.total_seconds())
+            if self._drainer.is_alive():
+                return False
+
+        return self.spooled_count == 0
+
+    def _append(self, message_bodies: List[str]) -> None:
+        """Write message bodies to the spool in one transaction."""
+        appended_size = sum(map(_body_size, message_bodies))
+        trace_context = self.sender.tracer.current_context()
+        traceparent = trace_context and trace_context.to_traceparent()
+
+        for message_body in message_bodies:
+            self.sender.validate_message_size(message_body, trace_context)
+
+        with self._lock:
+            if self._size + appended_size > self.max_size:
+                raise SQSSpoolFull(path=self.path, max_size=self.max_size)
+
+            with self._connection:
+                self._connection.execute('BEGIN')
+                self._connection.executemany(
+                    'INSERT INTO spooled_messages (body, trace_context) '
+                    'VALUES (?, ?)',
+                    [(body, traceparent) for body in message_bodies],
+                )
+
+            self._size += appended_size
+
+    def _oldest_rows(self) -> List[SpooledRow]:
+        """Fetch the messages spooled first."""
+        with self._lock:
+            return self._connection.execute(
+                'SELECT id, body, trace_context FROM spooled_messages '
+                'ORDER BY id LIMIT ?',
+                (DRAIN_CHUNK_SIZE,),
+            ).fetchall()
+
+    def _send_batch(self, rows: List[SpooledRow]) -> int:
+        """
+        Send a batch of messages, and remove them from the spool.
+
+        If SQS rejects some of the messages, they are sent one by one, to
+        find out which of them to move to `rejected_messages`. Returns the
+        number of messages sent.
+        """
+        try:
+            self.sender.send_raw_many(
+                [body for _row_id, body, _trace_context in rows],
+                trace_contexts=[
+                    SpanContext.from_traceparent(trace_context)
+                    for _row_id, _body, trace_context in rows
+                ],
+            )
+
+        except (MessageTooLarge, SQSBatchEntriesFailed) as error:
+            if not _is_rejection(error):
+                raise
+
+            if len(rows) > 1:
+                return sum(self._send_batch([row]) for row in rows)
+
+            self._reject(rows[0], error)
+            return 0
+
+        self._remove(rows)
+        return len(rows)
+
+    def _remove(self, rows: List[SpooledRow]) -> None:
+        """
+        Remove sent messages from the spool.
+
+        This is the checkpoint: after a restart, sending resumes from the
+        first message still in the spool.
+        """
+        with self._lock:
+            with self._connection:
+                self._connection.execute('BEGIN')
+                self._delete(rows)
+
+            self._forget(rows)
+
+    def _reject(
+        self,
+        row: SpooledRow,
+        error: Union[MessageTooLarge, SQSBatchEntriesFailed],
+    ) -> None:
+        """Move a message SQS will never accept to `rejected_messages`."""
+        logger.error(
+            'SQS rejected spooled message %s, moving it aside: %s',
+            row[0],
+            error,
+        )
+        with self._lock:
+            with self._connection:
+                self._connection.execute('BEGIN')
+                self._connection.execute(
+                    'INSERT INTO rejected_messages '
+                    '(id, body, trace_context, error) VALUES (?, ?, ?, ?)',
+                    (*row, str(error)),
+                )
+                self._delete([row])
+
+            self._forget([row])
+
+    def _delete(self, rows: List[SpooledRow]) -> None:
+        """Delete messages from the spool table."""
+        self._connection.executemany(
+            'DELETE FROM spooled_messages WHERE id = ?',
+            [(row_id,) for row_id, _body, _trace_context in rows],
+        )
+
+    def _forget(self, rows: List[SpooledRow]) -> None:
+        """Account for messages which left the spool."""
+        self._size -= sum(
+            _body_size(body)
+            for _row_id, body, _trace_context in rows
+        )
+
+        if self._size == 0:
+            # Give the disk space of the write-ahead log back.
+            self._connection.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+
+    def _drain_forever(self) -> None:
+        """Send spooled messages periodically, and once more when stopped."""
+        interval_seconds = self.drain_interval.total_seconds()
+        while not self._stop_requested.wait(interval_seconds):
+            self._drain_logging_errors()
+
+        self._drain_logging_errors()
+
+    def _drain_logging_errors(self) -> None:
+        """Drain the spool; on failure, try again on next iteration."""
+        try:
+            self.drain()
+
+        except Exception:
+            logger.exception('Failed to send spooled messages to SQS.')
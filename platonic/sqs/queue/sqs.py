@@ -1,9 +1,20 @@
 from dataclasses import dataclass, field
 from functools import partial
+from typing import Dict, List, Optional, Type, TypeVar
 
 import boto3
+from botocore.config import Config
 from mypy_boto3_sqs import Client as SQSClient
 from platonic.const import const
+from platonic.sqs.queue.errors import SQSBatchEntriesFailed
+from platonic.sqs.queue.rate_limit import RateLimiter
+from platonic.sqs.queue.resolver import (
+    QueueAttributes,
+    QueueResolver,
+    queue_resolver,
+)
+from platonic.sqs.queue.retry import BatchResultEntry, EntryType, RetryPolicy
+from platonic.sqs.queue.tracing import Tracer
 from typecasts import Typecasts, casts
 
 # Max number of SQS messages receivable by single API call.
@@ -16,6 +27,28 @@ MAX_MESSAGE_SIZE = 262144
 # Max long polling time
 MAX_WAIT_TIME_SECONDS = 20
 
+# Max visibility timeout of a message, 12 hours
+MAX_VISIBILITY_TIMEOUT = 43200
+
+SQSMixinType = TypeVar('SQSMixinType', bound='SQSMixin')
+
+# Response of an SQS API call, as boto3 client returns it
+APIResponse = Dict[str, object]
+
+
+def default_client(region_name: Optional[str] = None) -> SQSClient:
+    """
+    Construct boto3 SQS client which makes every call only once.
+
+    Failed calls are retried by `SQSMixin.retry_policy` instead, and retries
+    of botocore on top of it would multiply the number of attempts.
+    """
+    return boto3.client(
+        'sqs',
+        region_name=region_name,
+        config=Config(retries={'total_max_attempts': 1}),
+    )
+
 
 @dataclass
 class SQSMixin:
@@ -24,7 +57,18 @@ class SQSMixin:
     url: str
     typecasts: Typecasts = field(default_factory=const(casts))
     internal_type: type = field(default=str)
-    client: SQSClient = field(default_factory=partial(boto3.client, 'sqs'))
+    client: SQSClient = field(
+        default_factory=default_client,
+        metadata={
+            '__doc__': (
+                'SQS API client. Besides boto3 client, this can be '
+                '`SQSHTTPClient` which is faster, or `LocalSQSClient` which '
+                'keeps the messages in memory. Failed calls are retried by '
+                '`retry_policy`, so consider disabling retries of botocore '
+                'in a boto3 client you provide.'
+            ),
+        },
+    )
     batch_size: int = field(default=MAX_NUMBER_OF_MESSAGES, metadata={
         '__doc__': (
             f'Max number of SQS messages to process within one API call. '
@@ -32,3 +76,147 @@ class SQSMixin:
             f'will cause validation errors from AWS.'
         ),
     })
+    max_message_size: int = field(default=MAX_MESSAGE_SIZE, metadata={
+        '__doc__': (
+            f'Max size of a message, or of a batch of messages, in bytes. '
+            f'Default is {MAX_MESSAGE_SIZE}, which is the max SQS allows. '
+            f'Queues might be configured with a lower limit.'
+        ),
+    })
+
+    rate_limiter: Optional[RateLimiter] = field(default=None, metadata={
+        '__doc__': (
+            'Limit the rate of API calls. Share one limiter among multiple '
+            'queue instances to limit their combined rate.'
+        ),
+    })
+
+    retry_policy: RetryPolicy = field(
+        default_factory=RetryPolicy,
+        metadata={
+            '__doc__': (
+                'How to retry transient failures of API calls, and of '
+                'individual entries of batch calls.'
+            ),
+        },
+    )
+
+    tracer: Tracer = field(default_factory=Tracer, metadata={
+        '__doc__': (
+            'Open spans around API calls and message handling, and propagate '
+            'trace context via message attributes. Does nothing by default.'
+        ),
+    })
+
+    resolver: QueueResolver = field(
+        default_factory=const(queue_resolver),
+        repr=False,
+        metadata={
+            '__doc__': (
+                'Where to get queue attributes from. By default, they are '
+                'cached process wide.'
+            ),
+        },
+    )
+
+    @classmethod
+    def from_queue_name(  # noqa: WPS211
+        cls: Type[SQSMixinType],
+        queue_name: str,
+        account_id: Optional[str] = None,
+        region_name: Optional[str] = None,
+        resolver: QueueResolver = queue_resolver,
+        value_type: Optional[type] = None,
+        **kwargs,
+    ) -> SQSMixinType:
+        """
+        Construct an instance by queue name instead of URL.
+
+        Queue URL and attributes are resolved via `resolver`, which caches
+        them process wide. `max_message_size` is set according to the queue
+        `MaximumMessageSize` attribute.
+
+        Generic classes need the type of messages as `value_type`, for
+        example `SQSSender.from_queue_name('jobs', value_type=str)`:
+        `SQSSender[str].from_queue_name()` cannot tell it was parametrized.
+        """
+        queue_class = cls
+        if value_type is not None:
+            queue_class = cls[value_type]  # type: ignore
+
+        elif getattr(cls, '__parameters__', ()):
+            raise TypeError(
+                f'Type of messages is not known for {cls.__name__}, please '
+                f'specify value_type.',
+            )
+
+        client = kwargs.pop('client', None) or default_client(region_name)
+
+        url = resolver.url(client, queue_name, account_id=account_id)
+        kwargs.setdefault(
+            'max_message_size',
+            resolver.attributes(client, url).maximum_message_size,
+        )
+
+        return queue_class(
+            url=url,
+            client=client,
+            resolver=resolver,
+            **kwargs,
+        )
+
+    @property
+    def queue_attributes(self) -> QueueAttributes:
+        """Attributes of the queue, cached by `resolver`."""
+        return self.resolver.attributes(self.client, self.url)
+
+    def _call_api(self, operation_name: str, **kwargs) -> APIResponse:
+        """
+        Call an SQS API operation by name.
+
+        Every API call made by senders and receivers goes through here. Cast
+        the response to the specific type, like `SendMessageResultTypeDef`.
+
+        Do not override.
+        """
+        operation = partial(getattr(self.client, operation_name), **kwargs)
+
+        if self.rate_limiter is not None:
+            operation = partial(self.rate_limiter.call, operation)
+
+        with self.tracer.span(
+            f'SQS {operation_name}',
+            attributes={'sqs.queue_url': self.url},
+        ):
+            return self.retry_policy.call(operation)
+
+    def _call_batch_api(
+        self,
+        operation_name: str,
+        entries: List[EntryType],
+    ) -> List[BatchResultEntry]:
+        """
+        Call an SQS batch API operation by name.
+
+        Entries which failed on AWS side are retried according to
+        `retry_policy`. If some entries fail nevertheless,
+        `SQSBatchEntriesFailed` is raised. Returns results of the successful
+        entries.
+        """
+        succeeded, failures = self.retry_policy.call_batch(
+            lambda batch_entries: self._call_api(
+                operation_name,
+                QueueUrl=self.url,
+                Entries=batch_entries,
+            ),
+            entries,
+        )
+
+        if failures:
+            raise SQSBatchEntriesFailed(
+                operation_name=operation_name,
+                queue_url=self.url,
+                failures=failures,
+            )
+
+        return succeeded
@@ -0,0 +1,179 @@
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+
+# Name of the message attribute carrying trace context, see W3C Trace Context.
+TRACE_CONTEXT_ATTRIBUTE = 'traceparent'
+
+SpanAttributes = Dict[str, object]
+
+
+@dataclass(frozen=True)
+class SpanContext:
+    """Identifies a span within a trace."""
+
+    trace_id: str
+    span_id: str
+
+    @classmethod
+    def generate(cls, parent: Optional['SpanContext'] = None) -> 'SpanContext':
+        """New span context, within the parent's trace if any."""
+        return cls(
+            trace_id=parent.trace_id if parent else uuid.uuid4().hex,
+            span_id=uuid.uuid4().hex[:16],
+        )
+
+    @classmethod
+    def from_traceparent(
+        cls,
+        traceparent: Optional[str],
+    ) -> Optional['SpanContext']:
+        """Parse `traceparent` header value, if it is valid."""
+        try:
+            _version, trace_id, span_id, _flags = (traceparent or '').split('-')
+        except ValueError:
+            return None
+
+        return cls(trace_id=trace_id, span_id=span_id)
+
+    def to_traceparent(self) -> str:
+        """Format as `traceparent` header value."""
+        return f'00-{self.trace_id}-{self.span_id}-01'
+
+
+@dataclass
+class Span:
+    """Timed operation."""
+
+    name: str
+    context: SpanContext
+    parent: Optional[SpanContext]
+    start_time: float
+    end_time: Optional[float] = None
+    attributes: SpanAttributes = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float:
+        """Duration of the span in seconds."""
+        return (self.end_time or self.start_time) - self.start_time
+
+
+class Tracer:
+    """
+    Tracer which does nothing.
+
+    This is the default. Subclass it to export spans to a tracing system.
+    """
+
+    # Whether spans are actually recorded. If not, receivers will not request
+    # trace context attributes of messages.
+    is_recording = False
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        parent: Optional[SpanContext] = None,
+        attributes: Optional[SpanAttributes] = None,
+    ) -> Iterator[Optional[Span]]:
+        """Open a span around the code block."""
+        yield None
+
+    def record_span(
+        self,
+        name: str,
+        start_time: float,
+        end_time: float,
+        parent: Optional[SpanContext] = None,
+        attributes: Optional[SpanAttributes] = None,
+    ) -> None:
+        """Record a span which has already finished."""
+
+    def current_context(self) -> Optional[SpanContext]:
+        """Context of the currently open span, to be propagated."""
+        return None
+
+
+_current_span: 'ContextVar[Optional[Span]]' = ContextVar(
+    'platonic_sqs_current_span',
+    default=None,
+)
+
+
+@dataclass
+class InMemoryTracer(Tracer):
+    """Tracer storing finished spans in memory, for tests."""
+
+    is_recording = True
+
+    spans: List[Span] = field(default_factory=list)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock,
+        init=False,
+        repr=False,
+    )
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        parent: Optional[SpanContext] = None,
+        attributes: Optional[SpanAttributes] = None,
+    ) -> Iterator[Optional[Span]]:
+        """Open a span, child of `parent` or of the current span."""
+        parent = parent or self.current_context()
+        span = Span(
+            name=name,
+            context=SpanContext.generate(parent),
+            parent=parent,
+            start_time=time.time(),
+            attributes=dict(attributes or {}),
+        )
+
+        token = _current_span.set(span)
+        try:
+            yield span
+        finally:
+            _current_span.reset(token)
+            span.end_time = time.time()
+            self._export(span)
+
+    def record_span(
+        self,
+        name: str,
+        start_time: float,
+        end_time: float,
+        parent: Optional[SpanContext] = None,
+        attributes: Optional[SpanAttributes] = None,
+    ) -> None:
+        """Record a span which has already finished."""
+        self._export(Span(
+            name=name,
+            context=SpanContext.generate(parent),
+            parent=parent,
+            start_time=start_time,
+            end_time=end_time,
+            attributes=dict(attributes or {}),
+        ))
+
+    def current_context(self) -> Optional[SpanContext]:
+        """Context of the currently open span."""
+        span = _current_span.get()
+        return span.context if span else None
+
+    def finished_spans(self, name: Optional[str] = None) -> List[Span]:
+        """Finished spans, optionally filtered by name."""
+        with self._lock:
+            return [
+                span for span in self.spans
+                if name is None or span.name == name
+            ]
+
+    def _export(self, span: Span) -> None:
+        """Store a finished span."""
+        with self._lock:
+            self.spans.append(span)
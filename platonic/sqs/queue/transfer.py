@@ -0,0 +1,208 @@
+import gzip
+import json
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import fields
+from enum import Enum
+from typing import IO, Iterable, Iterator, List, Optional, Set
+
+from boltons.iterutils import chunked_iter
+from platonic.sqs.queue.message import SQSMessage
+from platonic.sqs.queue.receiver import SQSReceiver
+from platonic.sqs.queue.retry import BatchResultEntry
+from platonic.sqs.queue.sender import SQSSender
+from platonic.sqs.queue.types import ValueType
+
+# Number of messages `import_messages()` hands over to one `send_raw_many()`.
+IMPORT_CHUNK_SIZE = 1000
+
+
+class ExportAction(Enum):
+    """What to do with the messages after they are exported."""
+
+    # Messages become visible again when their visibility timeout expires.
+    LEAVE = 'leave'
+
+    # Messages are deleted from the queue as soon as they are written.
+    ACKNOWLEDGE = 'acknowledge'
+
+    # Messages are made visible again as soon as they are written.
+    RELEASE = 'release'
+
+
+def _open_file(path: str, mode: str) -> IO[str]:
+    """Open a text file, compressed with gzip if its name ends with `.gz`."""
+    if path.endswith('.gz'):
+        return gzip.open(path, f'{mode}t', encoding='utf-8')  # type: ignore
+
+    return open(path, mode, encoding='utf-8')  # noqa: WPS515
+
+
+def _raw_receiver(receiver: SQSReceiver[ValueType]) -> SQSReceiver[str]:
+    """
+    Receiver configured as the given one, which does not deserialize bodies.
+
+    Export copies message bodies as they are, and a body which is not a valid
+    value of the receiver value type must not abort it.
+    """
+    return SQSReceiver[str](**{
+        receiver_field.name: getattr(receiver, receiver_field.name)
+        for receiver_field in fields(receiver)
+        if receiver_field.init
+    })
+
+
+def _received_batches(
+    receiver: SQSReceiver[ValueType],
+    raw_receiver: SQSReceiver[str],
+) -> Iterator[List[SQSMessage[str]]]:
+    """
+    Poll batches of raw messages until the receiver times out or is stopped.
+
+    Unlike iteration over the receiver, every message received is yielded,
+    and none is left in flight when the consumer stops early.
+    """
+    while not receiver.is_stopped:
+        with receiver.timeout.timer() as timer:
+            messages: List[SQSMessage[str]] = []
+            while not (messages or timer.is_expired or receiver.is_stopped):
+                messages = raw_receiver.poll(int(min(
+                    receiver.max_wait_time_seconds,
+                    max(timer.remaining_seconds, 0),
+                )))
+
+        if not messages:
+            return
+
+        yield messages
+
+
+def _write_messages(
+    export_file: IO[str],
+    messages: List[SQSMessage[str]],
+) -> None:
+    """Write messages to the export file, one JSON object per line."""
+    export_file.writelines(
+        json.dumps({
+            'body': message.body,
+            'message_id': message.message_id,
+            'sent_timestamp': message.sent_timestamp,
+        }) + '\n'
+        for message in messages
+    )
+
+
+def _finish_export(
+    receiver: SQSReceiver[str],
+    messages: List[SQSMessage[str]],
+    action: ExportAction,
+) -> None:
+    """Apply the export action to messages which have been written."""
+    if action == ExportAction.ACKNOWLEDGE:
+        receiver.acknowledge_many(messages)
+
+    elif action == ExportAction.RELEASE:
+        receiver.release_many(messages)
+
+    else:
+        receiver.forget_many(messages)
+
+
+def export_messages(
+    receiver: SQSReceiver[ValueType],
+    path: str,
+    action: ExportAction = ExportAction.LEAVE,
+) -> int:
+    """
+    Write every message the receiver gets to a JSON Lines file.
+
+    Every line holds a message `body`, exactly as received from SQS,
+    `message_id` and `sent_timestamp`. Bodies are not deserialized, and thus
+    need not be valid values of the receiver value type. The file is
+    compressed with gzip if `path` ends with `.gz`. Messages are written
+    batch by batch as they are received, until the receiver times out or is
+    stopped, see `SQSReceiver.timeout`.
+
+    Every batch is flushed to the file before `action` is applied to it.
+    Unless messages are acknowledged, they come back to the queue, either at
+    once or after their visibility timeout: IDs of exported messages are kept
+    to skip them, and the export ends when a whole batch consists of messages
+    exported before. With `ExportAction.ACKNOWLEDGE`, nothing but the current
+    batch is kept in memory.
+
+    Returns the number of messages exported.
+    """
+    raw_receiver = _raw_receiver(receiver)
+    exported_count = 0
+    exported_ids: Set[Optional[str]] = set()
+    with _open_file(path, 'w') as export_file:
+        for messages in _received_batches(receiver, raw_receiver):
+            new_messages = [
+                message for message in messages
+                if message.message_id not in exported_ids
+            ]
+            _write_messages(export_file, new_messages)
+            exported_count += len(new_messages)
+
+            # Messages must not be deleted before they hit the file.
+            export_file.flush()
+            _finish_export(raw_receiver, messages, action)
+
+            if not new_messages:
+                # Messages are coming back, the queue is exported.
+                break
+
+            if action != ExportAction.ACKNOWLEDGE:
+                exported_ids.update(
+                    message.message_id for message in new_messages
+                )
+
+    return exported_count
+
+
+def _read_message_bodies(path: str) -> Iterator[str]:
+    """Lazily read message bodies from a file written by export."""
+    with _open_file(path, 'r') as import_file:
+        for line in import_file:
+            if line.strip():
+                yield json.loads(line)['body']
+
+
+def _sent_count(futures: Iterable['Future[List[BatchResultEntry]]']) -> int:
+    """Number of messages sent, re-raising the errors if any."""
+    return sum(len(future.result()) for future in futures)
+
+
+def import_messages(
+    sender: SQSSender[ValueType],
+    path: str,
+    max_concurrency: int = 4,
+) -> int:
+    """
+    Send messages from a file written by `export_messages()`.
+
+    The file is read lazily, and at most `max_concurrency` chunks of messages
+    are being sent at a time, so files of any size can be imported. Message
+    bodies are sent as is, without deserialization.
+
+    Returns the number of messages sent.
+    """
+    sent_count = 0
+    pending: Set['Future[List[BatchResultEntry]]'] = set()
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        chunks = chunked_iter(_read_message_bodies(path), IMPORT_CHUNK_SIZE)
+        for chunk in chunks:
+            if len(pending) >= max_concurrency:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                sent_count += _sent_count(done)
+
+            pending.add(executor.submit(sender.send_raw_many, chunk))
+
+        sent_count += _sent_count(pending)
+
+    return sent_count
@@ -0,0 +1,366 @@
+import hashlib
+import hmac
+import http.client
+import json
+import os
+import select
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import partial
+from types import SimpleNamespace
+from typing import Dict, Mapping, Optional, Tuple, Type
+from urllib.parse import SplitResult, urlsplit
+
+from botocore.exceptions import ClientError, HTTPClientError
+from platonic.sqs.queue.sqs import APIResponse
+
+# SQS API operations used by senders and receivers, by boto3 method name.
+OPERATION_NAMES = {
+    'send_message': 'SendMessage',
+    'send_message_batch': 'SendMessageBatch',
+    'receive_message': 'ReceiveMessage',
+    'delete_message': 'DeleteMessage',
+    'delete_message_batch': 'DeleteMessageBatch',
+    'change_message_visibility': 'ChangeMessageVisibility',
+    'change_message_visibility_batch': 'ChangeMessageVisibilityBatch',
+    'get_queue_url': 'GetQueueUrl',
+    'get_queue_attributes': 'GetQueueAttributes',
+    'create_queue': 'CreateQueue',
+    'purge_queue': 'PurgeQueue',
+}
+
+JSON_CONTENT_TYPE = 'application/x-amz-json-1.0'
+TARGET_PREFIX = 'AmazonSQS.'
+
+# Header carrying the error code in the format of the older Query protocol,
+# which is what boto3 reports as the error code.
+QUERY_ERROR_HEADER = 'x-amzn-query-error'
+
+# Operations which are not safe to repeat: if the connection breaks after the
+# request was sent, a retry might put the message into the queue twice.
+NON_IDEMPOTENT_OPERATIONS = frozenset(('SendMessage', 'SendMessageBatch'))
+
+# Errors of the connection, including timeouts, as opposed to SQS errors.
+CONNECTION_ERRORS = (http.client.HTTPException, OSError)
+
+SIGNING_ALGORITHM = 'AWS4-HMAC-SHA256'
+SERVICE_NAME = 'sqs'
+
+
+class QueueDoesNotExistError(ClientError):
+    """Queue does not exist."""
+
+
+class ReceiptHandleIsInvalidError(ClientError):
+    """Receipt handle is not valid."""
+
+
+class RequestOutcomeUnknownError(ClientError):
+    """Connection failed, and the request might have been executed."""
+
+
+# Error classes by error type, as reported by SQS JSON protocol.
+ERROR_CLASSES: Dict[str, Type[ClientError]] = {
+    'QueueDoesNotExist': QueueDoesNotExistError,
+    'ReceiptHandleIsInvalid': ReceiptHandleIsInvalidError,
+}
+
+
+@dataclass(frozen=True)
+class Credentials:
+    """AWS credentials to sign the requests with."""
+
+    access_key: str
+    secret_key: str
+    session_token: Optional[str] = None
+
+    @classmethod
+    def from_environment(cls) -> 'Credentials':
+        """Read the credentials from standard environment variables."""
+        return cls(
+            access_key=os.environ['AWS_ACCESS_KEY_ID'],
+            secret_key=os.environ['AWS_SECRET_ACCESS_KEY'],
+            session_token=os.environ.get('AWS_SESSION_TOKEN'),
+        )
+
+
+def _sha256(payload: bytes) -> str:
+    """SHA256 hex digest."""
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _hmac(key: bytes, message: str) -> bytes:
+    """HMAC-SHA256 digest."""
+    return hmac.new(key, message.encode('utf-8'), hashlib.sha256).digest()
+
+
+def sign_request(  # noqa: WPS211
+    credentials: Credentials,
+    region_name: str,
+    host: str,
+    headers: Dict[str, str],
+    payload: bytes,
+    now: datetime,
+) -> Dict[str, str]:
+    """
+    Sign a POST request to `/` with AWS Signature Version 4.
+
+    Returns the headers to send, including `Authorization`.
+    """
+    amz_date = now.strftime('%Y%m%dT%H%M%SZ')
+    date_stamp = amz_date[:8]
+
+    signed_headers = dict(headers, host=host)
+    signed_headers['x-amz-date'] = amz_date
+    if credentials.session_token:
+        signed_headers['x-amz-security-token'] = credentials.session_token
+
+    header_names = sorted(name.lower() for name in signed_headers)
+    lowercase_headers = {
+        name.lower(): header_value.strip()
+        for name, header_value in signed_headers.items()
+    }
+    canonical_request = '\n'.join([
+        'POST',
+        '/',
+        '',
+        ''.join(
+            f'{name}:{lowercase_headers[name]}\n' for name in header_names
+        ),
+        ';'.join(header_names),
+        _sha256(payload),
+    ])
+
+    scope = f'{date_stamp}/{region_name}/{SERVICE_NAME}/aws4_request'
+    string_to_sign = '\n'.join([
+        SIGNING_ALGORITHM,
+        amz_date,
+        scope,
+        _sha256(canonical_request.encode('utf-8')),
+    ])
+
+    signing_key = f'AWS4{credentials.secret_key}'.encode('utf-8')
+    for scope_part in (date_stamp, region_name, SERVICE_NAME, 'aws4_request'):
+        signing_key = _hmac(signing_key, scope_part)
+
+    signature = hmac.new(
+        signing_key,
+        string_to_sign.encode('utf-8'),
+        hashlib.sha256,
+    ).hexdigest()
+
+    signed_headers['Authorization'] = (
+        f'{SIGNING_ALGORITHM} '
+        f'Credential={credentials.access_key}/{scope}, '
+        f'SignedHeaders={";".join(header_names)}, '
+        f'Signature={signature}'
+    )
+    return signed_headers
+
+
+def connection_error(operation_name: str, error: Exception) -> Exception:
+    """
+    Convert a connection failure to the error to raise.
+
+    Retry policies retry it, unless the operation is not idempotent: the
+    request might have reached SQS, and then the outcome is unknown.
+    """
+    if operation_name in NON_IDEMPOTENT_OPERATIONS:
+        return RequestOutcomeUnknownError(
+            {'Error': {'Code': 'RequestOutcomeUnknown', 'Message': str(error)}},
+            operation_name,
+        )
+
+    return HTTPClientError(error=error)
+
+
+def parse_error(
+    status: int,
+    headers: Mapping[str, str],
+    response_body: bytes,
+    operation_name: str,
+) -> ClientError:
+    """Convert an error response of SQS JSON protocol to a ClientError."""
+    try:
+        error_document = json.loads(response_body or b'{}')
+    except ValueError:
+        error_document = {}
+
+    error_type = error_document.get('__type', '').rsplit('#', 1)[-1]
+    query_error = headers.get(QUERY_ERROR_HEADER, '')
+    error_code = query_error.split(';', 1)[0] or error_type or str(status)
+
+    error_class = ERROR_CLASSES.get(error_type, ClientError)
+    return error_class(
+        {
+            'Error': {
+                'Code': error_code,
+                'Message': error_document.get('message', ''),
+            },
+            'ResponseMetadata': {'HTTPStatusCode': status},
+        },
+        operation_name,
+    )
+
+
+def _is_dropped(connection: http.client.HTTPConnection) -> bool:
+    """Idle connection is readable only if the server has closed it."""
+    if connection.sock is None:
+        return False
+
+    readable, _writable, _errors = select.select([connection.sock], [], [], 0)
+    return bool(readable)
+
+
+@dataclass
+class SQSHTTPClient:
+    """
+    Lean SQS client speaking JSON protocol over keep-alive HTTP connections.
+
+    Implements the operations senders and receivers use, see
+    `OPERATION_NAMES`, with the same arguments and responses as boto3 client.
+    It skips request validation and the other machinery of botocore, which is
+    noticeable at high call rates. Pass it as `client` to senders and
+    receivers.
+
+    Every thread keeps its own connection. Requests are signed with
+    `credentials`, read from environment variables by default.
+
+    Requests are not retried here, see `SQSMixin.retry_policy`. Connection
+    failures and timeouts are raised as retryable errors, except for sending
+    messages: `RequestOutcomeUnknownError` is raised then, and a retry would
+    risk duplicate messages.
+    """
+
+    region_name: str
+    endpoint_url: Optional[str] = None
+    credentials: Credentials = field(
+        default_factory=Credentials.from_environment,
+    )
+    timeout_seconds: float = 30
+
+    exceptions: SimpleNamespace = field(
+        default_factory=lambda: SimpleNamespace(
+            ClientError=ClientError,
+            QueueDoesNotExist=QueueDoesNotExistError,
+            ReceiptHandleIsInvalid=ReceiptHandleIsInvalidError,
+            RequestOutcomeUnknown=RequestOutcomeUnknownError,
+        ),
+        init=False,
+        repr=False,
+    )
+    meta: SimpleNamespace = field(init=False, repr=False)
+
+    _url: SplitResult = field(init=False, repr=False)
+    _connections: threading.local = field(
+        default_factory=threading.local,
+        init=False,
+        repr=False,
+    )
+
+    def __post_init__(self) -> None:
+        """Choose the regional endpoint by default."""
+        endpoint_url = self.endpoint_url or (
+            f'https://sqs.{self.region_name}.amazonaws.com'
+        )
+        self.endpoint_url = endpoint_url
+        self._url = urlsplit(endpoint_url)
+        self.meta = SimpleNamespace(
+            region_name=self.region_name,
+            endpoint_url=self.endpoint_url,
+        )
+
+    def __getattr__(self, name: str) -> 'partial[APIResponse]':
+        """Methods of supported API operations, like boto3 client has."""
+        try:
+            operation_name = OPERATION_NAMES[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+        return partial(self.call, operation_name)
+
+    def call(self, operation_name: str, **parameters) -> APIResponse:
+        """Call an SQS API operation, like `SendMessage`."""
+        payload = json.dumps(parameters).encode('utf-8')
+        status, headers, response_body = self._post(operation_name, payload)
+
+        if status >= http.client.BAD_REQUEST:
+            raise parse_error(status, headers, response_body, operation_name)
+
+        return json.loads(response_body or b'{}')
+
+    def close(self) -> None:
+        """Close the connection of the current thread."""
+        connection = getattr(self._connections, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._connections.connection = None
+
+    def _post(
+        self,
+        operation_name: str,
+        payload: bytes,
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        """Sign and send the request, closing the connection on failure."""
+        headers = sign_request(
+            credentials=self.credentials,
+            region_name=self.region_name,
+            host=self._url.netloc,
+            headers={
+                'Content-Type': JSON_CONTENT_TYPE,
+                'X-Amz-Target': f'{TARGET_PREFIX}{operation_name}',
+            },
+            payload=payload,
+            now=datetime.now(timezone.utc),
+        )
+
+        try:
+            return self._request(payload, headers)
+        except CONNECTION_ERRORS as err:
+            self.close()
+            raise connection_error(operation_name, err) from err
+
+    def _request(
+        self,
+        payload: bytes,
+        headers: Dict[str, str],
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        """Make the request on the connection of current thread."""
+        connection = self._connection()
+        connection.request('POST', '/', body=payload, headers=headers)
+
+        response = connection.getresponse()
+        response_body = response.read()
+        response_headers = {
+            name.lower(): header_value
+            for name, header_value in response.getheaders()
+        }
+
+        return response.status, response_headers, response_body
+
+    def _connection(self) -> http.client.HTTPConnection:
+        """
+        Connection of the current thread, opened if necessary.
+
+        Keep-alive connections might be closed by the server while idle.
+        Such a connection is replaced before a request is sent over it.
+        """
+        connection = getattr(self._connections, 'connection', None)
+        if connection is not None and _is_dropped(connection):
+            self.close()
+            connection = None
+
+        if connection is None:
+            connection_class = (
+                http.client.HTTPSConnection
+                if self._url.scheme == 'https'
+                else http.client.HTTPConnection
+            )
+            connection = connection_class(
+                self._url.netloc,
+                timeout=self.timeout_seconds,
+            )
+            self._connections.connection = connection
+
+        return connection
@@ -0,0 +1,76 @@
+import math
+import threading
+from dataclasses import dataclass, field
+from typing import Optional
+
+from platonic.sqs.queue.resolver import QueueAttributes
+
+
+@dataclass
+class AutoTuner:
+    """
+    Adjust receiver parameters to the queue configuration and to the load.
+
+    Long polling time follows `ReceiveMessageWaitTimeSeconds` of the queue,
+    if it is configured.
+
+    Time of handling one message is measured as a moving average, with
+    weight of the latest measurement equal to `smoothing`. The receiver then
+    never pulls more messages than can be handled, one after another, within
+    `visibility_margin` share of the visibility timeout of the queue. Thus,
+    messages do not become visible again while they wait to be handled.
+    """
+
+    smoothing: float = 0.2
+    visibility_margin: float = 0.8
+
+    handling_seconds: Optional[float] = field(default=None, init=False)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock,
+        init=False,
+        repr=False,
+    )
+
+    def record_handling_time(self, seconds: float) -> None:
+        """Update the average handling time with a new measurement."""
+        with self._lock:
+            if self.handling_seconds is None:
+                self.handling_seconds = seconds
+                return
+
+            self.handling_seconds += self.smoothing * (
+                seconds - self.handling_seconds
+            )
+
+    def wait_time_seconds(
+        self,
+        queue_attributes: QueueAttributes,
+        default: int,
+    ) -> int:
+        """Long polling time configured for the queue."""
+        return queue_attributes.receive_message_wait_time_seconds or default
+
+    def messages_count(
+        self,
+        requested_count: int,
+        in_flight_count: int,
+        queue_attributes: QueueAttributes,
+    ) -> int:
+        """
+        How many messages to pull, at most `requested_count`.
+
+        Zero means that messages in flight already fill the capacity, and
+        nothing should be pulled until some of them are handled. When nothing
+        is in flight, at least one message is pulled, to keep measuring.
+        """
+        if not self.handling_seconds:
+            return requested_count
+
+        capacity = math.floor(
+            queue_attributes.visibility_timeout * self.visibility_margin /
+            self.handling_seconds,
+        )
+        if not in_flight_count:
+            return max(1, min(requested_count, capacity))
+
+        return max(0, min(requested_count, capacity - in_flight_count))
@@ -0,0 +1,55 @@
+import uuid
+from dataclasses import dataclass
+from datetime import timedelta
+
+from mypy_boto3_sqs.type_defs import (
+    ChangeMessageVisibilityBatchRequestEntryTypeDef,
+)
+from platonic.sqs.queue.message import SQSMessage
+from platonic.sqs.queue.sqs import MAX_VISIBILITY_TIMEOUT
+from platonic.sqs.queue.types import ValueType
+
+# 2 ** 32 seconds is more than a century, far beyond MAX_VISIBILITY_TIMEOUT
+MAX_EXPONENT = 32
+
+
+def _generate_change_message_visibility_batch_entry_id() -> str:
+    """Generate batch entry Id."""
+    return uuid.uuid4().hex
+
+
+def generate_change_message_visibility_batch_entry(
+    message: SQSMessage[ValueType],
+    visibility_timeout: int,
+) -> ChangeMessageVisibilityBatchRequestEntryTypeDef:
+    """Convert a Message into an entry for ChangeMessageVisibilityBatch."""
+    return {
+        'Id': _generate_change_message_visibility_batch_entry_id(),
+        'ReceiptHandle': message.receipt_handle,
+        'VisibilityTimeout': visibility_timeout,
+    }
+
+
+@dataclass
+class ExponentialRedeliveryDelay:
+    """
+    Redelivery delay growing exponentially with the number of receives.
+
+    A message received for the first time is redelivered after `base`, for
+    the second time - after `2 * base`, then after `4 * base`, and so on,
+    up to `max_delay`.
+    """
+
+    base: timedelta = timedelta(seconds=1)
+    max_delay: timedelta = timedelta(seconds=MAX_VISIBILITY_TIMEOUT)
+
+    def __post_init__(self) -> None:
+        """Validate the delays."""
+        if self.base < timedelta(0) or self.max_delay < timedelta(0):
+            raise ValueError('Redelivery delay cannot be negative.')
+
+    def __call__(self, message: SQSMessage[ValueType]) -> timedelta:
+        """Calculate the delay for given message."""
+        # Capping the exponent protects us from timedelta overflow.
+        exponent = min((message.receive_count or 1) - 1, MAX_EXPONENT)
+        return min(self.base * (2 ** exponent), self.max_delay)
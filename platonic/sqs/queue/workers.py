@@ -0,0 +1,189 @@
+import logging
+import math
+import threading
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Callable, Generic, List, Optional
+
+from platonic.sqs.queue.backlog import Backlog, BacklogMonitor
+from platonic.sqs.queue.message import SQSMessage
+from platonic.sqs.queue.receiver import SQSReceiver
+from platonic.sqs.queue.sqs import MAX_WAIT_TIME_SECONDS
+from platonic.sqs.queue.types import ValueType
+
+logger = logging.getLogger(__name__)
+
+# Pause of a worker after it failed to receive messages.
+RECEIVE_ERROR_DELAY = timedelta(seconds=1)
+
+
+@dataclass
+class _Worker(Generic[ValueType]):
+    """Thread receiving and handling messages."""
+
+    pool: 'SQSWorkerPool[ValueType]'
+    stop_requested: threading.Event = field(default_factory=threading.Event)
+    thread: threading.Thread = field(init=False)
+
+    def __post_init__(self) -> None:
+        """Start the thread."""
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self) -> None:
+        """
+        Handle messages until stopped.
+
+        Failures to receive messages, like throttling or network errors, are
+        logged, and the worker tries again after `RECEIVE_ERROR_DELAY`.
+        """
+        receiver = self.pool.receiver
+        while not self.stop_requested.is_set() and not receiver.is_stopped:
+            try:
+                self._receive_and_handle()
+            except Exception:
+                logger.exception('Failed to receive SQS messages.')
+                self.stop_requested.wait(RECEIVE_ERROR_DELAY.total_seconds())
+
+    def _receive_and_handle(self) -> None:
+        """Receive one batch of messages and handle them."""
+        receiver = self.pool.receiver
+        batch = receiver.receive_many(
+            max_messages=receiver.batch_size,
+            max_latency=self.pool.poll_latency,
+        )
+
+        for position, message in enumerate(batch.messages):
+            if self.stop_requested.is_set():
+                receiver.release_many(batch.messages[position:])
+                return
+
+            self.pool.handle(message)
+
+
+@dataclass
+class SQSWorkerPool(Generic[ValueType]):
+    """
+    Pool of threads processing messages from a queue.
+
+    The number of workers is adjusted every `scale_interval`, between
+    `min_workers` and `max_workers`, so that the queue backlog is processed
+    within `max_lag`, judging by the throughput the workers have shown since
+    the previous adjustment. Until that is known, every worker is given about
+    `messages_per_worker` messages of the backlog. When the queue is empty,
+    the pool shrinks to `min_workers` to save API calls.
+    """
+
+    receiver: SQSReceiver[ValueType]
+    handler: Callable[[ValueType], None]
+    min_workers: int = 1
+    max_workers: int = 10
+    messages_per_worker: int = 100
+    max_lag: timedelta = timedelta(minutes=1)
+    scale_interval: timedelta = timedelta(seconds=10)
+    poll_latency: timedelta = timedelta(seconds=MAX_WAIT_TIME_SECONDS)
+    monitor: BacklogMonitor[ValueType] = field(init=False)
+
+    _workers: List[_Worker[ValueType]] = field(
+        default_factory=list,
+        init=False,
+        repr=False,
+    )
+    _stop_requested: threading.Event = field(
+        default_factory=threading.Event,
+        init=False,
+        repr=False,
+    )
+    _scaler: threading.Thread = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Create backlog monitor which will not request it too often."""
+        self.monitor = BacklogMonitor(
+            receiver=self.receiver,
+            cache_ttl=self.scale_interval,
+        )
+
+    @property
+    def workers_count(self) -> int:
+        """Current number of workers."""
+        return len(self._workers)
+
+    def start(self) -> None:
+        """Start workers and the thread which scales them."""
+        self.scale_to(self.min_workers)
+
+        self._scaler = threading.Thread(target=self._scale_forever, daemon=True)
+        self._scaler.start()
+
+    def stop(self, timeout: timedelta) -> bool:
+        """
+        Stop processing, waiting for the messages in flight to complete.
+
+        See `SQSReceiver.shutdown()`.
+        """
+        self._stop_requested.set()
+        is_drained = self.receiver.shutdown(timeout)
+
+        for worker in self._workers:
+            worker.thread.join(timeout=timeout.total_seconds())
+
+        return is_drained
+
+    def desired_workers_count(
+        self,
+        backlog: Backlog,
+        lag: Optional[float] = None,
+    ) -> int:
+        """
+        Number of workers necessary to process the backlog.
+
+        `lag` is the time, in seconds, current workers need to process the
+        backlog, see `BacklogMonitor.lag()`.
+        """
+        if lag is None or math.isinf(lag):
+            desired_count = math.ceil(
+                backlog.visible / self.messages_per_worker,
+            )
+        else:
+            desired_count = math.ceil(
+                max(self.workers_count, 1) * lag /
+                self.max_lag.total_seconds(),
+            )
+
+        return max(self.min_workers, min(desired_count, self.max_workers))
+
+    def scale(self) -> None:
+        """Adjust the number of workers to the current backlog and lag."""
+        lag = self.monitor.lag(self.monitor.rates())
+        self.scale_to(self.desired_workers_count(self.monitor.backlog(), lag))
+
+    def scale_to(self, workers_count: int) -> None:
+        """Add or remove workers."""
+        while self.workers_count < workers_count:
+            self._workers.append(_Worker(pool=self))
+
+        while self.workers_count > workers_count:
+            self._workers.pop().stop_requested.set()
+
+    def handle(self, message: SQSMessage[ValueType]) -> None:
+        """Process one message, acknowledging or rejecting it."""
+        try:
+            with self.receiver.acknowledgement(message):
+                self.handler(message.value)
+
+        except Exception:
+            logger.exception('Failed to handle SQS message.')
+
+    def _scale_forever(self) -> None:
+        """
+        Scale the workers periodically until stopped.
+
+        Failures, like throttling or network errors, are logged, and the pool
+        keeps its size until the next attempt.
+        """
+        interval_seconds = self.scale_interval.total_seconds()
+        while not self._stop_requested.wait(interval_seconds):
+            try:
+                self.scale()
+            except Exception:
+                logger.exception('Failed to scale SQS worker pool.')
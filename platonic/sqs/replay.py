@@ -0,0 +1,254 @@
+"""
+Replay SQS API traffic recorded by `RecordingClient`.
+
+Every recorded call is reproduced with `SQSSender` and `SQSReceiver` against
+`LocalSQSClient`, at the recorded moment divided by `--speed`. Latencies of
+the replayed calls are compared with the recorded ones, and the report is
+printed as JSON:
+
+    python -m platonic.sqs.replay trace.jsonl --speed 10
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import timedelta
+from typing import Deque, Dict, Iterator, List, Optional, Sequence, cast
+
+from platonic.sqs.benchmark import percentile
+from platonic.sqs.queue.local import LocalSQSClient
+from platonic.sqs.queue.message import SQSMessage
+from platonic.sqs.queue.receiver import SQSReceiver
+from platonic.sqs.queue.recording import TraceRecord
+from platonic.sqs.queue.sender import SQSSender
+
+LatencyStats = Dict[str, Dict[str, Optional[float]]]
+
+
+@dataclass
+class ReplayReport:
+    """Comparison of the replayed traffic with the recorded one."""
+
+    calls: int
+    messages_sent: int
+    messages_received: int
+    recorded_seconds: float
+    replayed_seconds: float
+    throughput: float
+    recorded_latency_ms: LatencyStats
+    replayed_latency_ms: LatencyStats
+    errors: Dict[str, int]
+
+
+def read_trace(path: str) -> Iterator[TraceRecord]:
+    """Lazily read a trace file written by `RecordingClient`."""
+    with open(path, encoding='utf-8') as trace_file:
+        for line in trace_file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _number(record: TraceRecord, name: str, default: float = 0) -> float:
+    """Numeric field of a trace record."""
+    return cast(float, record.get(name, default))
+
+
+def _message_bodies(record: TraceRecord) -> List[str]:
+    """Recorded message bodies, or placeholders of the recorded sizes."""
+    bodies = cast(Optional[List[str]], record.get('bodies'))
+    return bodies or [
+        'x' * size for size in cast(List[int], record['sizes'])
+    ]
+
+
+def latency_stats(latencies: Dict[str, List[float]]) -> LatencyStats:
+    """Median and 99th percentile of latencies per operation."""
+    return {
+        operation_name: {
+            'p50': percentile(sorted(operation_latencies), 0.5),
+            'p99': percentile(sorted(operation_latencies), 0.99),
+        }
+        for operation_name, operation_latencies in latencies.items()
+    }
+
+
+@dataclass
+class _Replayer:
+    """Reproduce recorded calls with a sender and a receiver."""
+
+    sender: SQSSender[str]
+    receiver: SQSReceiver[str]
+
+    latencies: Dict[str, List[float]] = field(
+        default_factory=lambda: defaultdict(list),
+        init=False,
+    )
+    errors: 'Counter[str]' = field(default_factory=Counter, init=False)
+    messages_sent: int = field(default=0, init=False)
+    messages_received: int = field(default=0, init=False)
+    speed: float = 1
+
+    _received: Deque[SQSMessage[str]] = field(
+        default_factory=deque,
+        init=False,
+        repr=False,
+    )
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock,
+        init=False,
+        repr=False,
+    )
+
+    def replay(self, record: TraceRecord) -> None:
+        """Reproduce one call and measure it."""
+        operation_name = str(record['op'])
+        started_at = time.perf_counter()
+
+        try:
+            self._call(operation_name, record)
+
+        except Exception as err:
+            with self._lock:
+                self.errors[type(err).__name__] += 1
+            return
+
+        with self._lock:
+            self.latencies[operation_name].append(
+                (time.perf_counter() - started_at) * 1000,
+            )
+
+    def _call(self, operation_name: str, record: TraceRecord) -> None:
+        """Make the call the record describes."""
+        if operation_name in {'send_message', 'send_message_batch'}:
+            self._send(operation_name, _message_bodies(record))
+
+        elif operation_name == 'receive_message':
+            self._receive(record)
+
+        elif operation_name in {'delete_message', 'delete_message_batch'}:
+            self.receiver.acknowledge_many(self._take(record))
+
+        elif operation_name.startswith('change_message_visibility'):
+            self.receiver.reject_many(
+                self._take(record),
+                delay=timedelta(seconds=_number(record, 'visibility')),
+            )
+
+        elif operation_name == 'get_queue_attributes':
+            self.receiver.backlog()
+
+    def _send(self, operation_name: str, bodies: List[str]) -> None:
+        """Send messages with the same API operation as recorded."""
+        if operation_name == 'send_message':
+            for message_body in bodies:
+                self.sender.send(message_body)
+        else:
+            self.sender.send_raw_many(bodies)
+
+        with self._lock:
+            self.messages_sent += len(bodies)
+
+    def _receive(self, record: TraceRecord) -> None:
+        """Poll as recorded, keeping the messages for later calls."""
+        messages = self.receiver.poll(
+            int(_number(record, 'wait') / self.speed),
+            messages_count=int(_number(record, 'max', 1)),
+        )
+        with self._lock:
+            self.messages_received += len(messages)
+            self._received.extend(messages)
+
+    def _take(self, record: TraceRecord) -> List[SQSMessage[str]]:
+        """Take up to the recorded count of received messages."""
+        count = int(_number(record, 'count'))
+        with self._lock:
+            return [
+                self._received.popleft()
+                for _index in range(min(count, len(self._received)))
+            ]
+
+
+def replay(
+    records: Sequence[TraceRecord],
+    speed: float = 1,
+    client: Optional[LocalSQSClient] = None,
+    max_concurrency: int = 16,
+) -> ReplayReport:
+    """
+    Replay the recorded calls.
+
+    Calls are scheduled at the recorded moments, `speed` times faster, and
+    run concurrently as they did when recorded.
+    """
+    client = client or LocalSQSClient()
+    url = str(client.create_queue(QueueName='replay')['QueueUrl'])
+    replayer = _Replayer(
+        sender=SQSSender[str](url=url, client=client),  # type: ignore
+        receiver=SQSReceiver[str](url=url, client=client),  # type: ignore
+        speed=speed,
+    )
+
+    recorded_latencies: Dict[str, List[float]] = defaultdict(list)
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        for record in records:
+            recorded_latencies[str(record['op'])].append(
+                _number(record, 'ms'),
+            )
+
+            delay = _number(record, 'at') / speed - (
+                time.perf_counter() - started_at
+            )
+            if delay > 0:
+                time.sleep(delay)
+
+            executor.submit(replayer.replay, record)
+
+    replayed_seconds = time.perf_counter() - started_at
+    return ReplayReport(
+        calls=len(records),
+        messages_sent=replayer.messages_sent,
+        messages_received=replayer.messages_received,
+        recorded_seconds=max(
+            (
+                _number(record, 'at') + _number(record, 'ms') / 1000
+                for record in records
+            ),
+            default=0,
+        ),
+        replayed_seconds=replayed_seconds,
+        throughput=replayer.messages_sent / replayed_seconds,
+        recorded_latency_ms=latency_stats(recorded_latencies),
+        replayed_latency_ms=latency_stats(replayer.latencies),
+        errors=dict(replayer.errors),
+    )
+
+
+def main(arguments: Optional[Sequence[str]] = None) -> None:
+    """Replay a trace file and print the report as JSON."""
+    parser = argparse.ArgumentParser(
+        prog='python -m platonic.sqs.replay',
+        description=__doc__.strip().splitlines()[0],
+    )
+    parser.add_argument('path')
+    parser.add_argument('--speed', type=float, default=1)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parsed_arguments = parser.parse_args(arguments)
+
+    report = replay(
+        list(read_trace(parsed_arguments.path)),
+        speed=parsed_arguments.speed,
+        client=LocalSQSClient(
+            latency=timedelta(milliseconds=parsed_arguments.latency_ms),
+        ),
+    )
+    json.dump(asdict(report), sys.stdout, indent=2)
+    sys.stdout.write('\n')
+
+
+if __name__ == '__main__':  # pragma: no cover
+    main()
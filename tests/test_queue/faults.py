@@ -0,0 +1,28 @@
+"""Simulated failures of SQS API calls."""
+
+from botocore.exceptions import ClientError
+
+
+def client_error(code: str, operation_name: str = 'SendMessage') -> ClientError:
+    """Construct an error boto3 would raise."""
+    return ClientError(
+        error_response={'Error': {'Code': code, 'Message': code}},
+        operation_name=operation_name,
+    )
+
+
+class FlakyOperation:
+    """Fails with the given errors and then succeeds."""
+
+    def __init__(self, *errors: Exception) -> None:
+        """Remember errors to raise."""
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self, **kwargs):
+        """Raise next error, or return the kwargs."""
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+
+        return kwargs
@@ -0,0 +1,109 @@
+import json
+from datetime import timedelta
+
+import pytest
+from platonic.sqs.benchmark import (
+    BenchmarkConfig,
+    main,
+    parse_config,
+    percentile,
+    run,
+)
+from platonic.sqs.queue import LocalSQSClient, SQSReceiver, SQSSender
+from platonic.sqs.queue.rate_limit import is_throttling_error
+from platonic.timeout import ConstantTimeout
+
+
+def test_local_client():
+    """Sender and receiver work against the local stand-in."""
+    client = LocalSQSClient()
+    url = client.create_queue(QueueName='local')['QueueUrl']
+
+    SQSSender[int](url=url, client=client).send_many(range(15))
+
+    receiver = SQSReceiver[int](
+        url=url,
+        client=client,
+        timeout=ConstantTimeout(period=timedelta(seconds=1)),
+    )
+    messages = list(receiver)
+    receiver.acknowledge_many(messages)
+
+    assert sorted(message.value for message in messages) == list(range(15))
+    assert receiver.backlog().visible == 0
+    assert client.calls['send_message_batch'] == 2
+    assert client.calls['delete_message_batch'] == 2
+
+
+def test_local_client_throttling():
+    """Every call but queue setup is throttled if throttling rate is 1."""
+    client = LocalSQSClient(throttling_rate=1)
+    url = client.create_queue(QueueName='throttled')['QueueUrl']
+
+    with pytest.raises(client.exceptions.ClientError) as error_info:
+        client.send_message(QueueUrl=url, MessageBody='throttled')
+
+    assert is_throttling_error(error_info.value)
+
+
+def test_percentile():
+    """Nearest rank percentile."""
+    assert percentile([1, 2, 3, 4], 0.5) == 2
+    assert percentile([1, 2, 3, 4], 1) == 4
+    assert percentile([7], 0.99) == 7
+    assert percentile([], 0.5) is None
+
+
+def test_run():
+    """Every message is consumed, and results are measured."""
+    result = run(BenchmarkConfig(messages=200, producers=2, consumers=3))
+
+    assert result.api_calls['send_message_batch'] == 20
+    assert result.api_calls_per_message > 0
+    assert result.is_complete
+    assert result.consumed == 200
+    assert not result.errors
+    assert result.latency_ms['p50'] <= result.latency_ms['max']
+    assert result.consume_rate > 0
+
+
+def test_run_with_errors():
+    """Throttled calls are counted, and lost messages leave it incomplete."""
+    result = run(BenchmarkConfig(
+        messages=50,
+        throttling_rate=1,
+        timeout_seconds=0.5,
+    ))
+
+    assert not result.is_complete
+    assert result.consumed == 0
+    assert result.errors['produce'] == 5
+    assert result.errors['consume'] > 0
+    assert result.duration_seconds > 0
+    assert result.consume_rate == 0
+    assert result.latency_ms['p50'] is None
+
+
+def test_main_incomplete(capsys):
+    """Incomplete run fails, but its results are printed."""
+    with pytest.raises(SystemExit):
+        main([
+            '--messages', '5',
+            '--throttling-rate', '1',
+            '--timeout-seconds', '0',
+        ])
+
+    output = json.loads(capsys.readouterr().out)
+    assert output['is_complete'] is False
+    assert output['latency_ms']['max'] is None
+
+
+def test_main(capsys):
+    """Results are printed as JSON."""
+    assert parse_config(['--messages', '5']).messages == 5
+
+    main(['--messages', '20', '--send-batch-size', '1'])
+
+    output = json.loads(capsys.readouterr().out)
+    assert output['config']['messages'] == 20
+    assert output['api_calls']['send_message'] == 20
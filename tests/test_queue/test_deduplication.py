@@ -0,0 +1,106 @@
+from datetime import timedelta
+
+from mypy_boto3_sqs import Client as SQSClient
+from platonic.sqs.queue import (
+    InMemoryDeduplicationCache,
+    SQLiteDeduplicationCache,
+    SQSReceiver,
+    SQSSender,
+)
+from platonic.timeout import ConstantTimeout
+
+
+def test_in_memory_cache_eviction():
+    """Least recently used keys are evicted first."""
+    cache = InMemoryDeduplicationCache(max_size=2)
+
+    cache.add('a')
+    cache.add('b')
+    assert 'a' in cache
+
+    cache.add('c')
+
+    assert 'a' in cache
+    assert 'b' not in cache
+    assert 'c' in cache
+    assert len(cache) == 2
+
+
+def test_in_memory_cache_expiration():
+    """Expired keys are not in cache."""
+    cache = InMemoryDeduplicationCache(ttl=timedelta(seconds=0))
+    cache.add('a')
+
+    assert 'a' not in cache
+    assert 'z' not in cache
+
+
+def test_sqlite_cache(tmp_path):
+    """Two cache instances share the same database file."""
+    path = str(tmp_path / 'deduplication.sqlite')
+
+    SQLiteDeduplicationCache(path=path).add('a')
+
+    cache = SQLiteDeduplicationCache(path=path)
+    assert 'a' in cache
+    assert 'b' not in cache
+
+    expired_cache = SQLiteDeduplicationCache(
+        path=path,
+        ttl=timedelta(seconds=-1),
+    )
+    expired_cache.add('b')
+    assert 'b' not in cache
+
+
+def test_duplicate_by_body(mock_sqs_client: SQSClient):
+    """A message with a recently processed body is acknowledged and skipped."""
+    sqs_queue_url = mock_sqs_client.create_queue(
+        QueueName='deduplication_by_body',
+    )['QueueUrl']
+
+    sender = SQSSender[str](url=sqs_queue_url)
+    receiver = SQSReceiver[str](
+        url=sqs_queue_url,
+        deduplication_cache=InMemoryDeduplicationCache(),
+        deduplicate_by_body=True,
+        timeout=ConstantTimeout(period=timedelta(seconds=2)),
+    )
+
+    sender.send('hello')
+    message = receiver.receive()
+    assert message.message_id
+    receiver.acknowledge(message)
+
+    sender.send('hello')
+    sender.send('world')
+
+    assert [message.value for message in receiver] == ['world']
+    assert receiver.acknowledged_count == 1
+    assert receiver.backlog().not_visible == 1
+
+
+def test_duplicate_by_message_id(mock_sqs_client: SQSClient):
+    """Redelivered message is acknowledged and skipped."""
+    sqs_queue_url = mock_sqs_client.create_queue(
+        QueueName='deduplication_by_message_id',
+        Attributes={
+            'VisibilityTimeout': '1',
+        },
+    )['QueueUrl']
+
+    sender = SQSSender[str](url=sqs_queue_url)
+    receiver = SQSReceiver[str](
+        url=sqs_queue_url,
+        deduplication_cache=InMemoryDeduplicationCache(),
+        timeout=ConstantTimeout(period=timedelta(seconds=3)),
+    )
+
+    sender.send('hello')
+    message = receiver.receive()
+
+    # The message was processed, but the deletion did not happen.
+    receiver._remember_processed(message)
+
+    # SQS will deliver the message again after visibility timeout expires.
+    assert not list(receiver)
@@ -0,0 +1,114 @@
+from datetime import timedelta
+from typing import List
+
+import pytest
+from platonic.sqs.queue import (
+    InMemoryTracer,
+    LocalSQSClient,
+    SpanContext,
+    SQSFanOutSender,
+    SQSQueueDoesNotExist,
+    SQSReceiver,
+    SQSSender,
+)
+from platonic.timeout import ConstantTimeout
+
+
+def _values_in(client: LocalSQSClient, url: str) -> List[int]:
+    receiver = SQSReceiver[int](
+        url=url,
+        client=client,
+        timeout=ConstantTimeout(period=timedelta(seconds=1)),
+    )
+    return sorted(message.value for message in receiver)
+
+
+def test_fan_out():
+    """Every destination gets the values it accepts."""
+    client = LocalSQSClient()
+    urls = [
+        client.create_queue(QueueName=f'subscriber_{number}')['QueueUrl']
+        for number in range(3)
+    ]
+
+    fan_out_sender = SQSFanOutSender.from_urls(
+        urls,
+        filters=[None, lambda number: number % 2 == 0, None],
+        sender_class=SQSSender[int],
+        client=client,
+    )
+    assert fan_out_sender.urls == urls
+
+    fan_out_result = fan_out_sender.send_many(range(15))
+
+    assert fan_out_result.is_successful
+    assert _values_in(client, urls[0]) == list(range(15))
+    assert _values_in(client, urls[1]) == list(range(0, 15, 2))
+    assert _values_in(client, urls[2]) == list(range(15))
+    assert [
+        message.value for message in fan_out_result.messages[urls[1]]
+    ] == list(range(0, 15, 2))
+    assert client.calls['send_message_batch'] == 5
+
+
+def test_failure_is_per_destination():
+    """One destination failing does not prevent sending to the others."""
+    client = LocalSQSClient()
+    url = client.create_queue(QueueName='alive')['QueueUrl']
+    missing_url = 'https://sqs.local/000000000000/missing'
+
+    fan_out_result = SQSFanOutSender(senders=[
+        SQSSender[int](url=missing_url, client=client),
+        SQSSender[int](url=url, client=client),
+    ]).send(42)
+
+    assert not fan_out_result.is_successful
+    assert isinstance(
+        fan_out_result.failures[missing_url],
+        SQSQueueDoesNotExist,
+    )
+    assert _values_in(client, url) == [42]
+
+
+def test_invalid_destinations():
+    """Filters must match senders, and there must be some senders."""
+    with pytest.raises(ValueError):
+        SQSFanOutSender(senders=[])
+
+    client = LocalSQSClient()
+    with pytest.raises(ValueError):
+        SQSFanOutSender(
+            senders=[
+                SQSSender[int](url=f'https://sqs.local/0/{name}', client=client)
+                for name in ('first', 'second')
+            ],
+            filters=[None],
+        )
+
+
+def test_trace_context_is_propagated():
+    """Fanned out messages carry the trace context of the caller."""
+    client = LocalSQSClient()
+    tracer = InMemoryTracer()
+    urls = [
+        client.create_queue(QueueName=f'traced_subscriber_{number}')[
+            'QueueUrl'
+        ]
+        for number in range(2)
+    ]
+    fan_out_sender = SQSFanOutSender.from_urls(
+        urls,
+        sender_class=SQSSender[int],
+        client=client,
+        tracer=tracer,
+    )
+
+    with tracer.span('produce') as produce_span:
+        fan_out_sender.send(1)
+
+    for url in urls:
+        receiver = SQSReceiver[int](url=url, client=client, tracer=tracer)
+        trace_context = SpanContext.from_traceparent(
+            receiver.receive().trace_context,
+        )
+        assert trace_context.trace_id == produce_span.context.trace_id
@@ -0,0 +1,160 @@
+import json
+import time
+from http.client import HTTPConnection
+from urllib.parse import urlparse
+
+import pytest
+from platonic.sqs.queue import LocalSQSClient, LocalSQSServer
+from platonic.sqs.queue.sqs import MAX_MESSAGE_SIZE
+from platonic.sqs.queue.transport import JSON_CONTENT_TYPE, TARGET_PREFIX
+
+
+@pytest.fixture()
+def local_client() -> LocalSQSClient:
+    """Local client with a queue named `local`, and another one."""
+    client = LocalSQSClient()
+    client.create_queue(QueueName='other')
+    client.create_queue(
+        QueueName='local',
+        Attributes={'VisibilityTimeout': '1'},
+    )
+    return client
+
+
+def _url(client: LocalSQSClient) -> str:
+    return str(client.get_queue_url(QueueName='local')['QueueUrl'])
+
+
+def _receive(client: LocalSQSClient, **kwargs):
+    return client.receive_message(
+        QueueUrl=_url(client),
+        MaxNumberOfMessages=10,
+        WaitTimeSeconds=0,
+        **kwargs,
+    ).get('Messages', [])
+
+
+def test_queue_attributes(local_client: LocalSQSClient):
+    """Queue attributes may be requested all at once or by name."""
+    url = _url(local_client)
+    local_client.send_message(QueueUrl=url, MessageBody='body')
+
+    all_attributes = local_client.get_queue_attributes(QueueUrl=url)
+    assert all_attributes['Attributes']['VisibilityTimeout'] == '1'
+
+    assert local_client.get_queue_attributes(
+        QueueUrl=url,
+        AttributeNames=['ApproximateNumberOfMessages'],
+    ) == {'Attributes': {'ApproximateNumberOfMessages': '1'}}
+
+
+def test_message_attributes(local_client: LocalSQSClient):
+    """System attributes of a message may be requested all at once."""
+    local_client.send_message(QueueUrl=_url(local_client), MessageBody='a')
+
+    raw_message = _receive(local_client, AttributeNames=['All'])[0]
+
+    assert set(raw_message['Attributes']) == {
+        'ApproximateReceiveCount',
+        'SentTimestamp',
+    }
+
+
+def test_too_large_messages(local_client: LocalSQSClient):
+    """Message and batch sizes are limited as in SQS."""
+    url = _url(local_client)
+    too_large_body = 'x' * (MAX_MESSAGE_SIZE + 1)
+
+    with pytest.raises(local_client.exceptions.ClientError):
+        local_client.send_message(QueueUrl=url, MessageBody=too_large_body)
+
+    with pytest.raises(local_client.exceptions.ClientError):
+        local_client.send_message_batch(QueueUrl=url, Entries=[
+            {'Id': str(index), 'MessageBody': 'x' * (MAX_MESSAGE_SIZE // 2)}
+            for index in range(3)
+        ])
+
+
+def test_change_message_visibility(local_client: LocalSQSClient):
+    """Message in flight may be postponed or released."""
+    url = _url(local_client)
+    local_client.send_message(QueueUrl=url, MessageBody='body')
+    raw_message = _receive(local_client)[0]
+
+    local_client.change_message_visibility(
+        QueueUrl=url,
+        ReceiptHandle=raw_message['ReceiptHandle'],
+        VisibilityTimeout=2,
+    )
+    time.sleep(1.2)
+    assert not _receive(local_client)
+
+    local_client.change_message_visibility(
+        QueueUrl=url,
+        ReceiptHandle=raw_message['ReceiptHandle'],
+        VisibilityTimeout=0,
+    )
+    assert len(_receive(local_client)) == 1
+
+    with pytest.raises(local_client.exceptions.ReceiptHandleIsInvalid):
+        local_client.change_message_visibility(
+            QueueUrl=url,
+            ReceiptHandle='invalid',
+            VisibilityTimeout=0,
+        )
+
+
+def test_invalid_receipt_handles(local_client: LocalSQSClient):
+    """Messages not in flight cannot be deleted or postponed."""
+    url = _url(local_client)
+
+    with pytest.raises(local_client.exceptions.ReceiptHandleIsInvalid):
+        local_client.delete_message(QueueUrl=url, ReceiptHandle='invalid')
+
+    response = local_client.change_message_visibility_batch(
+        QueueUrl=url,
+        Entries=[{
+            'Id': '0',
+            'ReceiptHandle': 'invalid',
+            'VisibilityTimeout': 0,
+        }],
+    )
+    assert response['Failed'][0]['Code'] == 'ReceiptHandleIsInvalid'
+
+
+def test_purge_queue(local_client: LocalSQSClient):
+    """Purging deletes both visible messages and messages in flight."""
+    url = _url(local_client)
+    local_client.send_message(QueueUrl=url, MessageBody='in flight')
+    _receive(local_client)
+    local_client.send_message(QueueUrl=url, MessageBody='visible')
+
+    local_client.purge_queue(QueueUrl=url)
+    time.sleep(1.2)
+
+    assert not _receive(local_client)
+
+
+@pytest.mark.parametrize(('headers', 'error_type'), [
+    ({}, 'MissingAuthenticationToken'),
+    ({'Authorization': 'unchecked'}, 'InvalidAction'),
+])
+def test_server_rejects_invalid_requests(headers, error_type):
+    """Requests must be signed and name a known operation."""
+    with LocalSQSServer() as server:
+        endpoint = urlparse(server.endpoint_url)
+        connection = HTTPConnection(
+            endpoint.hostname,
+            endpoint.port,
+        )
+        connection.request('POST', '/', body=b'{}', headers={
+            'Content-Type': JSON_CONTENT_TYPE,
+            'X-Amz-Target': f'{TARGET_PREFIX}Dance',
+            **headers,
+        })
+        response = connection.getresponse()
+        error_document = json.loads(response.read())
+        connection.close()
+
+    assert response.status == 400
+    assert error_document['__type'] == f'com.amazonaws.sqs#{error_type}'
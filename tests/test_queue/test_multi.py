@@ -0,0 +1,245 @@
+import time
+from datetime import timedelta
+from typing import Tuple
+
+import pytest
+from mypy_boto3_sqs import Client as SQSClient
+from platonic.queue import MessageReceiveTimeout
+from platonic.sqs.queue import (
+    AutoTuner,
+    LocalSQSClient,
+    SQSMultiReceiver,
+    SQSReceiver,
+    SQSSender,
+)
+from platonic.timeout import ConstantTimeout
+
+QueueURLs = Tuple[str, str]
+
+
+@pytest.fixture()
+def priority_queue_urls(mock_sqs_client: SQSClient) -> QueueURLs:
+    """High and low priority queues, empty."""
+    urls = tuple(
+        mock_sqs_client.create_queue(QueueName=queue_name)['QueueUrl']
+        for queue_name in ('high_priority', 'low_priority')
+    )
+
+    for url in urls:
+        mock_sqs_client.purge_queue(QueueUrl=url)
+
+    return urls  # type: ignore
+
+
+def _send(url: str, *values: str) -> None:
+    SQSSender[str](url=url).send_many(values)
+
+
+def test_strict_priority(
+    priority_queue_urls: QueueURLs,
+    mock_sqs_client: SQSClient,
+):
+    """High priority queue is drained first."""
+    high_url, low_url = priority_queue_urls
+    _send(low_url, 'low-1', 'low-2')
+    _send(high_url, 'high-1', 'high-2')
+
+    receiver = SQSMultiReceiver.from_urls(
+        priority_queue_urls,
+        receiver_class=SQSReceiver[str],
+        client=mock_sqs_client,
+    )
+    receiver.timeout = ConstantTimeout(period=timedelta(seconds=2))
+
+    messages = list(receiver)
+    assert [message.value for message in messages] == [
+        'high-1', 'high-2', 'low-1', 'low-2',
+    ]
+    assert messages[0].queue_url == high_url
+    assert messages[-1].queue_url == low_url
+    assert receiver.in_flight_count == 4
+
+    receiver.acknowledge_many(messages)
+    assert receiver.in_flight_count == 0
+
+    with pytest.raises(MessageReceiveTimeout):
+        receiver.receive()
+
+
+def test_weighted_priority(priority_queue_urls: QueueURLs):
+    """Both queues are polled, messages are routed back correctly."""
+    high_url, low_url = priority_queue_urls
+    _send(low_url, 'low')
+    _send(high_url, 'high')
+
+    receiver = SQSMultiReceiver(
+        receivers=[
+            SQSReceiver[str](url=high_url),
+            SQSReceiver[str](url=low_url),
+        ],
+        weights=[3, 1],
+        timeout=ConstantTimeout(period=timedelta(seconds=5)),
+    )
+
+    first_message = receiver.receive()
+    with receiver.acknowledgement(first_message):
+        assert first_message.value in {'high', 'low'}
+
+    second_message = receiver.receive()
+    receiver.acknowledge(second_message)
+
+    assert {first_message.value, second_message.value} == {'high', 'low'}
+    assert len(receiver.polling_order()) == 2
+
+
+def test_busy_receiver_polls_high_priority(priority_queue_urls: QueueURLs):
+    """When too many messages are in flight, low priority is not polled."""
+    high_url, low_url = priority_queue_urls
+    _send(low_url, 'low-1', 'low-2')
+
+    receiver = SQSMultiReceiver(
+        receivers=[
+            SQSReceiver[str](url=high_url),
+            SQSReceiver[str](url=low_url),
+        ],
+        timeout=ConstantTimeout(period=timedelta(seconds=1)),
+        max_in_flight=1,
+    )
+
+    message = receiver.receive()
+    assert message.value == 'low-1'
+    assert receiver.polling_order() == [receiver.receivers[0]]
+
+    with pytest.raises(MessageReceiveTimeout):
+        receiver.receive()
+
+    receiver.reject(message)
+    receiver.stop()
+    assert not list(receiver)
+
+
+def test_busy_weighted_receiver_polls_heaviest(
+    priority_queue_urls: QueueURLs,
+):
+    """With weights, the busy receiver polls the queue of largest weight."""
+    high_url, low_url = priority_queue_urls
+
+    receiver = SQSMultiReceiver(
+        receivers=[
+            SQSReceiver[str](url=low_url),
+            SQSReceiver[str](url=high_url),
+        ],
+        weights=[1, 2],
+        max_in_flight=0,
+    )
+
+    for _attempt in range(50):
+        assert receiver.polling_order() == [receiver.receivers[1]]
+
+
+def test_stop_releases_rest_of_batch(priority_queue_urls: QueueURLs):
+    """Messages polled but not yielded before stop go back to the queue."""
+    high_url, low_url = priority_queue_urls
+    _send(high_url, 'first', 'second', 'third')
+
+    receiver = SQSMultiReceiver(
+        receivers=[
+            SQSReceiver[str](url=high_url),
+            SQSReceiver[str](url=low_url),
+        ],
+        timeout=ConstantTimeout(period=timedelta(seconds=1)),
+    )
+
+    yielded_messages = []
+    for message in receiver:
+        yielded_messages.append(message)
+        receiver.stop()
+
+    assert len(yielded_messages) == 1
+    assert receiver.in_flight_count == 1
+
+    receiver.acknowledge(yielded_messages[0])
+    released_values = {
+        message.value
+        for message in SQSReceiver[str](
+            url=high_url,
+            timeout=ConstantTimeout(period=timedelta(seconds=1)),
+        )
+    }
+    assert released_values == {'first', 'second', 'third'} - {
+        yielded_messages[0].value,
+    }
+
+
+def test_long_poll_uses_tuned_wait_time():
+    """The last queue is long polled for the time configured for it."""
+    client = LocalSQSClient()
+    high_url, low_url = (
+        str(client.create_queue(
+            QueueName=queue_name,
+            Attributes={'ReceiveMessageWaitTimeSeconds': '1'},
+        )['QueueUrl'])
+        for queue_name in ('high_tuned', 'low_tuned')
+    )
+    wait_times = []
+    receive_message = client.receive_message
+
+    def recorded_receive_message(**kwargs):  # noqa: WPS430
+        wait_times.append(kwargs['WaitTimeSeconds'])
+        return receive_message(**kwargs)
+
+    client.receive_message = recorded_receive_message
+
+    receiver = SQSMultiReceiver.from_urls(
+        [high_url, low_url],
+        receiver_class=SQSReceiver[str],
+        client=client,
+        auto_tuner=AutoTuner(),
+    )
+    receiver.timeout = ConstantTimeout(period=timedelta(seconds=3))
+    assert not list(receiver)
+
+    assert max(wait_times) == 1
+
+
+def test_iteration_timeout_restarts(priority_queue_urls: QueueURLs):
+    """Iteration only ends after `timeout` without any new message."""
+    high_url, low_url = priority_queue_urls
+    _send(high_url, 'first')
+
+    receiver = SQSMultiReceiver(
+        receivers=[
+            SQSReceiver[str](url=high_url),
+            SQSReceiver[str](url=low_url),
+        ],
+        timeout=ConstantTimeout(period=timedelta(seconds=2)),
+    )
+
+    values = []
+    for message in receiver:
+        values.append(message.value)
+        receiver.acknowledge(message)
+        if message.value == 'first':
+            time.sleep(2.5)
+            _send(low_url, 'second')
+
+    assert values == ['first', 'second']
+
+
+@pytest.mark.parametrize('weights', [[1], [1, 0], [1, -1]])
+def test_invalid_weights(priority_queue_urls: QueueURLs, weights):
+    """Weights must match receivers and be positive."""
+    with pytest.raises(ValueError):
+        SQSMultiReceiver(
+            receivers=[
+                SQSReceiver[str](url=url)
+                for url in priority_queue_urls
+            ],
+            weights=weights,
+        )
+
+
+def test_no_receivers():
+    """At least one receiver is required."""
+    with pytest.raises(ValueError):
+        SQSMultiReceiver(receivers=[])
@@ -0,0 +1,95 @@
+import time
+from datetime import timedelta
+
+from platonic.sqs.queue import (
+    LocalSQSClient,
+    QuarantinePolicy,
+    SQSReceiver,
+    SQSSender,
+)
+from platonic.timeout import ConstantTimeout
+from tests.test_queue.faults import FlakyOperation, client_error
+
+
+def test_poisonous_message_is_quarantined():
+    """Message received too many times goes to the dead letter queue."""
+    client = LocalSQSClient()
+    url = client.create_queue(QueueName='poisoned')['QueueUrl']
+    dead_letter_url = client.create_queue(QueueName='dead')['QueueUrl']
+
+    SQSSender[int](url=url, client=client).send_many([1, 2])
+
+    receiver = SQSReceiver[int](
+        url=url,
+        client=client,
+        timeout=ConstantTimeout(period=timedelta(seconds=1)),
+        quarantine=QuarantinePolicy(
+            dead_letter_sender=SQSSender[str](
+                url=dead_letter_url,
+                client=client,
+            ),
+            max_receive_count=2,
+        ),
+    )
+
+    for _attempt in range(2):
+        messages = receiver.poll(0)
+        receiver.acknowledge_many(
+            message for message in messages if message.value == 2
+        )
+        receiver.release_many(
+            message for message in messages if message.value == 1
+        )
+
+    assert not receiver.poll(0)
+    assert receiver.quarantined_count == 1
+    assert receiver.backlog().visible == 0
+
+    dead_letter_receiver = SQSReceiver[str](
+        url=dead_letter_url,
+        client=client,
+        timeout=ConstantTimeout(period=timedelta(seconds=1)),
+    )
+    assert [message.value for message in dead_letter_receiver] == ['1']
+
+
+def test_failed_quarantine_keeps_healthy_messages():
+    """If the dead letter queue fails, healthy messages are still received."""
+    client = LocalSQSClient()
+    url = client.create_queue(
+        QueueName='poisoned',
+        Attributes={'VisibilityTimeout': '1'},
+    )['QueueUrl']
+    dead_letter_url = client.create_queue(QueueName='dead')['QueueUrl']
+    sender = SQSSender[int](url=url, client=client)
+    dead_letter_sender = SQSSender[str](url=dead_letter_url, client=client)
+
+    receiver = SQSReceiver[int](
+        url=url,
+        client=client,
+        quarantine=QuarantinePolicy(
+            dead_letter_sender=dead_letter_sender,
+            max_receive_count=1,
+        ),
+    )
+
+    sender.send(1)
+    receiver.release_many(receiver.poll(0))
+
+    dead_letter_sender.client = LocalSQSClient()
+    dead_letter_sender.client.send_message_batch = FlakyOperation(
+        client_error('ServiceUnavailable', 'SendMessageBatch'),
+    )
+    sender.send(2)
+
+    healthy_messages = receiver.poll(0)
+    assert [message.value for message in healthy_messages] == [2]
+    assert receiver.quarantined_count == 0
+    assert receiver.in_flight_count == 1
+    receiver.acknowledge_many(healthy_messages)
+
+    dead_letter_sender.client = client
+    time.sleep(1.5)
+
+    assert not receiver.poll(0)
+    assert receiver.quarantined_count == 1
@@ -0,0 +1,111 @@
+import pytest
+from mypy_boto3_sqs import Client as SQSClient
+from platonic.queue import MessageTooLarge
+from platonic.sqs.queue import (
+    QueueResolver,
+    SQSQueueNameNotFound,
+    SQSReceiver,
+    SQSSender,
+)
+from tests.test_queue.robot import Command, CommandSender
+
+
+class CountingClient:
+    """Proxy to SQS client which counts the calls."""
+
+    def __init__(self, client: SQSClient) -> None:
+        """Wrap the client."""
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name: str):
+        """Record every method called."""
+        self.calls.append(name)
+        return getattr(self.client, name)
+
+
+@pytest.fixture()
+def small_queue_url(mock_sqs_client: SQSClient) -> str:
+    """Queue accepting only small messages."""
+    return mock_sqs_client.create_queue(
+        QueueName='small_messages',
+        Attributes={
+            'MaximumMessageSize': '1024',
+            'VisibilityTimeout': '45',
+        },
+    )['QueueUrl']
+
+
+def test_from_queue_name(small_queue_url: str, mock_sqs_client: SQSClient):
+    """Construct a sender by queue name."""
+    resolver = QueueResolver()
+    sender = SQSSender.from_queue_name(
+        'small_messages',
+        value_type=str,
+        client=mock_sqs_client,
+        resolver=resolver,
+    )
+
+    assert sender.value_type is str
+    assert sender.resolver is resolver
+
+    assert sender.url == small_queue_url
+    assert sender.max_message_size == 1024
+    assert sender.queue_attributes.visibility_timeout == 45
+    assert not sender.queue_attributes.is_fifo
+
+    with pytest.raises(MessageTooLarge):
+        sender.send_many(['x' * 2000])
+
+
+def test_resolver_cache(small_queue_url: str, mock_sqs_client: SQSClient):
+    """Queue URL and attributes are requested only once."""
+    client = CountingClient(mock_sqs_client)
+    resolver = QueueResolver()
+
+    for _attempt in range(3):
+        receiver = SQSReceiver.from_queue_name(
+            'small_messages',
+            value_type=str,
+            client=client,
+            resolver=resolver,
+        )
+        assert receiver.url == small_queue_url
+
+    assert client.calls.count('get_queue_url') == 1
+    assert client.calls.count('get_queue_attributes') == 1
+
+    resolver.clear()
+    resolver.url(client, 'small_messages')  # type: ignore
+    assert client.calls.count('get_queue_url') == 2
+
+
+def test_queue_name_not_found(mock_sqs_client: SQSClient):
+    """Non existing queue name causes an exception."""
+    with pytest.raises(SQSQueueNameNotFound):
+        SQSSender.from_queue_name(
+            'non_existing_queue',
+            value_type=str,
+            account_id='123456789012',
+            client=mock_sqs_client,
+        )
+
+
+def test_from_queue_name_without_value_type(mock_sqs_client: SQSClient):
+    """Generic class cannot be constructed without the type of messages."""
+    with pytest.raises(TypeError, match='value_type'):
+        SQSSender.from_queue_name('small_messages', client=mock_sqs_client)
+
+
+def test_from_queue_name_subclass(
+    small_queue_url: str,
+    mock_sqs_client: SQSClient,
+):
+    """Parametrized subclass knows the type of its messages."""
+    sender = CommandSender.from_queue_name(
+        'small_messages',
+        client=mock_sqs_client,
+    )
+
+    assert sender.url == small_queue_url
+    assert sender.value_type is Command
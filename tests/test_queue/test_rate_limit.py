@@ -0,0 +1,128 @@
+from datetime import timedelta
+from functools import partial
+
+import pytest
+from botocore.exceptions import ClientError
+from contexttimer import Timer
+from mypy_boto3_sqs import Client as SQSClient
+from platonic.sqs.queue import (
+    RateLimiter,
+    RetryBudget,
+    RetryPolicy,
+    SQSReceiver,
+    SQSSender,
+)
+from tests.test_queue.faults import FlakyOperation, client_error
+
+
+def test_throttled_call_is_repeated():
+    """After throttling, the rate decreases and the call is repeated."""
+    limiter = RateLimiter(rate=100, min_rate=10)
+    policy = RetryPolicy(base_delay=timedelta(0), budget=RetryBudget())
+    operation = FlakyOperation(
+        client_error('RequestThrottled'),
+        client_error('ThrottlingException'),
+    )
+
+    assert policy.call(
+        partial(limiter.call, partial(operation, foo='bar')),
+    ) == {'foo': 'bar'}
+    assert operation.calls == 3
+    assert limiter.rate < 26
+
+
+def test_rate_never_below_min_rate():
+    """Multiplicative decrease stops at min_rate."""
+    limiter = RateLimiter(rate=4, min_rate=3)
+    limiter.on_throttle()
+    assert limiter.rate == 3
+
+
+def test_additive_increase():
+    """Success increases the rate, up to max_rate."""
+    limiter = RateLimiter(rate=10, max_rate=11, additive_increase=5)
+
+    limiter.on_success()
+    assert limiter.rate == 10.5
+
+    limiter.on_success()
+    limiter.on_success()
+    assert limiter.rate == 11
+
+
+def test_throttling_error_is_raised():
+    """Limiter slows down on throttling, and leaves retries to others."""
+    limiter = RateLimiter(rate=100)
+    operation = FlakyOperation(client_error('Throttling'))
+
+    with pytest.raises(ClientError):
+        limiter.call(operation)
+
+    assert operation.calls == 1
+    assert limiter.rate == 50
+
+
+def test_throttled_too_many_times(mock_sqs_client: SQSClient):
+    """Throttled call is attempted only as many times as policy allows."""
+    sqs_queue_url = mock_sqs_client.create_queue(
+        QueueName='always_throttled',
+    )['QueueUrl']
+    operation = FlakyOperation(*[client_error('Throttling')] * 10)
+
+    sender = SQSSender[str](
+        url=sqs_queue_url,
+        rate_limiter=RateLimiter(),
+        retry_policy=RetryPolicy(
+            max_attempts=3,
+            base_delay=timedelta(0),
+            budget=RetryBudget(),
+        ),
+    )
+    sender.client.send_message = operation  # type: ignore
+
+    with pytest.raises(ClientError):
+        sender.send('hello')
+
+    assert operation.calls == 3
+
+
+def test_other_errors_are_raised():
+    """Errors other than throttling are raised immediately."""
+    limiter = RateLimiter()
+    operation = FlakyOperation(client_error('InvalidParameterValue'))
+
+    with pytest.raises(ClientError):
+        limiter.call(operation)
+
+    assert operation.calls == 1
+
+
+def test_rate_is_limited():
+    """Calls above the burst size are spread in time."""
+    limiter = RateLimiter(rate=10, burst=1, additive_increase=0)
+
+    with Timer() as timer:
+        for _call in range(5):
+            limiter.acquire()
+
+        elapsed_time = timer.elapsed
+
+    assert elapsed_time > 0.35
+
+
+def test_shared_limiter(mock_sqs_client: SQSClient):
+    """Sender and receiver share one rate limiter."""
+    sqs_queue_url = mock_sqs_client.create_queue(
+        QueueName='rate_limited',
+    )['QueueUrl']
+    limiter = RateLimiter()
+
+    sender = SQSSender[str](url=sqs_queue_url, rate_limiter=limiter)
+    receiver = SQSReceiver[str](url=sqs_queue_url, rate_limiter=limiter)
+
+    sender.send('hello')
+    message = receiver.receive()
+    receiver.acknowledge(message)
+
+    assert message.value == 'hello'
+    assert limiter.rate > 100
@@ -0,0 +1,105 @@
+from datetime import timedelta
+
+import contexttimer
+from mypy_boto3_sqs import Client as SQSClient
+from platonic.sqs.queue import SQSReceiver, SQSSender
+
+
+def test_receive_many(mock_sqs_client: SQSClient):
+    """Messages are collected across multiple ReceiveMessage calls."""
+    sqs_queue_url = mock_sqs_client.create_queue(
+        QueueName='receive_many',
+    )['QueueUrl']
+
+    sender = SQSSender[str](url=sqs_queue_url)
+    receiver = SQSReceiver[str](url=sqs_queue_url)
+
+    sent_values = [f'value-{number}' for number in range(25)]
+    sender.send_many(sent_values)
+
+    batch = receiver.receive_many(
+        max_messages=25,
+        max_latency=timedelta(seconds=5),
+    )
+
+    assert len(batch) == 25
+    assert sorted(batch.values) == sorted(sent_values)
+    assert [message.value for message in batch] == batch.values
+
+    batch.acknowledge()
+
+    assert not receiver.receive_many(
+        max_messages=10,
+        max_latency=timedelta(seconds=1),
+    )
+
+
+def test_receive_many_max_messages(mock_sqs_client: SQSClient):
+    """We never receive more messages than requested."""
+    sqs_queue_url = mock_sqs_client.create_queue(
+        QueueName='receive_many_max_messages',
+    )['QueueUrl']
+
+    sender = SQSSender[str](url=sqs_queue_url)
+    receiver = SQSReceiver[str](url=sqs_queue_url)
+
+    sender.send_many(['a', 'b', 'c', 'd', 'e'])
+
+    batch = receiver.receive_many(
+        max_messages=3,
+        max_latency=timedelta(seconds=5),
+    )
+
+    assert len(batch) == 3
+    batch.acknowledge()
+
+
+def test_receive_many_max_latency(mock_sqs_client: SQSClient):
+    """On an empty queue, we wait no longer than max_latency."""
+    sqs_queue_url = mock_sqs_client.create_queue(
+        QueueName='receive_many_max_latency',
+    )['QueueUrl']
+
+    receiver = SQSReceiver[str](url=sqs_queue_url)
+
+    with contexttimer.Timer() as timer:
+        batch = receiver.receive_many(
+            max_messages=100,
+            max_latency=timedelta(seconds=2),
+        )
+        elapsed_time = timer.elapsed
+
+    assert not batch
+    assert elapsed_time < 3
+
+
+def test_split_message_count(sqs_queue_url: str):
+    """Requested number of messages is split among receive calls."""
+    receiver = SQSReceiver[str](url=sqs_queue_url, max_concurrent_receives=2)
+
+    assert receiver._split_message_count(25) == [10, 10]
+    assert receiver._split_message_count(13) == [10, 3]
+    assert receiver._split_message_count(4) == [4]
+
+
+def test_receive_many_short_latency(mock_sqs_client: SQSClient):
+    """With less than a second of latency budget, we poll only once."""
+    sqs_queue_url = mock_sqs_client.create_queue(
+        QueueName='receive_many_short_latency',
+    )['QueueUrl']
+
+    receiver = SQSReceiver[str](url=sqs_queue_url)
+    polled_counts = []
+    poll = receiver.poll
+
+    def counting_poll(*args, **kwargs):
+        polled_counts.append(1)
+        return poll(*args, **kwargs)
+
+    receiver.poll = counting_poll  # type: ignore
+
+    assert not receiver.receive_many(
+        max_messages=10,
+        max_latency=timedelta(milliseconds=500),
+    )
+    assert len(polled_counts) == 1
@@ -0,0 +1,170 @@
+import json
+from datetime import timedelta
+
+import pytest
+from platonic.sqs.queue import (
+    LocalSQSClient,
+    RecordingClient,
+    SQSReceiver,
+    SQSSender,
+)
+from platonic.sqs.queue.sqs import MAX_MESSAGE_SIZE
+from platonic.sqs.replay import main, read_trace, replay
+from platonic.timeout import ConstantTimeout
+
+
+def _record_traffic(path: str, redact_bodies: bool = True) -> None:
+    local_client = LocalSQSClient()
+    url = local_client.create_queue(QueueName='recorded')['QueueUrl']
+
+    with RecordingClient(
+        client=local_client,
+        path=path,
+        redact_bodies=redact_bodies,
+    ) as client:
+        SQSSender[str](url=url, client=client).send_many(['a', 'bb', 'ccc'])
+
+        receiver = SQSReceiver[str](
+            url=url,
+            client=client,
+            timeout=ConstantTimeout(period=timedelta(seconds=1)),
+        )
+        receiver.acknowledge_many(list(receiver))
+
+
+def test_recording(tmp_path):
+    """Every call is recorded, with sizes but without bodies."""
+    path = str(tmp_path / 'trace.jsonl')
+    _record_traffic(path)
+
+    records = list(read_trace(path))
+    operations = [record['op'] for record in records]
+
+    assert operations[0] == 'send_message_batch'
+    assert records[0]['sizes'] == [1, 2, 3]
+    assert 'bodies' not in records[0]
+    assert 'receive_message' in operations
+    assert operations[-1] == 'delete_message_batch'
+    assert records[-1]['count'] == 3
+    assert sum(record.get('received', 0) for record in records) == 3
+    assert all(record['ms'] >= 0 for record in records)
+
+
+def test_bodies(tmp_path):
+    """Bodies are recorded on request."""
+    path = str(tmp_path / 'trace.jsonl')
+    _record_traffic(path, redact_bodies=False)
+
+    assert next(read_trace(path))['bodies'] == ['a', 'bb', 'ccc']
+
+
+def test_replay(tmp_path, capsys):
+    """Replay reproduces the traffic and reports latencies."""
+    path = str(tmp_path / 'trace.jsonl')
+    _record_traffic(path)
+
+    report = replay(list(read_trace(path)), speed=100)
+
+    assert report.messages_sent == 3
+    assert report.messages_received == 3
+    assert not report.errors
+    assert set(report.replayed_latency_ms) == set(report.recorded_latency_ms)
+
+    main([path, '--speed', '100'])
+    assert json.loads(capsys.readouterr().out)['calls'] == report.calls
+
+
+def test_replay_single_sends(tmp_path):
+    """Single sends are replayed as single sends."""
+    path = str(tmp_path / 'trace.jsonl')
+    local_client = LocalSQSClient()
+    url = local_client.create_queue(QueueName='recorded')['QueueUrl']
+    with RecordingClient(client=local_client, path=path) as client:
+        SQSSender[str](url=url, client=client).send('single')
+
+    replay_client = LocalSQSClient()
+    report = replay(list(read_trace(path)), client=replay_client)
+
+    assert report.messages_sent == 1
+    assert replay_client.calls['send_message'] == 1
+    assert not replay_client.calls['send_message_batch']
+
+
+def test_recording_errors_and_visibility(tmp_path):
+    """Failed calls are recorded with error codes, timeouts are recorded."""
+    path = str(tmp_path / 'trace.jsonl')
+    local_client = LocalSQSClient()
+    url = local_client.create_queue(QueueName='recorded')['QueueUrl']
+
+    with RecordingClient(
+        client=local_client,
+        path=path,
+        redact_bodies=False,
+    ) as client:
+        assert client.exceptions is local_client.exceptions
+        SQSSender[str](url=url, client=client).send('single')
+
+        with pytest.raises(local_client.exceptions.ReceiptHandleIsInvalid):
+            client.change_message_visibility(
+                QueueUrl=url,
+                ReceiptHandle='invalid',
+                VisibilityTimeout=5,
+            )
+
+    sent_record, failed_record = read_trace(path)
+
+    assert sent_record['bodies'] == ['single']
+    assert failed_record['op'] == 'change_message_visibility'
+    assert failed_record['count'] == 1
+    assert failed_record['visibility'] == 5
+    assert failed_record['error'] == 'ReceiptHandleIsInvalid'
+
+
+def test_calls_after_close_are_not_recorded(tmp_path):
+    """Closed recording client still passes calls through."""
+    path = str(tmp_path / 'trace.jsonl')
+    local_client = LocalSQSClient()
+    url = local_client.create_queue(QueueName='recorded')['QueueUrl']
+
+    client = RecordingClient(client=local_client, path=path)
+    client.close()
+    SQSSender[str](url=url, client=client).send('late')
+
+    assert local_client.calls['send_message'] == 1
+    assert not list(read_trace(path))
+
+    assert not hasattr(client, '_unknown')
+
+
+def test_replay_errors_and_other_operations(tmp_path):
+    """Failed calls are counted, visibility changes and backlog replayed."""
+    records = [
+        {'op': 'send_message_batch', 'at': 0, 'ms': 1, 'sizes': [1, 1]},
+        {'op': 'receive_message', 'at': 0.1, 'ms': 1, 'max': 10, 'wait': 0},
+        {
+            'op': 'change_message_visibility_batch',
+            'at': 0.2,
+            'ms': 1,
+            'count': 2,
+            'visibility': 0,
+        },
+        {'op': 'get_queue_attributes', 'at': 0.3, 'ms': 1, 'count': 0},
+        {
+            'op': 'send_message',
+            'at': 0.4,
+            'ms': 1,
+            'sizes': [MAX_MESSAGE_SIZE + 1],
+        },
+        {'op': 'list_queues', 'at': 0.5, 'ms': 1},
+    ]
+    path = tmp_path / 'trace.jsonl'
+    path.write_text('\n\n'.join(json.dumps(record) for record in records))
+    replay_client = LocalSQSClient()
+
+    report = replay(list(read_trace(str(path))), speed=10, client=replay_client)
+
+    assert report.messages_sent == 2
+    assert report.messages_received == 2
+    assert report.errors == {'MessageTooLarge': 1}
+    assert replay_client.calls['change_message_visibility_batch'] == 1
+    assert replay_client.calls['get_queue_attributes'] >= 1
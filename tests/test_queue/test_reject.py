@@ -0,0 +1,131 @@
+from datetime import timedelta
+
+import pytest
+from mypy_boto3_sqs import Client as SQSClient
+from platonic.queue import MessageDoesNotExist
+from platonic.sqs.queue import (
+    ExponentialRedeliveryDelay,
+    SQSMessage,
+    SQSReceiver,
+    SQSSender,
+)
+from platonic.timeout import ConstantTimeout
+
+
+@pytest.fixture()
+def reject_queue_url(mock_sqs_client: SQSClient) -> str:
+    """Queue with a long visibility timeout."""
+    queue_url = mock_sqs_client.create_queue(
+        QueueName='reject',
+        Attributes={
+            'VisibilityTimeout': '60',
+        },
+    )['QueueUrl']
+
+    mock_sqs_client.purge_queue(QueueUrl=queue_url)
+    return queue_url
+
+
+@pytest.mark.parametrize(('receive_count', 'expected_delay'), [
+    (None, timedelta(seconds=1)),
+    (1, timedelta(seconds=1)),
+    (2, timedelta(seconds=2)),
+    (5, timedelta(seconds=16)),
+    (100, timedelta(hours=12)),
+])
+def test_exponential_redelivery_delay(
+    receive_count: int,
+    expected_delay: timedelta,
+):
+    """Delay doubles with every receive."""
+    message = SQSMessage[str](
+        value='foo',
+        receipt_handle='bar',
+        receive_count=receive_count,
+    )
+
+    assert ExponentialRedeliveryDelay()(message) == expected_delay
+
+
+def test_failed_handler_rejects(reject_queue_url: str):
+    """Rejected message is redelivered quickly."""
+    SQSSender[str](url=reject_queue_url).send('fragile')
+
+    receiver = SQSReceiver[str](
+        url=reject_queue_url,
+        timeout=ConstantTimeout(period=timedelta(seconds=5)),
+    )
+
+    message = receiver.receive()
+    assert message.receive_count == 1
+
+    with pytest.raises(ValueError, match='Oops'):
+        with receiver.acknowledgement(message):
+            raise ValueError('Oops')
+
+    redelivered_message = receiver.receive()
+    assert redelivered_message.value == 'fragile'
+    assert redelivered_message.receive_count == 2
+
+    receiver.acknowledge(redelivered_message)
+
+
+def test_reject_many(reject_queue_url: str):
+    """Rejected messages are available again after the given delay."""
+    SQSSender[str](url=reject_queue_url).send_many(['a', 'b', 'c'])
+
+    receiver = SQSReceiver[str](
+        url=reject_queue_url,
+        timeout=ConstantTimeout(period=timedelta(seconds=2)),
+    )
+
+    messages = list(receiver)
+    assert len(messages) == 3
+
+    receiver.reject_many(messages, delay=timedelta(0))
+    assert receiver.in_flight_count == 0
+
+    redelivered_messages = list(receiver)
+    assert sorted(message.value for message in redelivered_messages) == [
+        'a', 'b', 'c',
+    ]
+
+    receiver.acknowledge_many(redelivered_messages)
+
+
+def test_reject_fake_message(reject_queue_url: str):
+    """Rejecting a message that does not exist causes an exception."""
+    receiver = SQSReceiver[str](url=reject_queue_url)
+
+    with pytest.raises(MessageDoesNotExist):
+        receiver.reject(SQSMessage[str](value='foo', receipt_handle='abc'))
+
+
+def test_reject_negative_delay(reject_queue_url: str):
+    """Redelivery delay cannot be negative."""
+    receiver = SQSReceiver[str](url=reject_queue_url)
+    message = SQSMessage[str](value='foo', receipt_handle='abc')
+
+    with pytest.raises(ValueError, match='negative'):
+        receiver.reject(message, delay=timedelta(seconds=-1))
+
+    with pytest.raises(ValueError, match='negative'):
+        receiver.reject_many([message], delay=timedelta(seconds=-1))
+
+    with pytest.raises(ValueError, match='negative'):
+        ExponentialRedeliveryDelay(base=timedelta(seconds=-1))
+
+
+def test_failed_reject_does_not_mask_handler_error(
+    reject_queue_url: str,
+    caplog: pytest.LogCaptureFixture,
+):
+    """If reject fails, the handler exception is raised nevertheless."""
+    receiver = SQSReceiver[str](url=reject_queue_url)
+    message = SQSMessage[str](value='foo', receipt_handle='abc')
+
+    with pytest.raises(ValueError, match='Oops'):
+        with receiver.acknowledgement(message):
+            raise ValueError('Oops')
+
+    assert 'Failed to reject SQS message.' in caplog.text
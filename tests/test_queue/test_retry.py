@@ -0,0 +1,236 @@
+from datetime import timedelta
+from functools import partial
+
+import pytest
+from botocore.exceptions import ClientError, EndpointConnectionError
+from platonic.sqs.queue import (
+    CircuitBreaker,
+    RetryBudget,
+    RetryPolicy,
+    SQSBatchEntriesFailed,
+    SQSCircuitOpen,
+    SQSMessage,
+    SQSReceiver,
+)
+from platonic.sqs.queue.retry import retry_budget
+from tests.test_queue.faults import FlakyOperation, client_error
+
+NO_DELAY = timedelta(0)
+
+
+def test_transient_errors_are_retried():
+    """Transient failures are retried until success."""
+    policy = RetryPolicy(base_delay=NO_DELAY, budget=RetryBudget())
+    operation = FlakyOperation(
+        client_error('ServiceUnavailable'),
+        EndpointConnectionError(endpoint_url='https://sqs'),
+    )
+
+    assert policy.call(partial(operation, foo='bar')) == {'foo': 'bar'}
+    assert operation.calls == 3
+
+
+def test_attempts_exhausted():
+    """The last failure is raised when attempts are exhausted."""
+    policy = RetryPolicy(
+        max_attempts=2,
+        base_delay=NO_DELAY,
+        budget=RetryBudget(),
+    )
+    operation = FlakyOperation(
+        client_error('InternalError'),
+        client_error('InternalError'),
+    )
+
+    with pytest.raises(ClientError):
+        policy.call(operation)
+
+    assert operation.calls == 2
+
+
+def test_permanent_errors_are_not_retried():
+    """Errors which are not transient are raised immediately."""
+    policy = RetryPolicy()
+    operation = FlakyOperation(client_error('InvalidParameterValue'))
+
+    with pytest.raises(ClientError):
+        policy.call(operation)
+
+    assert operation.calls == 1
+
+
+def test_retry_budget():
+    """Empty budget prevents retries."""
+    policy = RetryPolicy(
+        base_delay=NO_DELAY,
+        budget=RetryBudget(max_tokens=1),
+    )
+
+    with pytest.raises(ClientError):
+        policy.call(FlakyOperation(
+            client_error('InternalError'),
+            client_error('InternalError'),
+        ))
+
+
+def test_without_budget():
+    """Without a budget, retries are limited by attempts only."""
+    policy = RetryPolicy(base_delay=NO_DELAY, budget=None)
+    operation = FlakyOperation(
+        client_error('InternalError'),
+        client_error('InternalError'),
+    )
+
+    assert policy.call(operation) == {}
+    assert operation.calls == 3
+
+
+def test_retry_budget_is_process_wide():
+    """By default, retry policies share one budget."""
+    assert RetryPolicy().budget is RetryPolicy().budget is retry_budget
+
+
+def test_backoff_is_bounded():
+    """Backoff never exceeds max_delay."""
+    policy = RetryPolicy(max_delay=timedelta(seconds=1))
+
+    assert 0 <= policy.backoff_seconds(100) <= 1
+
+
+def test_circuit_breaker():
+    """After a series of failures, calls are not made at all."""
+    policy = RetryPolicy(
+        max_attempts=1,
+        circuit_breaker=CircuitBreaker(
+            failure_threshold=2,
+            reset_timeout=timedelta(minutes=1),
+        ),
+    )
+    operation = FlakyOperation(
+        client_error('ServiceUnavailable'),
+        client_error('ServiceUnavailable'),
+    )
+
+    for _attempt in range(2):
+        with pytest.raises(ClientError):
+            policy.call(operation)
+
+    with pytest.raises(SQSCircuitOpen):
+        policy.call(operation)
+
+    assert operation.calls == 2
+
+
+def test_circuit_breaker_reset():
+    """After reset timeout, the circuit closes on success."""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=NO_DELAY)
+    policy = RetryPolicy(max_attempts=1, circuit_breaker=breaker)
+
+    with pytest.raises(ClientError):
+        policy.call(FlakyOperation(client_error('ServiceUnavailable')))
+
+    assert policy.call(FlakyOperation()) == {}
+
+
+class PartiallyFailingBatch:
+    """Batch operation which fails for some entries once."""
+
+    def __init__(self, sender_fault: bool) -> None:
+        """Configure the failure."""
+        self.sender_fault = sender_fault
+        self.calls = []
+
+    def __call__(self, Entries):  # noqa: N803
+        """Fail the first entry on the first call."""
+        self.calls.append([entry['Id'] for entry in Entries])
+        if len(self.calls) > 1:
+            return {'Successful': Entries}
+
+        return {
+            'Successful': Entries[1:],
+            'Failed': [{
+                'Id': Entries[0]['Id'],
+                'SenderFault': self.sender_fault,
+                'Code': 'InternalError',
+            }],
+        }
+
+
+def test_failed_entries_are_retried():
+    """Entries failed on AWS side are resubmitted."""
+    policy = RetryPolicy(base_delay=NO_DELAY, budget=RetryBudget())
+    operation = PartiallyFailingBatch(sender_fault=False)
+
+    succeeded, failures = policy.call_batch(
+        operation,
+        [{'Id': '0'}, {'Id': '1'}],
+    )
+
+    assert operation.calls == [['0', '1'], ['0']]
+    assert succeeded == [{'Id': '1'}, {'Id': '0'}]
+    assert not failures
+
+
+def test_sender_fault_is_not_retried():
+    """Entries failed because of our own fault are not retried."""
+    policy = RetryPolicy(base_delay=NO_DELAY)
+    operation = PartiallyFailingBatch(sender_fault=True)
+
+    succeeded, failures = policy.call_batch(
+        operation,
+        [{'Id': '0'}, {'Id': '1'}],
+    )
+
+    assert operation.calls == [['0', '1']]
+    assert succeeded == [{'Id': '1'}]
+    assert [failure['Id'] for failure in failures] == ['0']
+
+
+class FailingDeleteClient:
+    """SQS client which cannot delete anything."""
+
+    def delete_message_batch(self, QueueUrl, Entries):  # noqa: N803
+        """Report every entry as failed."""
+        return {'Failed': [
+            {'Id': entry['Id'], 'SenderFault': True, 'Code': 'Invalid'}
+            for entry in Entries
+        ]}
+
+
+def test_acknowledge_many_failure():
+    """Failures of acknowledge_many() are not ignored anymore."""
+    receiver = SQSReceiver[str](url='...', client=FailingDeleteClient())
+
+    with pytest.raises(SQSBatchEntriesFailed) as error_info:
+        receiver.acknowledge_many([
+            SQSMessage[str](value='foo', receipt_handle='abc'),
+        ])
+
+    assert error_info.value.failures_count == 1
+    assert 'First failure: Invalid: ' in str(error_info.value)
+
+
+def test_batch_entries_failed_message():
+    """Error message describes the first failure, if any."""
+    error = SQSBatchEntriesFailed(
+        operation_name='DeleteMessageBatch',
+        queue_url='https://sqs.local/0/queue',
+        failures=[
+            {
+                'Id': '0',
+                'SenderFault': True,
+                'Code': 'ReceiptHandleIsInvalid',
+                'Message': 'Expired.',
+            },
+            {'Id': '1', 'SenderFault': True, 'Code': 'Invalid'},
+        ],
+    )
+    assert 'failed for 2 entries' in str(error)
+    assert 'First failure: ReceiptHandleIsInvalid: Expired.' in str(error)
+
+    no_failures = SQSBatchEntriesFailed(
+        operation_name='DeleteMessageBatch',
+        queue_url='https://sqs.local/0/queue',
+        failures=[],
+    )
+    assert 'First failure: unknown' in str(no_failures)
@@ -4,6 +4,7 @@ import pytest
 from botocore.exceptions import ClientError
 from mypy_boto3_sqs import Client as SQSClient
 from platonic.queue import MessageReceiveTimeout, QueueDoesNotExist
+from platonic.sqs.queue import RetryBudget, RetryPolicy
 from platonic.timeout import ConstantTimeout
 from tests.test_queue.robot import Command, CommandSender, ReceiverAndSender
 
@@ -11,7 +12,7 @@ from tests.test_queue.robot import Command, CommandSender, ReceiverAndSender
 class CustomBatchIdSender(CommandSender):
     """Send SQS messages with a constant id."""
 
-    def _generate_batch_entry_id(self) -> str:
+    def _generate_batch_entry_id(self, index: int) -> str:
         """Generate a custom, and constant, id."""
         return 'foo'
 
@@ -49,7 +50,82 @@ def test_send_empty_list(receiver_and_sender: ReceiverAndSender):
     """Empty list does not trigger boto3 exception because nothing is sent."""
     receiver, sender = receiver_and_sender
 
-    sender.send_many([])
+    assert sender.send_many([]) == []
+
+
+def test_send_many_results(mock_sqs_client: SQSClient):
+    """Every value sent gets its message ID, in the original order."""
+    sqs_queue_url = mock_sqs_client.create_queue(
+        QueueName='send_many_results',
+    )['QueueUrl']
+
+    sender = CommandSender(url=sqs_queue_url)
+    sent_commands = [Command.JUMP, Command.LEFT] * 12
+
+    messages = sender.send_many(sent_commands)
+
+    assert [message.value for message in messages] == sent_commands
+    assert len({message.message_id for message in messages}) == 24
+    assert all(message.md5_of_body for message in messages)
+
+
+def test_iter_send_many_is_lazy(mock_sqs_client: SQSClient):
+    """Results are streamed batch by batch."""
+    sqs_queue_url = mock_sqs_client.create_queue(
+        QueueName='iter_send_many',
+    )['QueueUrl']
+
+    sender = CommandSender(url=sqs_queue_url)
+    results = sender.iter_send_many(iter([Command.RIGHT] * 15))
+
+    assert next(results).value == Command.RIGHT
+    assert len(list(results)) == 14
+
+
+class FlakyBatchClient:
+    """SQS client failing the first entry of the first batch."""
+
+    def __init__(self) -> None:
+        """Start counting calls."""
+        self.batches = []
+
+    def send_message_batch(self, QueueUrl, Entries):  # noqa: N803
+        """Fail the first entry once."""
+        self.batches.append([entry['Id'] for entry in Entries])
+
+        failed_entries = Entries[:1] if len(self.batches) == 1 else []
+        return {
+            'Successful': [
+                {
+                    'Id': entry['Id'],
+                    'MessageId': f'message-{entry["MessageBody"]}',
+                    'MD5OfMessageBody': 'md5',
+                }
+                for entry in Entries
+                if entry not in failed_entries
+            ],
+            'Failed': [
+                {'Id': entry['Id'], 'SenderFault': False, 'Code': 'Internal'}
+                for entry in failed_entries
+            ],
+        }
+
+
+def test_failed_entries_are_resent():
+    """Entries failed on AWS side are resent in a fresh batch."""
+    client = FlakyBatchClient()
+    sender = CommandSender(
+        url='...',
+        client=client,
+        retry_policy=RetryPolicy(budget=RetryBudget()),
+    )
+
+    messages = sender.send_many([Command.JUMP, Command.LEFT, Command.RIGHT])
+
+    assert client.batches == [['0', '1', '2'], ['0']]
+    assert [message.message_id for message in messages] == [
+        'message-jump', 'message-left', 'message-right',
+    ]
 
 
 def test_invalid_batch_entry_id(mock_sqs_client: SQSClient):
@@ -0,0 +1,65 @@
+import json
+from decimal import Decimal
+
+from platonic.sqs.queue import LocalSQSClient, SerializationCache
+from tests.test_queue.robot import Command, CommandSender
+
+
+def test_repeated_values_are_serialized_once():
+    """Sender serializes every distinct value only once."""
+    client = LocalSQSClient()
+    url = client.create_queue(QueueName='cached')['QueueUrl']
+    cache = SerializationCache()
+    sender = CommandSender(url=url, client=client, serialization_cache=cache)
+
+    sender.send(Command.JUMP)
+    sender.send_many([Command.JUMP, Command.LEFT, Command.JUMP])
+
+    assert (cache.hits, cache.misses, len(cache)) == (2, 2, 2)
+    assert cache.hit_ratio == 0.5
+
+    response = client.receive_message(QueueUrl=url, MaxNumberOfMessages=10)
+    assert sorted(
+        message['Body'] for message in response['Messages']
+    ) == ['jump', 'jump', 'jump', 'left']
+
+
+def test_least_recently_used_value_is_evicted():
+    """Cache keeps at most max_size values."""
+    cache = SerializationCache(max_size=2)
+
+    for instance in (1, 2, 1, 3, 1, 2):
+        cache.serialize(instance, str)
+
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (2, 4)
+
+
+def test_unhashable_values_bypass_cache():
+    """Values which cannot be hashed are serialized every time."""
+    cache = SerializationCache()
+
+    assert cache.serialize([1, 2], json.dumps) == '[1, 2]'
+    assert cache.serialize([1, 2], json.dumps) == '[1, 2]'
+
+    assert (cache.hits, cache.misses, cache.bypassed) == (0, 0, 2)
+    assert not cache
+
+
+def test_equal_values_do_not_collide():
+    """Equal values which serialize differently are not mixed up."""
+    cache = SerializationCache()
+
+    assert cache.serialize((1,), json.dumps) == '[1]'
+    assert cache.serialize((True,), json.dumps) == '[true]'
+    assert cache.serialize(frozenset([1]), repr) == 'frozenset({1})'
+    assert cache.serialize(frozenset([True]), repr) == 'frozenset({True})'
+
+    assert cache.serialize(Decimal('1.0'), str) == '1.0'
+    assert cache.serialize(Decimal('1'), str) == '1'
+    assert cache.serialize(0.0, str) == '0.0'
+    assert cache.serialize(-0.0, str) == '-0.0'
+    assert cache.serialize((0.0,), str) == '(0.0,)'
+    assert cache.serialize((-0.0,), str) == '(-0.0,)'
+
+    assert (cache.hits, cache.misses, cache.bypassed) == (0, 4, 6)
@@ -0,0 +1,163 @@
+from datetime import timedelta
+from typing import List
+
+import pytest
+from mypy_boto3_sqs import Client as SQSClient
+from platonic.sqs.queue import (
+    InMemoryTracer,
+    LocalSQSClient,
+    SpanContext,
+    SQSMultiReceiver,
+    SQSReceiver,
+    SQSSender,
+    SQSShardedSender,
+)
+from platonic.timeout import ConstantTimeout
+
+
+@pytest.fixture()
+def shard_urls(mock_sqs_client: SQSClient) -> List[str]:
+    """Three empty shard queues."""
+    urls = [
+        mock_sqs_client.create_queue(QueueName=f'shard_{number}')['QueueUrl']
+        for number in range(3)
+    ]
+
+    for url in urls:
+        mock_sqs_client.purge_queue(QueueUrl=url)
+
+    return urls
+
+
+def _values_in(url: str) -> List[str]:
+    receiver = SQSReceiver[str](
+        url=url,
+        timeout=ConstantTimeout(period=timedelta(seconds=1)),
+    )
+    return [message.value for message in receiver]
+
+
+def test_round_robin(shard_urls: List[str], mock_sqs_client: SQSClient):
+    """Without a key, messages are spread evenly."""
+    sender = SQSShardedSender.from_urls(
+        shard_urls,
+        sender_class=SQSSender[str],
+        client=mock_sqs_client,
+    )
+    assert sender.urls == shard_urls
+
+    messages = sender.send_many([str(number) for number in range(9)])
+
+    assert [message.value for message in messages] == [
+        str(number) for number in range(9)
+    ]
+    assert [len(_values_in(url)) for url in shard_urls] == [3, 3, 3]
+
+
+def test_key(shard_urls: List[str]):
+    """Values with the same key go to the same shard."""
+    sender = SQSShardedSender(
+        senders=[SQSSender[str](url=url) for url in shard_urls],
+        key=lambda value: value.split(':')[0],
+    )
+
+    sender.send('alice:1')
+    sender.send_many(['bob:1', 'alice:2', 'bob:2', 'alice:3'])
+
+    shards = [_values_in(url) for url in shard_urls]
+    alice_shard = shards[sender.shard_of('alice:0')]
+    assert [value for value in alice_shard if value.startswith('alice')] == [
+        'alice:1', 'alice:2', 'alice:3',
+    ]
+    assert sum(map(len, shards)) == 5
+
+
+def test_bytes_key(shard_urls: List[str]):
+    """Bytes keys are hashed as is, like their text counterparts."""
+    senders = [SQSSender[str](url=url) for url in shard_urls]
+    by_text = SQSShardedSender(senders=senders, key=lambda value: value)
+    by_bytes = SQSShardedSender(
+        senders=senders,
+        key=lambda value: value.encode('utf-8'),
+    )
+
+    for value in ('alice', 'bob', 'carol'):
+        assert by_bytes.shard_of(value) == by_text.shard_of(value)
+
+
+def test_sharded_consumer(shard_urls: List[str]):
+    """Multi receiver reads every shard."""
+    sender = SQSShardedSender(
+        senders=[SQSSender[str](url=url) for url in shard_urls],
+    )
+    sender.send_many(['a', 'b', 'c', 'd'])
+    sender.send_many([])
+
+    receiver = SQSMultiReceiver(
+        receivers=[SQSReceiver[str](url=url) for url in shard_urls],
+        weights=[1] * len(shard_urls),
+        timeout=ConstantTimeout(period=timedelta(seconds=2)),
+    )
+
+    assert sorted(message.value for message in receiver) == [
+        'a', 'b', 'c', 'd',
+    ]
+
+
+def _messages_count(client: SQSClient, url: str) -> int:
+    return int(client.get_queue_attributes(
+        QueueUrl=url,
+        AttributeNames=['ApproximateNumberOfMessages'],
+    )['Attributes']['ApproximateNumberOfMessages'])
+
+
+def test_send_many_in_chunks(
+    shard_urls: List[str],
+    mock_sqs_client: SQSClient,
+):
+    """Input is consumed lazily, one chunk at a time."""
+    sender = SQSShardedSender(
+        senders=[SQSSender[str](url=url) for url in shard_urls],
+        chunk_size=2,
+    )
+    sent_before: List[int] = []
+
+    def values():  # noqa: WPS430
+        for number in range(5):
+            sent_before.append(sum(
+                _messages_count(mock_sqs_client, url) for url in shard_urls
+            ))
+            yield str(number)
+
+    messages = sender.send_many(values())
+
+    assert [message.value for message in messages] == [
+        str(number) for number in range(5)
+    ]
+    assert sent_before == [0, 0, 2, 2, 4]
+
+
+def test_trace_context_is_propagated():
+    """Sharded messages carry the trace context of the caller."""
+    client = LocalSQSClient()
+    tracer = InMemoryTracer()
+    urls = [
+        client.create_queue(QueueName=f'traced_shard_{number}')['QueueUrl']
+        for number in range(2)
+    ]
+    sender = SQSShardedSender.from_urls(
+        urls,
+        sender_class=SQSSender[str],
+        client=client,
+        tracer=tracer,
+    )
+
+    with tracer.span('produce') as produce_span:
+        sender.send_many(['a', 'b'])
+
+    for url in urls:
+        receiver = SQSReceiver[str](url=url, client=client, tracer=tracer)
+        trace_context = SpanContext.from_traceparent(
+            receiver.receive().trace_context,
+        )
+        assert trace_context.trace_id == produce_span.context.trace_id
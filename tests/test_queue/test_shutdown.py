@@ -0,0 +1,178 @@
+import os
+import signal
+import threading
+import time
+from datetime import timedelta
+
+import pytest
+from mypy_boto3_sqs import Client as SQSClient
+from platonic.queue import MessageReceiveTimeout
+from platonic.sqs.queue import (
+    LocalSQSClient,
+    QueueResolver,
+    SQSReceiver,
+    SQSSender,
+)
+from platonic.timeout import ConstantTimeout
+
+
+@pytest.fixture()
+def drain_queue_url(mock_sqs_client: SQSClient) -> str:
+    """Queue with a long visibility timeout."""
+    queue_url = mock_sqs_client.create_queue(
+        QueueName='drain',
+        Attributes={
+            'VisibilityTimeout': '60',
+        },
+    )['QueueUrl']
+
+    mock_sqs_client.purge_queue(QueueUrl=queue_url)
+    return queue_url
+
+
+def test_stop_releases_buffered_messages(drain_queue_url: str):
+    """Messages received but not yielded are visible right after stop()."""
+    sender = SQSSender[str](url=drain_queue_url)
+    sender.send_many(['a', 'b', 'c'])
+
+    receiver = SQSReceiver[str](url=drain_queue_url)
+    received_values = []
+    for message in receiver:
+        received_values.append(message.value)
+        receiver.acknowledge(message)
+        receiver.stop()
+
+    assert received_values == ['a']
+    assert receiver.in_flight_count == 0
+
+    with pytest.raises(MessageReceiveTimeout):
+        receiver.receive()
+
+    other_receiver = SQSReceiver[str](
+        url=drain_queue_url,
+        timeout=ConstantTimeout(period=timedelta(seconds=2)),
+    )
+    assert [message.value for message in other_receiver] == ['b', 'c']
+
+
+def test_shutdown_waits_for_in_flight_messages(drain_queue_url: str):
+    """shutdown() returns as soon as in-flight messages are acknowledged."""
+    SQSSender[str](url=drain_queue_url).send('a')
+
+    receiver = SQSReceiver[str](url=drain_queue_url)
+    message = receiver.receive()
+    assert receiver.in_flight_count == 1
+
+    threading.Timer(0.5, receiver.acknowledge, args=[message]).start()
+
+    assert receiver.shutdown(timeout=timedelta(seconds=5))
+    assert receiver.is_stopped
+
+
+def test_shutdown_deadline(drain_queue_url: str):
+    """shutdown() gives up when the deadline is reached."""
+    SQSSender[str](url=drain_queue_url).send('a')
+
+    receiver = SQSReceiver[str](url=drain_queue_url)
+    receiver.receive()
+
+    assert not receiver.shutdown(timeout=timedelta(seconds=1))
+
+
+def test_stop_on_signals(drain_queue_url: str):
+    """Receiver stops when the process is signalled."""
+    receiver = SQSReceiver[str](url=drain_queue_url)
+    previous_handler = signal.getsignal(signal.SIGUSR1)
+
+    receiver.stop_on_signals(signal.SIGUSR1)
+    try:
+        os.kill(os.getpid(), signal.SIGUSR1)
+    finally:
+        signal.signal(signal.SIGUSR1, previous_handler)
+
+    assert receiver.is_stopped
+    assert not list(receiver)
+
+
+def test_stop_on_signals_calls_previous_handler(drain_queue_url: str):
+    """Handler installed before is called after the receiver is stopped."""
+    receiver = SQSReceiver[str](url=drain_queue_url)
+    handled_signals = []
+    previous_handler = signal.signal(
+        signal.SIGUSR1,
+        lambda signal_number, frame: handled_signals.append(signal_number),
+    )
+
+    receiver.stop_on_signals(signal.SIGUSR1)
+    try:
+        os.kill(os.getpid(), signal.SIGUSR1)
+    finally:
+        signal.signal(signal.SIGUSR1, previous_handler)
+
+    assert receiver.is_stopped
+    assert handled_signals == [signal.SIGUSR1]
+
+
+def test_expired_messages_are_not_in_flight():
+    """Messages are not tracked after their visibility timeout passes."""
+    client = LocalSQSClient()
+    url = client.create_queue(
+        QueueName='expiring',
+        Attributes={'VisibilityTimeout': '1'},
+    )['QueueUrl']
+    SQSSender[str](url=url, client=client).send_many(['a', 'b'])
+
+    receiver = SQSReceiver[str](
+        url=url,
+        client=client,
+        resolver=QueueResolver(),
+    )
+    assert receiver.queue_attributes.visibility_timeout == 1
+
+    receiver.poll(0, messages_count=1)
+    assert receiver.in_flight_count == 1
+
+    time.sleep(1.1)
+    receiver.poll(0, messages_count=1)
+    assert receiver.in_flight_count == 1
+
+
+def test_in_flight_bound_is_configurable():
+    """Configured visibility timeout bounds the tracking of messages."""
+    client = LocalSQSClient()
+    url = client.create_queue(
+        QueueName='expiring_configured',
+        Attributes={'VisibilityTimeout': '1'},
+    )['QueueUrl']
+    SQSSender[str](url=url, client=client).send_many(['a', 'b'])
+
+    receiver = SQSReceiver[str](
+        url=url,
+        client=client,
+        resolver=QueueResolver(),
+        visibility_timeout_seconds=1,
+    )
+    receiver.poll(0, messages_count=1)
+    time.sleep(1.1)
+    receiver.poll(0, messages_count=1)
+
+    assert receiver.in_flight_count == 1
+    assert not client.calls['get_queue_attributes']
+
+
+def test_in_flight_tracking_makes_no_api_calls():
+    """Without known visibility timeout, messages are tracked until done."""
+    client = LocalSQSClient()
+    url = client.create_queue(QueueName='expiring_unknown')['QueueUrl']
+    SQSSender[str](url=url, client=client).send_many(['a', 'b'])
+
+    receiver = SQSReceiver[str](
+        url=url,
+        client=client,
+        resolver=QueueResolver(),
+    )
+    receiver.receive()
+    receiver.receive()
+
+    assert receiver.in_flight_count == 2
+    assert not client.calls['get_queue_attributes']
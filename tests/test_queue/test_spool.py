@@ -0,0 +1,328 @@
+import sqlite3
+import time
+from datetime import timedelta
+from typing import List
+
+import pytest
+from mypy_boto3_sqs import Client as SQSClient
+from platonic.queue import MessageTooLarge
+from platonic.sqs.queue import (
+    InMemoryTracer,
+    LocalSQSClient,
+    RetryPolicy,
+    SQSBatchEntriesFailed,
+    SQSReceiver,
+    SQSSender,
+    SQSSpooledSender,
+    SQSSpoolFull,
+)
+from platonic.timeout import ConstantTimeout
+from tests.test_queue.faults import client_error
+
+# Whether failure is the sender fault, by body of the failing message.
+SENDER_FAULTS = {'poison': True, 'busy': False}
+
+
+class RejectingClient(LocalSQSClient):
+    """Fails messages listed in `SENDER_FAULTS`, and batches on demand."""
+
+    failing_batches = 0
+
+    def send_message_batch(self, QueueUrl, Entries):  # noqa: N803
+        """Fail the listed entries, and send the rest."""
+        if self.failing_batches:
+            self.failing_batches -= 1
+            raise client_error('AccessDenied', 'SendMessageBatch')
+
+        response = super().send_message_batch(
+            QueueUrl=QueueUrl,
+            Entries=[
+                entry for entry in Entries
+                if entry['MessageBody'] not in SENDER_FAULTS
+            ],
+        )
+        response['Failed'] = [
+            {
+                'Id': entry['Id'],
+                'SenderFault': SENDER_FAULTS[entry['MessageBody']],
+                'Code': 'Failed',
+            }
+            for entry in Entries
+            if entry['MessageBody'] in SENDER_FAULTS
+        ]
+        return response
+
+
+def _local_spool(tmp_path, **kwargs) -> SQSSpooledSender[str]:
+    client = RejectingClient()
+    return SQSSpooledSender(
+        sender=SQSSender[str](
+            url=client.create_queue(QueueName='spool')['QueueUrl'],
+            client=client,
+            batch_size=2,
+        ),
+        path=str(tmp_path / 'spool.sqlite'),
+        **kwargs,
+    )
+
+
+def _local_values(spooled_sender: SQSSpooledSender[str]) -> List[str]:
+    receiver = SQSReceiver[str](
+        url=spooled_sender.sender.url,
+        client=spooled_sender.sender.client,
+        timeout=ConstantTimeout(period=timedelta(milliseconds=100)),
+    )
+    return [message.value for message in receiver]
+
+
+def _values_in(url: str) -> List[str]:
+    receiver = SQSReceiver[str](
+        url=url,
+        timeout=ConstantTimeout(period=timedelta(seconds=1)),
+    )
+    return [message.value for message in receiver]
+
+
+def test_drain_after_restart(mock_sqs_client: SQSClient, tmp_path):
+    """Messages spooled before a restart are sent after it, in order."""
+    sqs_queue_url = mock_sqs_client.create_queue(
+        QueueName='spool_restart',
+    )['QueueUrl']
+    path = str(tmp_path / 'spool.sqlite')
+    sender = SQSSender[str](url=sqs_queue_url)
+
+    SQSSpooledSender(sender=sender, path=path).send_many(['a', 'b', 'c'])
+    assert not _values_in(sqs_queue_url)
+
+    spooled_sender = SQSSpooledSender(sender=sender, path=path)
+    assert spooled_sender.spooled_count == 3
+    assert spooled_sender.spooled_size == 3
+
+    assert spooled_sender.drain() == 3
+    assert spooled_sender.spooled_count == 0
+    assert sorted(_values_in(sqs_queue_url)) == ['a', 'b', 'c']
+
+
+def test_background_drain(mock_sqs_client: SQSClient, tmp_path):
+    """Background thread ships every message before stopping."""
+    sqs_queue_url = mock_sqs_client.create_queue(
+        QueueName='spool_background',
+    )['QueueUrl']
+    spooled_sender = SQSSpooledSender(
+        sender=SQSSender[str](url=sqs_queue_url),
+        path=str(tmp_path / 'spool.sqlite'),
+        drain_interval=timedelta(milliseconds=10),
+    )
+
+    spooled_sender.start()
+    for number in range(150):
+        spooled_sender.send(str(number))
+
+    assert spooled_sender.stop(timeout=timedelta(seconds=5))
+    assert len(_values_in(sqs_queue_url)) == 150
+
+
+def test_spool_full(mock_sqs_client: SQSClient, tmp_path):
+    """Spool does not grow beyond its limit."""
+    spooled_sender = SQSSpooledSender(
+        sender=SQSSender[str](url='...'),
+        path=str(tmp_path / 'spool.sqlite'),
+        max_size=5,
+    )
+    spooled_sender.send('abc')
+
+    with pytest.raises(SQSSpoolFull):
+        spooled_sender.send('abc')
+
+    assert spooled_sender.spooled_count == 1
+
+
+def test_spool_size_in_bytes(tmp_path):
+    """Spool size counts encoded bytes, not characters."""
+    spooled_sender = SQSSpooledSender(
+        sender=SQSSender[str](url='...'),
+        path=str(tmp_path / 'spool.sqlite'),
+        max_size=6,
+    )
+    spooled_sender.send('ёж')
+    assert spooled_sender.spooled_size == 4
+
+    with pytest.raises(SQSSpoolFull):
+        spooled_sender.send('ёж')
+
+    restarted_sender = SQSSpooledSender(
+        sender=SQSSender[str](url='...'),
+        path=str(tmp_path / 'spool.sqlite'),
+    )
+    assert restarted_sender.spooled_size == spooled_sender.spooled_size
+
+
+def test_stop_without_start(tmp_path):
+    """Stopping a spool which was never started reports what is left."""
+    spooled_sender = SQSSpooledSender(
+        sender=SQSSender[str](url='...'),
+        path=str(tmp_path / 'spool.sqlite'),
+    )
+    assert spooled_sender.stop(timeout=timedelta(seconds=1))
+
+    spooled_sender.send('abc')
+    assert not spooled_sender.stop(timeout=timedelta(seconds=1))
+
+
+def test_trace_context_of_spooling(mock_sqs_client: SQSClient, tmp_path):
+    """Messages carry the trace context they were spooled in."""
+    sqs_queue_url = mock_sqs_client.create_queue(
+        QueueName='spool_traced',
+    )['QueueUrl']
+    tracer = InMemoryTracer()
+    spooled_sender = SQSSpooledSender(
+        sender=SQSSender[str](url=sqs_queue_url, tracer=tracer),
+        path=str(tmp_path / 'spool.sqlite'),
+    )
+
+    with tracer.span('produce') as produce_span:
+        spooled_sender.send('traced')
+    spooled_sender.send('not traced')
+
+    with tracer.span('drain'):
+        spooled_sender.drain()
+
+    receiver = SQSReceiver[str](
+        url=sqs_queue_url,
+        tracer=tracer,
+        timeout=ConstantTimeout(period=timedelta(seconds=1)),
+    )
+    trace_contexts = {
+        message.value: message.trace_context
+        for message in receiver
+    }
+    assert trace_contexts == {
+        'traced': produce_span.context.to_traceparent(),
+        'not traced': None,
+    }
+
+
+def test_too_large_message_is_not_spooled(tmp_path):
+    """Message which SQS would never accept is refused right away."""
+    spooled_sender = SQSSpooledSender(
+        sender=SQSSender[str](url='...', max_message_size=5),
+        path=str(tmp_path / 'spool.sqlite'),
+    )
+
+    with pytest.raises(MessageTooLarge):
+        spooled_sender.send_many(['abc', 'too large'])
+
+    assert spooled_sender.spooled_count == 0
+
+
+def test_rejected_message_is_moved_aside(tmp_path):
+    """Message rejected by SQS does not block the spool."""
+    spooled_sender = _local_spool(tmp_path)
+    spooled_sender.send_many(['a', 'b', 'c', 'poison', 'd'])
+
+    assert spooled_sender.drain() == 4
+    assert spooled_sender.spooled_count == 0
+    assert spooled_sender.spooled_size == 0
+    assert spooled_sender.rejected_count == 1
+
+    # `c` was in one batch with `poison`, and thus might be sent twice.
+    assert set(_local_values(spooled_sender)) == {'a', 'b', 'c', 'd'}
+
+    assert spooled_sender.drain() == 0
+    assert not _local_values(spooled_sender)
+
+    rejected_bodies = sqlite3.connect(spooled_sender.path).execute(
+        'SELECT body FROM rejected_messages',
+    ).fetchall()
+    assert rejected_bodies == [('poison',)]
+
+
+def test_too_large_message_is_moved_aside(tmp_path):
+    """Message spooled under a higher size limit is not sent."""
+    spooled_sender = _local_spool(tmp_path)
+    spooled_sender.send_many(['a', 'too large'])
+
+    spooled_sender.sender.max_message_size = 5
+    assert spooled_sender.drain() == 1
+    assert spooled_sender.rejected_count == 1
+
+
+def test_failures_on_aws_side_are_retried(tmp_path):
+    """Message which SQS failed to accept stays in the spool."""
+    spooled_sender = _local_spool(tmp_path)
+    spooled_sender.sender.retry_policy = RetryPolicy(max_attempts=1)
+    spooled_sender.send_many(['a', 'busy'])
+
+    with pytest.raises(SQSBatchEntriesFailed):
+        spooled_sender.drain()
+
+    assert spooled_sender.spooled_count == 2
+    assert spooled_sender.rejected_count == 0
+
+
+def test_sent_batches_are_removed(tmp_path):
+    """Batches sent before a failure are not sent again."""
+    spooled_sender = _local_spool(tmp_path)
+    spooled_sender.send_many(['a', 'b', 'c', 'd'])
+
+    spooled_sender.sender.client.failing_batches = 1
+    with pytest.raises(Exception, match='AccessDenied'):
+        spooled_sender.drain()
+
+    assert spooled_sender.spooled_count == 4
+
+    spooled_sender.sender.client.failing_batches = 0
+    spooled_sender.sender.client.send_message_batch = _fail_second_batch(
+        spooled_sender.sender.client.send_message_batch,
+    )
+    with pytest.raises(Exception, match='AccessDenied'):
+        spooled_sender.drain()
+
+    assert spooled_sender.spooled_count == 2
+    assert spooled_sender.spooled_size == 2
+
+    assert spooled_sender.drain() == 2
+    assert sorted(_local_values(spooled_sender)) == ['a', 'b', 'c', 'd']
+
+
+def _fail_second_batch(send_message_batch):
+    calls = []
+
+    def send_message_batch_once(**kwargs):  # noqa: WPS430
+        calls.append(kwargs)
+        if len(calls) == 2:
+            raise client_error('AccessDenied', 'SendMessageBatch')
+
+        return send_message_batch(**kwargs)
+
+    return send_message_batch_once
+
+
+def test_background_drain_survives_errors(tmp_path, caplog):
+    """Background thread logs failures and tries again."""
+    spooled_sender = _local_spool(
+        tmp_path,
+        drain_interval=timedelta(milliseconds=10),
+    )
+    spooled_sender.sender.client.failing_batches = 1
+    spooled_sender.send('a')
+
+    spooled_sender.start()
+    deadline = time.monotonic() + 5
+    while spooled_sender.spooled_count and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert spooled_sender.stop(timeout=timedelta(seconds=5))
+    assert 'Failed to send spooled messages' in caplog.text
+    assert _local_values(spooled_sender) == ['a']
+
+
+def test_stop_timeout(tmp_path):
+    """Stop reports failure if the thread does not finish in time."""
+    spooled_sender = _local_spool(tmp_path)
+    spooled_sender.sender.client.latency = timedelta(milliseconds=200)
+    spooled_sender.send('a')
+
+    spooled_sender.start()
+    assert not spooled_sender.stop(timeout=timedelta(milliseconds=10))
+    assert spooled_sender.stop(timeout=timedelta(seconds=5))
@@ -0,0 +1,92 @@
+from datetime import timedelta
+
+from mypy_boto3_sqs import Client as SQSClient
+from platonic.sqs.queue import (
+    InMemoryTracer,
+    SpanContext,
+    SQSReceiver,
+    SQSSender,
+)
+from platonic.timeout import ConstantTimeout
+
+
+def test_traceparent():
+    """Span context is serialized into traceparent format and back."""
+    context = SpanContext.generate()
+    assert SpanContext.from_traceparent(context.to_traceparent()) == context
+
+    assert SpanContext.from_traceparent(None) is None
+    assert SpanContext.from_traceparent('garbage') is None
+
+
+def test_trace_propagation(mock_sqs_client: SQSClient):  # noqa: WPS210
+    """Trace context travels from sender to receiver with the message."""
+    sqs_queue_url = mock_sqs_client.create_queue(
+        QueueName='traced',
+    )['QueueUrl']
+
+    tracer = InMemoryTracer()
+    sender = SQSSender[str](url=sqs_queue_url, tracer=tracer)
+    receiver = SQSReceiver[str](
+        url=sqs_queue_url,
+        tracer=tracer,
+        timeout=ConstantTimeout(period=timedelta(seconds=2)),
+    )
+
+    with tracer.span('produce') as produce_span:
+        sender.send('single')
+        sender.send_many(['first', 'second'])
+
+    for message in receiver:
+        assert message.sent_timestamp
+        with receiver.acknowledgement(message):
+            assert message.trace_context
+
+    trace_id = produce_span.context.trace_id
+
+    handle_spans = tracer.finished_spans('SQS handle')
+    assert len(handle_spans) == 3
+    assert {span.context.trace_id for span in handle_spans} == {trace_id}
+
+    queue_wait_spans = tracer.finished_spans('SQS queue wait')
+    assert len(queue_wait_spans) == 3
+    assert all(span.duration >= 0 for span in queue_wait_spans)
+
+    assert tracer.finished_spans('SQS send_message')
+    assert tracer.finished_spans('SQS delete_message')
+
+
+def test_no_tracing_by_default(mock_sqs_client: SQSClient):
+    """Without a tracer, no message attributes are sent."""
+    sqs_queue_url = mock_sqs_client.create_queue(
+        QueueName='not_traced',
+    )['QueueUrl']
+
+    SQSSender[str](url=sqs_queue_url).send('hello')
+
+    tracer = InMemoryTracer()
+    message = SQSReceiver[str](url=sqs_queue_url, tracer=tracer).receive()
+
+    assert message.trace_context is None
+    assert len(tracer.finished_spans('SQS queue wait')) == 1
+
+
+def test_send_many_span_is_not_held_across_yields(mock_sqs_client: SQSClient):
+    """Spans of the caller iterating over sent messages are not nested."""
+    sqs_queue_url = mock_sqs_client.create_queue(
+        QueueName='traced_iteration',
+    )['QueueUrl']
+    tracer = InMemoryTracer()
+    sender = SQSSender[str](url=sqs_queue_url, tracer=tracer, batch_size=1)
+
+    with tracer.span('produce') as produce_span:
+        for message in sender.iter_send_many(['first', 'second']):
+            with tracer.span('caller'):
+                assert message.message_id
+
+    caller_spans = tracer.finished_spans('caller')
+    send_spans = tracer.finished_spans('SQS send_many')
+    assert {span.parent for span in caller_spans + send_spans} == {
+        produce_span.context,
+    }
+    assert len(tracer.finished_spans('SQS send_many')) == 2
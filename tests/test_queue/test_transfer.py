@@ -0,0 +1,166 @@
+import json
+from datetime import timedelta
+
+import pytest
+from mypy_boto3_sqs import Client as SQSClient
+from platonic.sqs.queue import (
+    ExportAction,
+    LocalSQSClient,
+    SQSReceiver,
+    SQSSender,
+    export_messages,
+    import_messages,
+)
+from platonic.timeout import ConstantTimeout
+from tests.test_queue.robot import CommandReceiver
+
+
+def _receiver(url: str) -> SQSReceiver[int]:
+    return SQSReceiver[int](
+        url=url,
+        timeout=ConstantTimeout(period=timedelta(seconds=1)),
+    )
+
+
+@pytest.mark.parametrize('file_name', ['export.jsonl', 'export.jsonl.gz'])
+def test_export_and_import(
+    mock_sqs_client: SQSClient,
+    tmp_path,
+    file_name: str,
+):
+    """Messages exported from one queue are imported into another one."""
+    source_url = mock_sqs_client.create_queue(
+        QueueName=f'export_source_{len(file_name)}',
+    )['QueueUrl']
+    destination_url = mock_sqs_client.create_queue(
+        QueueName=f'import_destination_{len(file_name)}',
+    )['QueueUrl']
+    path = str(tmp_path / file_name)
+
+    SQSSender[int](url=source_url).send_many(range(25))
+
+    assert export_messages(
+        _receiver(source_url),
+        path,
+        action=ExportAction.ACKNOWLEDGE,
+    ) == 25
+    assert not list(_receiver(source_url))
+
+    assert import_messages(SQSSender[int](url=destination_url), path) == 25
+    assert sorted(
+        message.value for message in _receiver(destination_url)
+    ) == list(range(25))
+
+
+def test_export_and_release(mock_sqs_client: SQSClient, tmp_path):
+    """Released messages are available right after the export."""
+    sqs_queue_url = mock_sqs_client.create_queue(
+        QueueName='export_release',
+        Attributes={'VisibilityTimeout': '60'},
+    )['QueueUrl']
+    path = tmp_path / 'export.jsonl'
+
+    SQSSender[int](url=sqs_queue_url).send_many([1, 2, 3])
+
+    export_messages(
+        _receiver(sqs_queue_url),
+        str(path),
+        action=ExportAction.RELEASE,
+    )
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert sorted(line['body'] for line in lines) == ['1', '2', '3']
+    assert all(line['message_id'] for line in lines)
+    assert len(list(_receiver(sqs_queue_url))) == 3
+
+
+def test_export_is_lossless(mock_sqs_client: SQSClient, tmp_path):
+    """Bodies are exported as received, and left messages are not tracked."""
+    sqs_queue_url = mock_sqs_client.create_queue(
+        QueueName='export_raw',
+    )['QueueUrl']
+    path = tmp_path / 'export.jsonl'
+
+    SQSSender[str](url=sqs_queue_url).send_raw_many(['007', '42'])
+
+    receiver = _receiver(sqs_queue_url)
+    assert export_messages(receiver, str(path)) == 2
+    assert receiver.in_flight_count == 0
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert sorted(line['body'] for line in lines) == ['007', '42']
+
+
+def test_export_of_returning_messages(tmp_path):
+    """Messages left in the queue are exported once, and the export ends."""
+    client = LocalSQSClient()
+    sqs_queue_url = client.create_queue(
+        QueueName='export_leave',
+        Attributes={'VisibilityTimeout': '0'},
+    )['QueueUrl']
+    SQSSender[str](url=sqs_queue_url, client=client).send_raw_many(
+        str(number) for number in range(25)
+    )
+
+    receiver = SQSReceiver[str](
+        url=sqs_queue_url,
+        client=client,
+        timeout=ConstantTimeout(period=timedelta(seconds=1)),
+    )
+    assert export_messages(
+        receiver,
+        str(tmp_path / 'export.jsonl'),
+    ) == 25
+
+
+def test_export_of_invalid_values(mock_sqs_client: SQSClient, tmp_path):
+    """Bodies are exported even if they cannot be deserialized."""
+    sqs_queue_url = mock_sqs_client.create_queue(
+        QueueName='export_invalid',
+    )['QueueUrl']
+    path = tmp_path / 'export.jsonl'
+
+    SQSSender[str](url=sqs_queue_url).send_raw_many(['jump', 'dance'])
+
+    receiver = CommandReceiver(
+        url=sqs_queue_url,
+        timeout=ConstantTimeout(period=timedelta(seconds=1)),
+    )
+    assert export_messages(
+        receiver,
+        str(path),
+        action=ExportAction.ACKNOWLEDGE,
+    ) == 2
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert sorted(line['body'] for line in lines) == ['dance', 'jump']
+
+
+def test_export_from_stopped_receiver(tmp_path):
+    """Stopped receiver exports nothing."""
+    client = LocalSQSClient()
+    sqs_queue_url = client.create_queue(QueueName='export_stopped')['QueueUrl']
+    SQSSender[str](url=sqs_queue_url, client=client).send('left')
+
+    receiver = SQSReceiver[str](url=sqs_queue_url, client=client)
+    receiver.stop()
+
+    assert not export_messages(receiver, str(tmp_path / 'export.jsonl'))
+    assert not client.calls['receive_message']
+
+
+def test_import_of_many_chunks(tmp_path):
+    """Chunks are sent a few at a time, blank lines are skipped."""
+    client = LocalSQSClient()
+    sqs_queue_url = client.create_queue(QueueName='import_chunks')['QueueUrl']
+    path = tmp_path / 'export.jsonl'
+    path.write_text('\n\n'.join(
+        json.dumps({'body': str(number)}) for number in range(2500)
+    ))
+
+    assert import_messages(
+        SQSSender[str](url=sqs_queue_url, client=client),
+        str(path),
+        max_concurrency=1,
+    ) == 2500
+    assert client.calls['send_message_batch'] == 250
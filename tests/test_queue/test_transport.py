@@ -0,0 +1,215 @@
+import socket
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from botocore.exceptions import HTTPClientError
+from platonic.sqs.queue import (
+    Credentials,
+    LocalSQSServer,
+    SQSHTTPClient,
+    SQSQueueDoesNotExist,
+    SQSReceiver,
+    SQSSender,
+)
+from platonic.sqs.queue.retry import is_retryable_error
+from platonic.sqs.queue.transport import parse_error, sign_request
+from platonic.timeout import ConstantTimeout
+
+CREDENTIALS = Credentials(access_key='AKID', secret_key='secret')
+
+
+@pytest.fixture()
+def http_client():
+    """HTTP client talking to a local server."""
+    with LocalSQSServer() as server:
+        client = SQSHTTPClient(
+            region_name='us-east-1',
+            endpoint_url=server.endpoint_url,
+            credentials=CREDENTIALS,
+        )
+        yield client
+        client.close()
+
+
+def test_send_and_receive(http_client: SQSHTTPClient):
+    """Senders and receivers work over the HTTP transport."""
+    url = http_client.create_queue(QueueName='http')['QueueUrl']
+
+    sent_message = SQSSender[int](url=url, client=http_client).send(42)
+    SQSSender[int](url=url, client=http_client).send_many(range(12))
+
+    receiver = SQSReceiver[int](
+        url=url,
+        client=http_client,
+        timeout=ConstantTimeout(period=timedelta(seconds=1)),
+    )
+    messages = list(receiver)
+    receiver.acknowledge_many(messages)
+
+    assert sent_message.message_id
+    assert sorted(message.value for message in messages) == [
+        *range(12), 42,
+    ]
+    assert all(message.receive_count == 1 for message in messages)
+
+
+def test_errors(http_client: SQSHTTPClient):
+    """Errors are raised as boto3 would raise them."""
+    with pytest.raises(http_client.exceptions.QueueDoesNotExist):
+        http_client.get_queue_url(QueueName='does_not_exist')
+
+    sender = SQSSender[int](url='https://sqs.local/0/none', client=http_client)
+    with pytest.raises(SQSQueueDoesNotExist):
+        sender.send(1)
+
+    with pytest.raises(AttributeError):
+        http_client.list_queues()
+
+
+def test_signature():
+    """Signature depends on the payload and on the time."""
+    now = datetime(2021, 3, 1, 12, 0, 0)
+    signed_headers = sign_request(
+        credentials=CREDENTIALS,
+        region_name='us-east-1',
+        host='sqs.us-east-1.amazonaws.com',
+        headers={'X-Amz-Target': 'AmazonSQS.SendMessage'},
+        payload=b'{}',
+        now=now,
+    )
+
+    assert signed_headers['x-amz-date'] == '20210301T120000Z'
+    assert signed_headers['Authorization'].startswith(
+        'AWS4-HMAC-SHA256 Credential=AKID/20210301/us-east-1/sqs/aws4_request, '
+        'SignedHeaders=host;x-amz-date;x-amz-target, Signature=',
+    )
+    assert signed_headers != sign_request(
+        credentials=CREDENTIALS,
+        region_name='us-east-1',
+        host='sqs.us-east-1.amazonaws.com',
+        headers={'X-Amz-Target': 'AmazonSQS.SendMessage'},
+        payload=b'{"a": 1}',
+        now=now,
+    )
+
+
+def test_credentials_from_environment(monkeypatch):
+    """Credentials are read from standard environment variables."""
+    monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'AKID')
+    monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'secret')
+    monkeypatch.setenv('AWS_SESSION_TOKEN', 'token')
+
+    assert Credentials.from_environment() == Credentials(
+        access_key='AKID',
+        secret_key='secret',
+        session_token='token',
+    )
+
+
+def test_session_token_is_signed():
+    """Session token is sent, and is covered by the signature."""
+    signed_headers = sign_request(
+        credentials=Credentials(
+            access_key='AKID',
+            secret_key='secret',
+            session_token='token',
+        ),
+        region_name='us-east-1',
+        host='sqs.us-east-1.amazonaws.com',
+        headers={},
+        payload=b'{}',
+        now=datetime(2021, 3, 1, 12, 0, 0),
+    )
+
+    assert signed_headers['x-amz-security-token'] == 'token'
+    signed_header_names = 'SignedHeaders=host;x-amz-date;x-amz-security-token,'
+    assert signed_header_names in signed_headers['Authorization']
+
+
+def test_invalid_error_body():
+    """Error response which is not JSON is described by its status."""
+    error = parse_error(503, {}, b'<html>Unavailable</html>', 'SendMessage')
+
+    assert error.response['Error']['Code'] == '503'
+    assert error.response['ResponseMetadata']['HTTPStatusCode'] == 503
+
+
+def _endpoint_url(listener: socket.socket) -> str:
+    host, port = listener.getsockname()
+    return f'http://{host}:{port}'
+
+
+def _serve_once_per_connection(
+    listener: socket.socket,
+    count: int,
+    response_headers: bytes = b'',
+) -> None:
+    """Answer one request per connection, then close the connection."""
+    listener.settimeout(5)
+    for _index in range(count):
+        try:
+            connection, _address = listener.accept()
+        except socket.timeout:
+            return
+
+        with connection:
+            connection.recv(65536)
+            connection.sendall(
+                b'HTTP/1.1 200 OK\r\nContent-Length: 2\r\n' +
+                response_headers +
+                b'\r\n{}',
+            )
+
+
+@pytest.mark.parametrize('response_headers', [
+    b'',
+    b'Connection: close\r\n',
+])
+def test_closed_connection_is_replaced(response_headers: bytes):
+    """
+    Connection closed by the server is not used for the next request.
+
+    If the server announces it, the connection is closed on our side too.
+    """
+    with socket.create_server(('127.0.0.1', 0)) as listener:
+        server_thread = threading.Thread(
+            target=_serve_once_per_connection,
+            args=(listener, 2, response_headers),
+        )
+        server_thread.start()
+
+        client = SQSHTTPClient(
+            region_name='us-east-1',
+            endpoint_url=_endpoint_url(listener),
+            credentials=CREDENTIALS,
+        )
+        assert client.send_message(QueueUrl='q', MessageBody='1') == {}
+        time.sleep(0.1)
+        assert client.send_message(QueueUrl='q', MessageBody='2') == {}
+
+        server_thread.join()
+        client.close()
+
+
+def test_connection_errors():
+    """Connection failures are retryable, unless a message might be sent."""
+    with socket.create_server(('127.0.0.1', 0)) as listener:
+        client = SQSHTTPClient(
+            region_name='us-east-1',
+            endpoint_url=_endpoint_url(listener),
+            credentials=CREDENTIALS,
+            timeout_seconds=0.1,
+        )
+
+        with pytest.raises(HTTPClientError) as error_info:
+            client.get_queue_url(QueueName='silent')
+        assert is_retryable_error(error_info.value)
+
+        with pytest.raises(client.exceptions.RequestOutcomeUnknown) as unknown:
+            client.send_message(QueueUrl='q', MessageBody='once')
+        assert not is_retryable_error(unknown.value)
+
+        # The failed connection is closed already.
+        client.close()
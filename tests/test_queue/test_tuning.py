@@ -0,0 +1,189 @@
+import threading
+import time
+from datetime import timedelta
+
+from platonic.sqs.queue import (
+    AutoTuner,
+    LocalSQSClient,
+    QueueAttributes,
+    SQSReceiver,
+    SQSSender,
+)
+from platonic.timeout import ConstantTimeout
+
+QUEUE_ATTRIBUTES = QueueAttributes(
+    is_fifo=False,
+    maximum_message_size=262144,
+    visibility_timeout=10,
+    receive_message_wait_time_seconds=0,
+)
+
+
+def test_moving_average():
+    """Handling time is smoothed."""
+    tuner = AutoTuner(smoothing=0.5)
+
+    tuner.record_handling_time(2)
+    tuner.record_handling_time(4)
+
+    assert tuner.handling_seconds == 3
+
+
+def test_messages_count():
+    """Pull no more than can be handled within visibility timeout."""
+    tuner = AutoTuner(visibility_margin=0.8)
+    assert tuner.messages_count(10, 0, QUEUE_ATTRIBUTES) == 10
+
+    tuner.record_handling_time(2)
+    assert tuner.messages_count(10, 0, QUEUE_ATTRIBUTES) == 4
+    assert tuner.messages_count(10, 3, QUEUE_ATTRIBUTES) == 1
+    assert tuner.messages_count(10, 4, QUEUE_ATTRIBUTES) == 0
+    assert tuner.messages_count(10, 9, QUEUE_ATTRIBUTES) == 0
+
+    tuner.record_handling_time(60)
+    assert tuner.messages_count(10, 0, QUEUE_ATTRIBUTES) == 1
+
+
+def test_wait_time():
+    """Long polling time configured for the queue is preferred."""
+    tuner = AutoTuner()
+    assert tuner.wait_time_seconds(QUEUE_ATTRIBUTES, default=20) == 20
+
+    configured_attributes = QueueAttributes(
+        is_fifo=False,
+        maximum_message_size=262144,
+        visibility_timeout=10,
+        receive_message_wait_time_seconds=5,
+    )
+    assert tuner.wait_time_seconds(configured_attributes, default=20) == 5
+
+
+def test_receiver_pulls_what_it_can_handle():
+    """Slow handling limits the number of messages received at once."""
+    client = LocalSQSClient()
+    url = client.create_queue(
+        QueueName='tuned',
+        Attributes={'VisibilityTimeout': '1'},
+    )['QueueUrl']
+    SQSSender[int](url=url, client=client).send_many(range(20))
+
+    tuner = AutoTuner(smoothing=1, visibility_margin=1)
+    receiver = SQSReceiver[int](url=url, client=client, auto_tuner=tuner)
+
+    first_batch = receiver.poll(0)
+    assert len(first_batch) == 10
+
+    time.sleep(0.3)
+    receiver.acknowledge(first_batch[0])
+    receiver.release_many(first_batch[1:])
+    assert 0.3 <= tuner.handling_seconds < 0.5
+
+    assert 2 <= len(receiver.poll(0)) <= 3
+
+
+def test_receiver_waits_for_capacity():
+    """Receiver does not pull messages it has no capacity for."""
+    client = LocalSQSClient()
+    url = client.create_queue(
+        QueueName='tuned_full',
+        Attributes={'VisibilityTimeout': '1'},
+    )['QueueUrl']
+    SQSSender[int](url=url, client=client).send_many(range(5))
+
+    tuner = AutoTuner(visibility_margin=1)
+    tuner.record_handling_time(0.5)
+    receiver = SQSReceiver[int](url=url, client=client, auto_tuner=tuner)
+
+    first_batch = receiver.poll(0)
+    assert len(first_batch) == 2
+
+    receive_calls = client.calls['receive_message']
+    assert not receiver.poll(0)
+    assert client.calls['receive_message'] == receive_calls
+
+    timer = threading.Timer(0.2, receiver.acknowledge, [first_batch[0]])
+    timer.start()
+    started_at = time.monotonic()
+    assert not receiver.poll(1)
+    assert time.monotonic() - started_at < 0.9
+    timer.join()
+
+    assert len(receiver.poll(0)) == 1
+
+
+def test_concurrent_polls_share_capacity():
+    """Polls running in parallel do not pull more than the tuned limit."""
+    client = LocalSQSClient(latency=timedelta(milliseconds=50))
+    url = client.create_queue(
+        QueueName='tuned_concurrent',
+        Attributes={'VisibilityTimeout': '1'},
+    )['QueueUrl']
+    SQSSender[int](url=url, client=client).send_many(range(10))
+
+    tuner = AutoTuner(visibility_margin=1)
+    tuner.record_handling_time(0.5)
+    receiver = SQSReceiver[int](
+        url=url,
+        client=client,
+        auto_tuner=tuner,
+        batch_size=1,
+    )
+
+    batch = receiver.receive_many(
+        max_messages=10,
+        max_latency=timedelta(milliseconds=500),
+    )
+    assert len(batch.messages) == 2
+
+
+def test_batch_acknowledgement_is_one_measurement():
+    """Messages acknowledged together share the time they were handled."""
+    client = LocalSQSClient()
+    url = client.create_queue(QueueName='tuned_batch')['QueueUrl']
+    SQSSender[int](url=url, client=client).send_many(range(4))
+
+    tuner = AutoTuner(smoothing=1)
+    receiver = SQSReceiver[int](url=url, client=client, auto_tuner=tuner)
+
+    messages = receiver.poll(0)
+    time.sleep(0.4)
+    receiver.acknowledge_many(messages)
+
+    assert 0.1 <= tuner.handling_seconds < 0.15
+
+
+def test_wait_time_of_queue():
+    """Long polling time configured for the queue is used by the receiver."""
+    client = LocalSQSClient()
+    url = client.create_queue(
+        QueueName='tuned_wait',
+        Attributes={'ReceiveMessageWaitTimeSeconds': '1'},
+    )['QueueUrl']
+    wait_times = []
+    receive_message = client.receive_message
+
+    def recorded_receive_message(**kwargs):  # noqa: WPS430
+        wait_times.append(kwargs['WaitTimeSeconds'])
+        return receive_message(**kwargs)
+
+    client.receive_message = recorded_receive_message
+
+    receiver = SQSReceiver[int](
+        url=url,
+        client=client,
+        auto_tuner=AutoTuner(),
+        timeout=ConstantTimeout(period=timedelta(seconds=2)),
+    )
+    assert not list(receiver)
+
+    assert max(wait_times) == 1
+
+
+def test_zero_messages_without_tuner():
+    """Without a tuner, pulling no messages returns at once, without a call."""
+    client = LocalSQSClient()
+    url = client.create_queue(QueueName='untuned')['QueueUrl']
+    receiver = SQSReceiver[int](url=url, client=client)
+
+    assert receiver._receive_messages(message_count=0) == {}
+    assert not client.calls['receive_message']
@@ -0,0 +1,216 @@
+import threading
+import time
+from datetime import timedelta
+
+import pytest
+from mypy_boto3_sqs import Client as SQSClient
+from platonic.sqs.queue import (
+    Backlog,
+    BacklogMonitor,
+    LocalSQSClient,
+    SQSReceiver,
+    SQSSender,
+    SQSWorkerPool,
+)
+
+
+@pytest.fixture()
+def backlog_queue_url(mock_sqs_client: SQSClient) -> str:
+    """Empty queue."""
+    queue_url = mock_sqs_client.create_queue(
+        QueueName='backlog',
+    )['QueueUrl']
+
+    mock_sqs_client.purge_queue(QueueUrl=queue_url)
+    return queue_url
+
+
+def test_backlog_monitor(backlog_queue_url: str):
+    """Backlog is cached, and consumer rates are measured."""
+    sender = SQSSender[str](url=backlog_queue_url)
+    receiver = SQSReceiver[str](url=backlog_queue_url)
+    monitor = BacklogMonitor(receiver=receiver, cache_ttl=timedelta(hours=1))
+
+    sender.send_many(['a', 'b', 'c'])
+    assert monitor.backlog() == Backlog(visible=3, not_visible=0)
+
+    receiver.acknowledge(receiver.receive())
+
+    # Cached value
+    assert monitor.backlog().visible == 3
+    assert monitor.lag(monitor.rates()) < 10
+
+    rates = monitor.rates()
+    assert rates.receive_rate == 0
+    assert rates.acknowledge_rate == 0
+    assert monitor.lag(rates) == float('inf')
+
+
+def test_desired_workers_count(backlog_queue_url: str):
+    """Worker count depends on the backlog."""
+    pool = SQSWorkerPool(
+        receiver=SQSReceiver[str](url=backlog_queue_url),
+        handler=print,
+        min_workers=2,
+        max_workers=5,
+        messages_per_worker=10,
+    )
+
+    assert pool.desired_workers_count(Backlog(visible=0, not_visible=3)) == 2
+    assert pool.desired_workers_count(Backlog(visible=31, not_visible=0)) == 4
+    assert pool.desired_workers_count(Backlog(visible=1000, not_visible=0)) == 5
+
+
+def test_desired_workers_count_by_lag(backlog_queue_url: str):
+    """With known throughput, worker count keeps the lag below max_lag."""
+    pool = SQSWorkerPool(
+        receiver=SQSReceiver[str](url=backlog_queue_url),
+        handler=print,
+        max_workers=5,
+        messages_per_worker=10,
+        max_lag=timedelta(seconds=60),
+    )
+    backlog = Backlog(visible=1000, not_visible=0)
+
+    assert pool.desired_workers_count(backlog, lag=30) == 1
+    assert pool.desired_workers_count(backlog, lag=150) == 3
+    assert pool.desired_workers_count(backlog, lag=float('inf')) == 5
+
+
+def test_worker_pool(backlog_queue_url: str):
+    """Worker pool processes every message, and stops gracefully."""
+    sent_values = [str(number) for number in range(30)]
+    SQSSender[str](url=backlog_queue_url).send_many(sent_values)
+
+    handled_values = []
+    lock = threading.Lock()
+
+    def handler(value: str) -> None:  # noqa: WPS430
+        with lock:
+            handled_values.append(value)
+
+        if value == '13':
+            raise ValueError('Unlucky number.')
+
+    pool = SQSWorkerPool(
+        receiver=SQSReceiver[str](url=backlog_queue_url),
+        handler=handler,
+        max_workers=3,
+        messages_per_worker=10,
+        scale_interval=timedelta(milliseconds=100),
+        poll_latency=timedelta(seconds=1),
+    )
+    pool.start()
+
+    deadline = time.monotonic() + 20
+    while time.monotonic() < deadline and (
+        len(set(handled_values)) < 30 or handled_values.count('13') < 2
+    ):
+        time.sleep(0.1)
+
+    assert pool.stop(timeout=timedelta(seconds=5))
+    assert set(handled_values) == set(sent_values)
+    assert handled_values.count('13') >= 2
+
+
+class FlakyReceiver(SQSReceiver[str]):
+    """Receiver which fails to receive messages the first time."""
+
+    failures_count = 1
+
+    def receive_many(self, max_messages, max_latency):
+        """Fail, and then work normally."""
+        if self.failures_count:
+            self.failures_count -= 1
+            raise ConnectionError('Network is down.')
+
+        return super().receive_many(max_messages, max_latency)
+
+
+def test_worker_survives_receive_errors(backlog_queue_url: str):
+    """Worker keeps going after it failed to receive messages."""
+    SQSSender[str](url=backlog_queue_url).send('a')
+
+    handled_values = []
+    pool = SQSWorkerPool(
+        receiver=FlakyReceiver(url=backlog_queue_url),
+        handler=handled_values.append,
+        max_workers=1,
+        poll_latency=timedelta(seconds=1),
+    )
+    pool.start()
+
+    deadline = time.monotonic() + 10
+    while not handled_values and time.monotonic() < deadline:
+        time.sleep(0.1)
+
+    assert pool.stop(timeout=timedelta(seconds=5))
+    assert handled_values == ['a']
+
+
+class FlakyBacklogReceiver(SQSReceiver[str]):
+    """Receiver which fails to request the backlog the first time."""
+
+    backlog_calls = 0
+
+    def backlog(self):
+        """Fail, and then work normally."""
+        self.backlog_calls += 1
+        if self.backlog_calls == 1:
+            raise ConnectionError('Network is down.')
+
+        return super().backlog()
+
+
+def test_scaler_survives_errors(caplog):
+    """Pool keeps scaling after it failed to request the backlog."""
+    client = LocalSQSClient()
+    url = client.create_queue(QueueName='scaled')['QueueUrl']
+
+    receiver = FlakyBacklogReceiver(url=url, client=client)
+    pool = SQSWorkerPool(
+        receiver=receiver,
+        handler=print,
+        scale_interval=timedelta(milliseconds=50),
+        poll_latency=timedelta(milliseconds=100),
+    )
+    pool.start()
+
+    deadline = time.monotonic() + 10
+    while receiver.backlog_calls < 2 and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    assert pool.stop(timeout=timedelta(seconds=5))
+    assert receiver.backlog_calls >= 2
+    assert 'Failed to scale SQS worker pool.' in caplog.text
+
+
+def test_scale_down_releases_messages():
+    """Worker asked to stop returns the messages it has not handled yet."""
+    client = LocalSQSClient()
+    url = client.create_queue(QueueName='scaled_down')['QueueUrl']
+    SQSSender[str](url=url, client=client).send_many(['a', 'b', 'c'])
+
+    handling_started = threading.Event()
+    may_finish = threading.Event()
+
+    def handler(value: str) -> None:  # noqa: WPS430
+        handling_started.set()
+        may_finish.wait(5)
+
+    pool = SQSWorkerPool(
+        receiver=SQSReceiver[str](url=url, client=client),
+        handler=handler,
+        poll_latency=timedelta(seconds=1),
+    )
+    pool.scale_to(1)
+    assert handling_started.wait(5)
+
+    worker = pool._workers[0]
+    pool.scale_to(0)
+    may_finish.set()
+    worker.thread.join(5)
+
+    assert pool.workers_count == 0
+    assert pool.receiver.in_flight_count == 0
+    assert len(SQSReceiver[str](url=url, client=client).poll(0)) == 2